@@ -0,0 +1,160 @@
+"""
+Storage backend benchmark: MySQL vs embedded SQLite (WAL).
+
+Seeds the same pageant on each backend, then times the two hot paths through
+the real services:
+  - submit      : PageantService.submit_scores_bulk (one judge's whole card)
+  - leaderboard : TabulationService.load_matrix + ScoreMatrix.leaderboard
+                  (a full rebuild, i.e. what the first viewer pays after a write)
+
+Usage (from the repo root):
+    python benchmarks/bench_backends.py
+    python benchmarks/bench_backends.py --backends sqlite --contestants 40 --judges 10
+
+MySQL uses the db_username/db_pass/db_host settings and a scratch database
+(judgemenot_bench) that is dropped afterwards. It is skipped if unreachable.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+from sqlalchemy import text
+
+import core.database as database
+from core.database import Base, SessionLocal, create_app_engine, create_database_if_not_exists
+from core.migrations import run_migrations
+from models.all_models import User, Event, Segment, Criteria, Contestant
+from services.pageant_service import PageantService
+from services.tabulation_service import TabulationService, standings_cache
+
+BENCH_DB_NAME = "judgemenot_bench"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def summarize(samples):
+    return {
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "mean": statistics.mean(samples),
+    }
+
+
+def seed(num_contestants, num_judges, num_segments=3, num_criteria=5):
+    """Creates one pageant and returns (event_id, judge_ids, contestant_ids, criteria_ids)."""
+    db = SessionLocal()
+    try:
+        judges = [User(username=f"bench_judge_{i}", name=f"Judge {i}", role="Judge") for i in range(num_judges)]
+        ev = Event(name="Benchmark Pageant", event_type="Pageant")
+        db.add_all(judges + [ev])
+        db.flush()
+        criteria_ids = []
+        for s in range(num_segments):
+            seg = Segment(event_id=ev.id, name=f"Segment {s}", order_index=s, percentage_weight=1.0 / num_segments, is_revealed=True)
+            db.add(seg)
+            db.flush()
+            crits = [Criteria(segment_id=seg.id, name=f"Crit {s}.{k}", weight=1.0 / num_criteria, max_score=100) for k in range(num_criteria)]
+            db.add_all(crits)
+            db.flush()
+            criteria_ids.extend(c.id for c in crits)
+        contestants = [Contestant(event_id=ev.id, candidate_number=n + 1, name=f"Candidate {n}", gender="Male" if n % 2 else "Female")
+                       for n in range(num_contestants)]
+        db.add_all(contestants)
+        db.commit()
+        return ev.id, [j.id for j in judges], [c.id for c in contestants], criteria_ids
+    finally:
+        db.close()
+
+
+def run_backend(backend_name, args):
+    """Runs the workload on one backend. Returns {"submit": stats, "leaderboard": stats} or None if unavailable."""
+    tmp = None
+    if backend_name == "sqlite":
+        tmp = tempfile.TemporaryDirectory()
+        os.environ["db_sqlite_path"] = os.path.join(tmp.name, "bench.sqlite3")
+    else:
+        database.db_name = BENCH_DB_NAME
+        os.environ["db_backend"] = "mysql"
+        create_database_if_not_exists()
+
+    engine = create_app_engine(backend_name)
+    created = False
+    try:
+        try:
+            Base.metadata.create_all(bind=engine)
+            created = True
+        except Exception as e:
+            print(f"⚠️  Skipping {backend_name}: {e.__class__.__name__}: {e}")
+            return None
+        run_migrations(engine)
+        SessionLocal.configure(bind=engine)
+        standings_cache.clear()
+
+        event_id, judge_ids, contestant_ids, criteria_ids = seed(args.contestants, args.judges)
+        pageant = PageantService()
+        tabulation = TabulationService()
+
+        submit_ms = []
+        for judge_id in judge_ids:
+            for contestant_id in contestant_ids:
+                card = {c_id: float(60 + (judge_id * 7 + contestant_id * 3 + c_id) % 40) for c_id in criteria_ids}
+                start = time.perf_counter()
+                ok, msg = pageant.submit_scores_bulk(judge_id, contestant_id, card)
+                submit_ms.append((time.perf_counter() - start) * 1000)
+                if not ok:
+                    raise RuntimeError(msg)
+
+        leaderboard_ms = []
+        for _ in range(args.leaderboard_runs):
+            start = time.perf_counter()
+            tabulation.load_matrix(event_id).leaderboard()
+            leaderboard_ms.append((time.perf_counter() - start) * 1000)
+
+        return {"submit": summarize(submit_ms), "leaderboard": summarize(leaderboard_ms)}
+    finally:
+        if backend_name == "mysql" and created:
+            with engine.connect() as conn:
+                conn.execute(text(f"DROP DATABASE IF EXISTS {BENCH_DB_NAME}"))
+        engine.dispose()
+        if tmp:
+            tmp.cleanup()
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Compare submit and leaderboard latency across storage backends.")
+    parser.add_argument("--backends", nargs="+", default=["mysql", "sqlite"], choices=["mysql", "sqlite"])
+    parser.add_argument("--contestants", type=int, default=20)
+    parser.add_argument("--judges", type=int, default=5)
+    parser.add_argument("--leaderboard-runs", type=int, default=50)
+    args = parser.parse_args()
+
+    results = {}
+    for backend_name in args.backends:
+        print(f"⏳ Benchmarking {backend_name} ({args.judges} judges x {args.contestants} contestants)...")
+        try:
+            outcome = run_backend(backend_name, args)
+        except Exception as e:
+            print(f"⚠️  Skipping {backend_name}: {e.__class__.__name__}: {e}")
+            outcome = None
+        if outcome:
+            results[backend_name] = outcome
+
+    print()
+    print(f"{'backend':<10}{'operation':<14}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for backend_name, outcome in results.items():
+        for op, stats in outcome.items():
+            print(f"{backend_name:<10}{op:<14}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['mean']:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
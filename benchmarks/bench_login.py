@@ -0,0 +1,118 @@
+"""
+Login burst benchmark: bcrypt checks inline vs on the password worker pool.
+
+Seeds `--users` accounts, then has every one of them log in at the same moment
+through AuthService.login (one thread each, like the Flet handlers when a room
+of judges opens the app), first with bcrypt running on the handler threads and
+then with core.passwords started. Reports the burst's wall time, logins per
+second and per-login latency.
+
+Usage (from the repo root):
+    python benchmarks/bench_login.py
+    python benchmarks/bench_login.py --users 50 --rounds 12 --workers 4
+
+The pool can only beat inline checks by the number of cores it gets: on a
+single-core machine both modes are CPU-bound on the same core.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+
+from core.database import Base, SessionLocal, create_app_engine
+from core.passwords import passwords
+from models.all_models import User
+from services.auth_service import AuthService
+
+PASSWORD = "burst-pass-123"
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def seed(num_users):
+    """Creates `num_users` judges sharing one password hash. Returns their usernames."""
+    hashed = passwords.hash(PASSWORD)
+    db = SessionLocal()
+    try:
+        users = [User(username=f"burst_judge_{i}", name=f"Judge {i}", role="Judge", password_hash=hashed,
+                      is_active=True, is_pending=False) for i in range(num_users)]
+        db.add_all(users)
+        db.commit()
+        return [u.username for u in users]
+    finally:
+        db.close()
+
+
+def burst(usernames):
+    """Logs every user in at once. Returns (wall seconds, [per-login ms])."""
+    auth = AuthService()
+    gate = threading.Barrier(len(usernames))
+
+    def one_login(username):
+        gate.wait()
+        start = time.perf_counter()
+        if not isinstance(auth.login(username, PASSWORD), User):
+            raise RuntimeError(f"Login failed for {username}")
+        return (time.perf_counter() - start) * 1000
+
+    with ThreadPoolExecutor(max_workers=len(usernames)) as handlers:
+        start = time.perf_counter()
+        latencies = list(handlers.map(one_login, usernames))
+        wall = time.perf_counter() - start
+    return wall, latencies
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Measure login throughput for a burst of simultaneous logins.")
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt work factor")
+    parser.add_argument("--workers", type=int, default=0, help="password worker processes (0 = one per core)")
+    args = parser.parse_args()
+
+    os.environ["bcrypt_rounds"] = str(args.rounds)
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["db_sqlite_path"] = os.path.join(tmp.name, "bench.sqlite3")
+    engine = create_app_engine("sqlite")
+    try:
+        Base.metadata.create_all(bind=engine)
+        SessionLocal.configure(bind=engine)
+        usernames = seed(args.users)
+
+        results = {}
+        print(f"⏳ {args.users} simultaneous logins, bcrypt cost {args.rounds}, {os.cpu_count()} core(s)...")
+        results["inline"] = burst(usernames)
+
+        workers = args.workers or os.cpu_count() or 1
+        passwords.start(max_workers=workers)
+        try:
+            # Spawn the workers outside the timing
+            with ThreadPoolExecutor(max_workers=workers) as warmup:
+                list(warmup.map(lambda _: passwords.hash(PASSWORD, 4), range(workers)))
+            results["pool"] = burst(usernames)
+        finally:
+            passwords.stop()
+    finally:
+        engine.dispose()
+        tmp.cleanup()
+
+    print()
+    print(f"{'mode':<10}{'wall s':>10}{'logins/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for mode, (wall, latencies) in results.items():
+        print(f"{mode:<10}{wall:>10.2f}{len(latencies) / wall:>10.1f}{percentile(latencies, 50):>10.0f}"
+              f"{percentile(latencies, 95):>10.0f}{statistics.mean(latencies):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
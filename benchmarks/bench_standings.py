@@ -0,0 +1,129 @@
+"""
+Standings benchmark: cold pageant tabulation time and query count as the event grows.
+
+Seeds one fully scored pageant per `--sizes` entry on an embedded SQLite file,
+then times the cold paths a viewer or tabulator pays right after a score write
+(the standings cache is dropped before every run):
+  - standing    : PageantService.calculate_standing
+  - leaderboard : TabulationService.load_matrix + ScoreMatrix.leaderboard
+Each row also reports the SQL statements one run issues, which should stay the
+same for every size (one grouped score query, not one per contestant).
+
+Usage (from the repo root):
+    python benchmarks/bench_standings.py
+    python benchmarks/bench_standings.py --sizes 20 80 320 --judges 7 --runs 30
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dotenv import load_dotenv
+from sqlalchemy import event, insert
+
+from core.database import Base, SessionLocal, create_app_engine
+from models.all_models import User, Event, Segment, Criteria, Contestant, Score
+from services.pageant_service import PageantService
+from services.tabulation_service import TabulationService, standings_cache
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def seed(num_contestants, num_judges, num_segments=4, num_criteria=5):
+    """Creates a pageant with every judge's card filled in. Returns the event id."""
+    db = SessionLocal()
+    try:
+        judges = [User(username=f"bench_judge_{num_contestants}_{i}", name=f"Judge {i}", role="Judge") for i in range(num_judges)]
+        ev = Event(name=f"Benchmark Pageant {num_contestants}", event_type="Pageant")
+        db.add_all(judges + [ev])
+        db.flush()
+        criteria = []
+        for s in range(num_segments):
+            seg = Segment(event_id=ev.id, name=f"Segment {s}", order_index=s, percentage_weight=1.0 / num_segments, is_revealed=True)
+            db.add(seg)
+            db.flush()
+            crits = [Criteria(segment_id=seg.id, name=f"Crit {s}.{k}", weight=1.0 / num_criteria, max_score=100) for k in range(num_criteria)]
+            db.add_all(crits)
+            db.flush()
+            criteria.extend(crits)
+        contestants = [Contestant(event_id=ev.id, candidate_number=n + 1, name=f"Candidate {n}", gender="Male" if n % 2 else "Female")
+                       for n in range(num_contestants)]
+        db.add_all(contestants)
+        db.flush()
+        # Plain multi-row insert: seeding is not what is measured
+        db.execute(insert(Score), [
+            {"judge_id": j.id, "contestant_id": c.id, "segment_id": crit.segment_id, "criteria_id": crit.id,
+             "score_value": float(60 + (j.id * 7 + c.id * 3 + crit.id) % 40)}
+            for j in judges for c in contestants for crit in criteria
+        ])
+        db.commit()
+        return ev.id
+    finally:
+        db.close()
+
+
+def measure(engine, event_id, operation, runs):
+    """Times `runs` cold calls of operation(event_id). Returns ([ms], statements per call)."""
+    statements = []
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        samples = []
+        for _ in range(runs):
+            standings_cache.invalidate(event_id)
+            start = time.perf_counter()
+            operation(event_id)
+            samples.append((time.perf_counter() - start) * 1000)
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+    return samples, len(statements) // runs
+
+
+def main():
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Measure cold standings/leaderboard time and queries as a pageant grows.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 40, 160], help="contestant counts")
+    parser.add_argument("--judges", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    os.environ["db_sqlite_path"] = os.path.join(tmp.name, "bench.sqlite3")
+    engine = create_app_engine("sqlite")
+    rows = []
+    try:
+        Base.metadata.create_all(bind=engine)
+        SessionLocal.configure(bind=engine)
+        pageant = PageantService()
+        tabulation = TabulationService()
+        operations = {
+            "standing": pageant.calculate_standing,
+            "leaderboard": lambda event_id: tabulation.load_matrix(event_id).leaderboard(),
+        }
+        for size in args.sizes:
+            print(f"⏳ Seeding {size} contestants x {args.judges} judges...")
+            event_id = seed(size, args.judges)
+            for name, operation in operations.items():
+                samples, queries = measure(engine, event_id, operation, args.runs)
+                rows.append((size, name, queries, samples))
+    finally:
+        engine.dispose()
+        tmp.cleanup()
+
+    print()
+    print(f"{'contestants':<13}{'operation':<14}{'queries':>8}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for size, name, queries, samples in rows:
+        print(f"{size:<13}{name:<14}{queries:>8}{percentile(samples, 50):>10.2f}"
+              f"{percentile(samples, 95):>10.2f}{statistics.mean(samples):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Live view refreshes driven by core/event_bus.py
+"""
+
+import threading
+from core.event_bus import event_bus
+
+# {id(page): [LiveView, ...]} so a session's subscriptions can be dropped together
+_page_views = {}
+_page_views_lock = threading.Lock()
+
+
+class LiveView:
+    """
+    Re-runs a view's refresh function whenever one of its topics is published.
+
+    The refresh runs on a Flet worker thread (page.run_thread), one run at a
+    time: publishes that arrive while it is running collapse into a single
+    extra run. Nothing runs while no one publishes.
+    """
+    def __init__(self, page, refresh):
+        self.page = page
+        self.refresh = refresh
+        self._lock = threading.Lock()
+        self._running = False
+        self._pending = False
+        self._unsubscribers = []
+        with _page_views_lock:
+            _page_views.setdefault(id(page), []).append(self)
+
+    def watch(self, topic, kinds=None):
+        """Subscribes to a topic. `kinds` limits event topics to those change kinds (e.g. {STRUCTURE})."""
+        def on_publish(payload):
+            if kinds and payload and payload[1] not in kinds:
+                return
+            self.trigger()
+        self._unsubscribers.append(event_bus.subscribe(topic, on_publish))
+
+    def track(self, unsubscribe):
+        """Ties another feed's unsubscribe function to this view's lifetime."""
+        self._unsubscribers.append(unsubscribe)
+
+    def unwatch_all(self):
+        unsubscribers, self._unsubscribers = self._unsubscribers, []
+        for unsubscribe in unsubscribers:
+            unsubscribe()
+
+    def stop(self):
+        self.unwatch_all()
+        with _page_views_lock:
+            views = _page_views.get(id(self.page), [])
+            if self in views:
+                views.remove(self)
+            if not views:
+                _page_views.pop(id(self.page), None)
+
+    def trigger(self):
+        """Schedules a refresh now (also used for the first render)."""
+        with self._lock:
+            if self._running:
+                self._pending = True
+                return
+            self._running = True
+        try:
+            self.page.run_thread(self._run)
+        except Exception as e:
+            # Session is gone
+            with self._lock:
+                self._running = False
+            print(f"LiveView could not schedule refresh: {e}")
+            self.stop()
+
+    def _run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception as e:
+                print(f"LiveView refresh error: {e}")
+            with self._lock:
+                if not self._pending:
+                    self._running = False
+                    return
+                self._pending = False
+
+
+def stop_live_views(page):
+    """Unsubscribes every LiveView of a page (route change or disconnect)."""
+    with _page_views_lock:
+        views = _page_views.pop(id(page), [])
+    for view in views:
+        view.unwatch_all()
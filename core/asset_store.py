@@ -0,0 +1,97 @@
+import hashlib
+import os
+import re
+import threading
+
+# ----------------------------------------------------------------
+# CONTENT-ADDRESSED ASSET STORE
+# ----------------------------------------------------------------
+# Stored files are named after the hash of their source content:
+#   assets/uploads/<32 hex digest>_<variant>.<ext>
+# The same content always maps to the same name, so re-uploads are
+# deduplicated, and a name never changes meaning. That makes every stored
+# URL safe to cache forever: a changed photo gets a new name instead of
+# overwriting the old one.
+
+ASSETS_DIR = "assets"
+UPLOAD_DIR = "uploads"
+
+# Sent for content-addressed files by ImmutableAssetHeaders (web mode)
+CACHE_CONTROL_IMMUTABLE = "public, max-age=31536000, immutable"
+
+_STORED_NAME_RE = re.compile(r"(?:^|/)" + UPLOAD_DIR + r"/(?P<digest>[0-9a-f]{32})_(?P<variant>[a-z]+)\.(?P<ext>[a-z0-9]+)$")
+
+
+def content_hash(path):
+    """Hex digest identifying the file's bytes (the store key)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()[:32]
+
+
+def stored_name(digest, variant, ext="jpg"):
+    """Asset path (relative to the assets dir, as used for image src) of one stored variant."""
+    return f"{UPLOAD_DIR}/{digest}_{variant}.{ext}"
+
+
+def parse_stored_name(path):
+    """(digest, variant, ext) if `path` names a content-addressed file, else None."""
+    match = _STORED_NAME_RE.search(path or "")
+    return (match.group("digest"), match.group("variant"), match.group("ext")) if match else None
+
+
+def local_path(name, assets_dir=None):
+    return os.path.join(assets_dir or ASSETS_DIR, *name.split("/"))
+
+
+def exists(name, assets_dir=None):
+    return os.path.exists(local_path(name, assets_dir))
+
+
+def put(name, write, assets_dir=None):
+    """
+    Stores a file under `name` unless it is already there (deduplication).
+    `write(tmp_path)` produces the content; it is renamed into place so a
+    half-written file is never served. Returns True if a new file was written.
+    """
+    final_path = local_path(name, assets_dir)
+    if os.path.exists(final_path):
+        return False
+    os.makedirs(os.path.dirname(final_path), exist_ok=True)
+    tmp_path = f"{final_path}.{threading.get_ident()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, final_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return True
+
+
+# ----------------------------------------------------------------
+# HTTP CACHE HEADERS (ASGI middleware for the web server)
+# ----------------------------------------------------------------
+class ImmutableAssetHeaders:
+    """
+    Wraps the Flet web app and marks successful responses for content-addressed
+    files as immutable, so judge tablets and viewer phones download each photo
+    once instead of revalidating it on every dashboard render.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not parse_stored_name(scope.get("path", "")):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() != b"cache-control"]
+                headers.append((b"cache-control", CACHE_CONTROL_IMMUTABLE.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
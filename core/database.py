@@ -1,44 +1,94 @@
 import os
-from sqlalchemy import create_engine, text
+import threading
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import sessionmaker, declarative_base
+from core.instrumentation import instrument_engine, InstrumentedQueuePool
 
 # ----------------------------------------------------------------
 # 1. CONFIGURATION & CREDENTIALS
 # ----------------------------------------------------------------
-# Get credentials from Environment Variables (or default to root/empty)
-username = os.getenv("db_username", "root")
-password = os.getenv("db_pass", "")
-host = os.getenv("db_host", "localhost")
+# Importing this module has no side effects: nothing connects until the
+# first session (or an explicit ensure_database()/ensure_schema()/create_database_if_not_exists()).
+# Settings are read at that point, so a .env loaded after the imports still applies.
+#
+# db_backend selects the storage:
+#   mysql  (default) -> MySQL server via pymysql
+#   sqlite           -> embedded file database in WAL mode, for venues without a MySQL host
 db_name = "judgemenot_db"
 
-# Construct Connection Strings
-if password.strip() == "":
-    # For connecting to the Server only (to create DB)
-    SERVER_URL = f"mysql+pymysql://{username}@{host}"
-    # For connecting to the specific Database
-    DATABASE_URL = f"mysql+pymysql://{username}@{host}/{db_name}"
-else:
-    SERVER_URL = f"mysql+pymysql://{username}:{password}@{host}"
-    DATABASE_URL = f"mysql+pymysql://{username}:{password}@{host}/{db_name}"
+def backend():
+    return os.getenv("db_backend", "mysql").strip().lower()
+
+def sqlite_path():
+    return os.getenv("db_sqlite_path", f"{db_name}.sqlite3")
+
+def _credentials():
+    # Get credentials from Environment Variables (or default to root/empty)
+    username = os.getenv("db_username", "root")
+    password = os.getenv("db_pass", "")
+    host = os.getenv("db_host", "localhost")
+    return username, password, host
+
+def server_url():
+    """URL of the MySQL server only (to create the database)."""
+    username, password, host = _credentials()
+    if password.strip() == "":
+        return f"mysql+pymysql://{username}@{host}"
+    return f"mysql+pymysql://{username}:{password}@{host}"
+
+def database_url(backend_name=None):
+    """URL of the application database for the given (or configured) backend."""
+    if (backend_name or backend()) == "sqlite":
+        return f"sqlite:///{sqlite_path()}"
+    return f"{server_url()}/{db_name}"
+
+def _pool_settings():
+    # Connection pool (size it for the venue: every judge/tabulator session and
+    # the shared leaderboard feeds hold a connection only while a query runs)
+    return {
+        "pool_size": int(os.getenv("db_pool_size", "20")),
+        "max_overflow": int(os.getenv("db_max_overflow", "20")),
+        "pool_timeout": float(os.getenv("db_pool_timeout", "30")),
+        "pool_recycle": int(os.getenv("db_pool_recycle", "3600")),
+        "pool_pre_ping": os.getenv("db_pool_pre_ping", "true").strip().lower() in ("1", "true", "yes"),
+    }
+
+def _sqlite_pragmas():
+    # WAL lets viewers read while a judge writes; NORMAL sync is durable across
+    # app crashes (only an OS crash / power loss can drop the last commits).
+    # Negative cache_size is in KiB.
+    return [
+        ("journal_mode", "WAL"),
+        ("synchronous", os.getenv("db_sqlite_synchronous", "NORMAL")),
+        ("mmap_size", int(os.getenv("db_sqlite_mmap_size", str(256 * 1024 * 1024)))),
+        ("cache_size", int(os.getenv("db_sqlite_cache_size", str(-64 * 1024)))),
+        ("busy_timeout", int(os.getenv("db_sqlite_busy_timeout", "5000"))),
+        ("foreign_keys", "ON"),  # MySQL (InnoDB) enforces them too
+    ]
 
 # ----------------------------------------------------------------
-# 2. AUTO-CREATE DATABASE LOGIC
+# 2. DATABASE PROVISIONING (explicit)
 # ----------------------------------------------------------------
 def create_database_if_not_exists():
     """
     Connects to MySQL server and creates the database if it doesn't exist.
-    This runs automatically when the app starts.
+    Called by init_db.py, and by ensure_database() when the database is missing.
+    The SQLite backend needs nothing here: the file is created on first connect.
     """
+    if backend() == "sqlite":
+        print(f"✅ Database check: embedded SQLite at '{sqlite_path()}'.")
+        return
     try:
-        # We need isolation_level="AUTOCOMMIT" because CREATE DATABASE 
+        # We need isolation_level="AUTOCOMMIT" because CREATE DATABASE
         # cannot run inside a standard transaction block.
-        temp_engine = create_engine(SERVER_URL, isolation_level="AUTOCOMMIT")
-        
+        temp_engine = create_engine(server_url(), isolation_level="AUTOCOMMIT")
+
         with temp_engine.connect() as conn:
             # Safe command that only creates if missing
             conn.execute(text(f"CREATE DATABASE IF NOT EXISTS {db_name}"))
             print(f"✅ Database check: '{db_name}' is ready.")
-            
+
     except Exception as e:
         print(f"⚠️  Database Warning: Could not auto-create '{db_name}'.")
         print(f"   Error details: {e}")
@@ -48,22 +98,124 @@ def create_database_if_not_exists():
         if 'temp_engine' in locals():
             temp_engine.dispose()
 
-# Run this immediately when the module is imported
-create_database_if_not_exists()
+def ensure_database():
+    """
+    App startup check (main.py). Opens the first pooled connection to the
+    database itself; only if that fails is the server-level create attempted,
+    so a normal start costs no extra handshake. Once connected, the schema is
+    brought up to date (see ensure_schema()).
+    """
+    try:
+        with get_engine().connect():
+            pass
+    except OperationalError:
+        create_database_if_not_exists()
+        try:
+            with get_engine().connect():
+                pass
+        except OperationalError as e:
+            print(f"⚠️  Database Warning: Could not connect to '{db_name}'.")
+            print(f"   Error details: {e}")
+            return False
+    ensure_schema()
+    return True
+
+_schema_ready = False
+_schema_lock = threading.Lock()
+
+def ensure_schema():
+    """
+    Creates missing tables and applies core/migrations.py (unique keys, columns,
+    indexes) to the application database, once per process. Both steps only
+    touch what is missing, so a database set up by init_db.py is left as is.
+    Raises RuntimeError if the schema cannot be brought up to date, rather than
+    letting the app run against tables it does not match.
+    """
+    global _schema_ready
+    if _schema_ready:
+        return
+    with _schema_lock:
+        if _schema_ready:
+            return
+        from core.migrations import run_migrations
+        import models.all_models  # noqa: F401 (registers the tables on Base.metadata)
+        engine = get_engine()
+        try:
+            Base.metadata.create_all(bind=engine)
+            run_migrations(engine)
+        except Exception as e:
+            raise RuntimeError(
+                f"Could not update the '{db_name}' schema ({e}). "
+                f"Run `python init_db.py` to see the failing step."
+            ) from e
+        _schema_ready = True
 
 # ----------------------------------------------------------------
-# 3. FINAL ENGINE SETUP
+# 3. ENGINE SETUP (lazy)
 # ----------------------------------------------------------------
-# Now we connect to the actual database
-engine = create_engine(DATABASE_URL, pool_recycle=3600)
+_engine = None
+_engine_lock = threading.Lock()
+
+def create_app_engine(backend_name=None):
+    """Builds a new engine for `backend_name` ("mysql" / "sqlite"), or the configured db_backend."""
+    backend_name = backend_name or backend()
+    if backend_name == "mysql":
+        engine = create_engine(database_url("mysql"), poolclass=InstrumentedQueuePool, **_pool_settings())
+    elif backend_name == "sqlite":
+        # Sessions are used from Flet handler threads and the leaderboard refreshers
+        engine = create_engine(database_url("sqlite"), poolclass=InstrumentedQueuePool,
+                               connect_args={"check_same_thread": False}, **_pool_settings())
+        pragmas = _sqlite_pragmas()
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        @event.listens_for(engine, "connect")
+        def _apply_pragmas(dbapi_conn, connection_record):
+            cursor = dbapi_conn.cursor()
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+    else:
+        raise ValueError(f"Unknown db_backend '{backend_name}' (expected 'mysql' or 'sqlite')")
+    # Per-service-method query counts and latency (see core/instrumentation.py)
+    return instrument_engine(engine)
+
+def get_engine():
+    """The application engine, created on first use."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_app_engine()
+    return _engine
+
+def __getattr__(name):
+    # Keeps `from core.database import engine` working without creating it at import
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+class _LazySessionMaker(sessionmaker):
+    """sessionmaker that binds to get_engine() the first time a session is opened."""
+    def __call__(self, **local_kw):
+        if self.kw.get("bind") is None:
+            self.configure(bind=get_engine())
+        return super().__call__(**local_kw)
+
+SessionLocal = _LazySessionMaker(autocommit=False, autoflush=False)
 Base = declarative_base()
 
+def pool_status():
+    """Live pool health: checked out, idle, overflow in use, waits and wait time."""
+    if _engine is None:
+        return {"status": "No database connection opened yet."}
+    pool = _engine.pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.health()
+    return {"status": pool.status()}
+
 # Dependency function to get DB session
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -0,0 +1,68 @@
+import threading
+
+# ----------------------------------------------------------------
+# TOPICS
+# ----------------------------------------------------------------
+EVENTS_TOPIC = "events"   # Every event change (payload: event_id, kind)
+AUDIT_TOPIC = "audit"     # New audit log rows
+
+# Kinds of event change
+SCORES = "scores"         # Score values only
+STRUCTURE = "structure"   # Segments, contestants, judges, status, active round...
+
+def event_topic(event_id):
+    return f"event:{event_id}"
+
+# ----------------------------------------------------------------
+# IN-PROCESS PUBLISH / SUBSCRIBE
+# ----------------------------------------------------------------
+class EventBus:
+    """
+    Publish/subscribe hub shared by every connected Flet session.
+
+    Services publish AFTER a successful commit; views subscribe and re-render
+    only when something they show has changed, instead of polling the database.
+    Handlers run synchronously on the publisher's thread, so they must only
+    schedule work (see components/live_updates.py), never render directly.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers = {}   # {topic: [handler, ...]}
+
+    def subscribe(self, topic, handler):
+        """Registers handler(payload) for a topic. Returns a function that unsubscribes it."""
+        with self._lock:
+            self._handlers.setdefault(topic, []).append(handler)
+        return lambda: self.unsubscribe(topic, handler)
+
+    def unsubscribe(self, topic, handler):
+        with self._lock:
+            handlers = self._handlers.get(topic, [])
+            if handler in handlers:
+                handlers.remove(handler)
+            if not handlers:
+                self._handlers.pop(topic, None)
+
+    def subscriber_count(self, topic):
+        with self._lock:
+            return len(self._handlers.get(topic, []))
+
+    def publish(self, topic, payload=None):
+        with self._lock:
+            handlers = list(self._handlers.get(topic, []))
+        for handler in handlers:
+            try:
+                handler(payload)
+            except Exception as e:
+                print(f"EventBus handler error on '{topic}': {e}")
+
+    def publish_event(self, event_id, kind=STRUCTURE):
+        """Announces that an event changed, to its own topic and to EVENTS_TOPIC."""
+        if event_id is None:
+            return
+        payload = (event_id, kind)
+        self.publish(event_topic(event_id), payload)
+        self.publish(EVENTS_TOPIC, payload)
+
+
+event_bus = EventBus()
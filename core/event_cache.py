@@ -0,0 +1,71 @@
+import threading
+
+# ----------------------------------------------------------------
+# IN-PROCESS CACHE KEYED BY EVENT ID
+# ----------------------------------------------------------------
+class EventCache:
+    """
+    Thread-safe cache of one computed value per event.
+
+    Every event has a version number that is bumped by invalidate().
+    A value is only stored if no invalidation happened while it was being
+    built, so a reader never gets data older than the latest write.
+    Only one thread rebuilds a given event at a time; concurrent readers
+    wait for it and reuse the result instead of all hitting the database.
+    """
+    def __init__(self, name="cache"):
+        self.name = name
+        self._lock = threading.Lock()
+        self._entries = {}       # {event_id: (version, value)}
+        self._versions = {}      # {event_id: int}
+        self._load_locks = {}    # {event_id: threading.Lock}
+
+    def version(self, event_id):
+        with self._lock:
+            return self._versions.get(event_id, 0)
+
+    def peek(self, event_id):
+        """Returns the cached value if it is current, else None (never loads)."""
+        with self._lock:
+            entry = self._entries.get(event_id)
+            if entry and entry[0] == self._versions.get(event_id, 0):
+                return entry[1]
+            return None
+
+    def get(self, event_id, loader):
+        """Returns the cached value, calling loader(event_id) only if it is missing or stale."""
+        value = self.peek(event_id)
+        if value is not None:
+            return value
+
+        with self._lock:
+            load_lock = self._load_locks.setdefault(event_id, threading.Lock())
+
+        with load_lock:
+            # Another thread may have rebuilt it while we waited
+            with self._lock:
+                version = self._versions.get(event_id, 0)
+                entry = self._entries.get(event_id)
+                if entry and entry[0] == version:
+                    return entry[1]
+
+            value = loader(event_id)
+
+            with self._lock:
+                if self._versions.get(event_id, 0) == version:
+                    self._entries[event_id] = (version, value)
+            return value
+
+    def invalidate(self, event_id):
+        """Marks the event's cached value as stale. Call AFTER the write is committed."""
+        if event_id is None:
+            return
+        with self._lock:
+            self._versions[event_id] = self._versions.get(event_id, 0) + 1
+            self._entries.pop(event_id, None)
+
+    def clear(self):
+        with self._lock:
+            for event_id in list(self._versions):
+                self._versions[event_id] += 1
+            self._entries.clear()
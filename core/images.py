@@ -0,0 +1,124 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps
+from core import asset_store
+
+# ----------------------------------------------------------------
+# CONTESTANT PHOTO PIPELINE
+# ----------------------------------------------------------------
+# Uploads are re-encoded once, at upload time, into one JPEG per display size.
+# Outputs live in the content-addressed store (core/asset_store.py), keyed by
+# the hash of the uploaded bytes, so the same photo is only processed (and
+# stored) once. Re-encoding drops EXIF/GPS and other metadata.
+#
+# contestant.image_path stores the "preview" variant (e.g. uploads/3fa9..._preview.jpg);
+# views ask image_url(image_path, size) for the size they actually display.
+
+# size name -> (width, height, crop). Pixel sizes are ~2x the on-screen size for sharp tablets.
+SIZES = {
+    "avatar": (96, 96, True),        # CircleAvatar (radius 20) in the admin contestant list
+    "card": (280, 360, True),        # 140x180 tile on the judge scoring card
+    "thumb": (200, 200, True),       # 100x100 preview in the contestant dialog
+    "preview": (1200, 1200, False),  # Enlarged photo popup (fits inside, keeps aspect)
+}
+DEFAULT_SIZE = "preview"
+JPEG_QUALITY = 85
+
+# Photos stored before the pipeline are converted on this thread, never on a render path
+LEGACY_RETRY_SECONDS = 60    # A failed conversion is tried again after this long
+_legacy_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="LegacyPhotos")
+_legacy_lock = threading.Lock()
+_legacy_variants = {}    # {legacy image_path: pipeline image_path}
+_legacy_jobs = {}        # {legacy image_path: Future} conversions queued or running
+_legacy_failures = {}    # {legacy image_path: time.monotonic() of the last failed attempt}
+
+
+def _render(img, width, height, crop):
+    if crop:
+        return ImageOps.fit(img, (width, height), Image.LANCZOS)
+    out = img.copy()
+    out.thumbnail((width, height), Image.LANCZOS)
+    return out
+
+
+def _flatten(img):
+    """Applies the EXIF orientation, then returns plain RGB pixels (no metadata carried over)."""
+    img = ImageOps.exif_transpose(img)
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        background = Image.new("RGB", img.size, "white")
+        background.paste(img.convert("RGBA"), mask=img.convert("RGBA").split()[-1])
+        return background
+    return img.convert("RGB")
+
+
+def process_upload(src_path, assets_dir=None):
+    """
+    Generates every size in SIZES for the photo at `src_path` and returns the
+    image_path to store (the preview variant, relative to the assets dir).
+    Outputs that already exist for the same content are reused.
+    Raises PIL.UnidentifiedImageError / OSError if the file is not a readable image.
+    """
+    digest = asset_store.content_hash(src_path)
+    missing = [name for name in SIZES if not asset_store.exists(asset_store.stored_name(digest, name), assets_dir)]
+    if missing:
+        with Image.open(src_path) as original:
+            img = _flatten(original)
+        for name in missing:
+            width, height, crop = SIZES[name]
+            variant = _render(img, width, height, crop)
+            asset_store.put(asset_store.stored_name(digest, name),
+                            lambda tmp_path: variant.save(tmp_path, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True),
+                            assets_dir)
+    return asset_store.stored_name(digest, DEFAULT_SIZE)
+
+
+def _convert_legacy(image_path):
+    try:
+        converted = process_upload(asset_store.local_path(image_path))
+    except Exception as e:
+        print(f"⚠️  Could not convert photo '{image_path}': {e}")
+        converted = None
+    with _legacy_lock:
+        _legacy_jobs.pop(image_path, None)
+        if converted:
+            _legacy_variants[image_path] = converted
+            _legacy_failures.pop(image_path, None)
+        else:
+            _legacy_failures[image_path] = time.monotonic()
+    return converted
+
+
+def _legacy_variant(image_path):
+    """
+    The pipeline image_path for a photo uploaded before the pipeline existed, or
+    None until its background conversion has finished (queued on first use).
+    """
+    with _legacy_lock:
+        converted = _legacy_variants.get(image_path)
+        if converted or image_path in _legacy_jobs:
+            return converted
+        failed_at = _legacy_failures.get(image_path)
+        if failed_at is None or time.monotonic() - failed_at >= LEGACY_RETRY_SECONDS:
+            _legacy_jobs[image_path] = _legacy_executor.submit(_convert_legacy, image_path)
+        return None
+
+
+def image_url(image_path, size):
+    """
+    The src for displaying `image_path` at `size` (a key of SIZES).
+    Photos uploaded before the pipeline existed are converted in the background;
+    until that is done (or if it fails) the original path is returned unchanged.
+    """
+    if not image_path:
+        return image_path
+    if size not in SIZES:
+        raise ValueError(f"Unknown image size '{size}'")
+
+    stored = asset_store.parse_stored_name(image_path)
+    if not stored:
+        converted = _legacy_variant(image_path)
+        if not converted:
+            return image_path
+        stored = asset_store.parse_stored_name(converted)
+    return asset_store.stored_name(stored[0], size)
@@ -0,0 +1,244 @@
+import functools
+import inspect
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+# ----------------------------------------------------------------
+# SERVICE CALL INSTRUMENTATION
+# ----------------------------------------------------------------
+# Every call to an @instrumented service method is timed, and the SQL that
+# runs while it is active (engine hook below) is attributed to it.
+# Nested service calls count towards both the inner and the outer method.
+
+WINDOW = 1000   # Samples kept per method for the rolling percentiles
+
+class _Call:
+    __slots__ = ("queries", "rows", "parent")
+    def __init__(self, parent):
+        self.queries = 0
+        self.rows = 0
+        self.parent = parent
+
+_current_call = ContextVar("service_call", default=None)
+
+
+class MethodStats:
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.total_queries = 0
+        self.samples = deque(maxlen=WINDOW)   # (wall_ms, queries, rows)
+
+    def record(self, wall_ms, queries, rows, failed):
+        self.calls += 1
+        self.errors += 1 if failed else 0
+        self.total_ms += wall_ms
+        self.total_queries += queries
+        self.samples.append((wall_ms, queries, rows))
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class ServiceStats:
+    """Thread-safe registry of MethodStats, keyed by 'Class.method'."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._methods = {}
+
+    def record(self, name, wall_ms, queries, rows, failed=False):
+        with self._lock:
+            stats = self._methods.get(name)
+            if stats is None:
+                stats = self._methods[name] = MethodStats(name)
+            stats.record(wall_ms, queries, rows, failed)
+
+    def reset(self):
+        with self._lock:
+            self._methods.clear()
+
+    def snapshot(self):
+        """
+        One dict per method, slowest total time first:
+        calls, errors, p50/p95/p99 wall time (ms), avg/max queries and avg rows over the rolling window.
+        """
+        with self._lock:
+            methods = [(s.name, s.calls, s.errors, s.total_ms, s.total_queries, list(s.samples)) for s in self._methods.values()]
+
+        rows = []
+        for name, calls, errors, total_ms, total_queries, samples in methods:
+            times = sorted(s[0] for s in samples)
+            queries = [s[1] for s in samples]
+            fetched = [s[2] for s in samples]
+            rows.append({
+                "method": name,
+                "calls": calls,
+                "errors": errors,
+                "total_ms": round(total_ms, 1),
+                "p50_ms": round(_percentile(times, 50), 2),
+                "p95_ms": round(_percentile(times, 95), 2),
+                "p99_ms": round(_percentile(times, 99), 2),
+                "avg_queries": round(sum(queries) / len(queries), 1) if queries else 0,
+                "max_queries": max(queries) if queries else 0,
+                "avg_rows": round(sum(fetched) / len(fetched), 1) if fetched else 0,
+                "total_queries": total_queries,
+            })
+        rows.sort(key=lambda r: r["total_ms"], reverse=True)
+        return rows
+
+    def report(self):
+        """Plain-text table of snapshot(), for logs and rehearsal notes."""
+        lines = [f"{'METHOD':<45}{'CALLS':>7}{'P50ms':>9}{'P95ms':>9}{'P99ms':>9}{'AVG Q':>7}{'MAX Q':>7}{'AVG ROWS':>10}"]
+        for r in self.snapshot():
+            lines.append(f"{r['method']:<45}{r['calls']:>7}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{r['avg_queries']:>7}{r['max_queries']:>7}{r['avg_rows']:>10}")
+        return "\n".join(lines)
+
+
+service_stats = ServiceStats()
+
+
+# ----------------------------------------------------------------
+# HOOKS
+# ----------------------------------------------------------------
+def instrument_engine(engine):
+    """Attributes every statement run on `engine` to the active service call (if any)."""
+    @event.listens_for(engine, "after_cursor_execute")
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        call = _current_call.get()
+        if call is None:
+            return
+        # Drivers that buffer results (pymysql) report fetched rows; others report -1
+        rows = max(getattr(cursor, "rowcount", 0) or 0, 0)
+        while call is not None:
+            call.queries += 1
+            call.rows += rows
+            call = call.parent
+    return engine
+
+
+def instrumented(name):
+    """Decorator for one function, recorded under `name`."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            call = _Call(_current_call.get())
+            token = _current_call.set(call)
+            start = time.perf_counter()
+            failed = False
+            try:
+                return func(*args, **kwargs)
+            except Exception:
+                failed = True
+                raise
+            finally:
+                _current_call.reset(token)
+                service_stats.record(name, (time.perf_counter() - start) * 1000, call.queries, call.rows, failed)
+        return wrapper
+    return decorate
+
+
+def instrumented_generator(name):
+    """
+    Decorator for a generator function, recorded under `name` once it is
+    exhausted or closed. Its body only runs while it is iterated, so the call
+    is active (and timed) inside each next() only, not while the consumer works
+    between items.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            call = _Call(_current_call.get())
+            gen = func(*args, **kwargs)
+            elapsed = 0.0
+            failed = False
+            try:
+                while True:
+                    token = _current_call.set(call)
+                    start = time.perf_counter()
+                    try:
+                        item = next(gen)
+                    except StopIteration:
+                        return
+                    except Exception:
+                        failed = True
+                        raise
+                    finally:
+                        elapsed += time.perf_counter() - start
+                        _current_call.reset(token)
+                    yield item
+            finally:
+                gen.close()
+                service_stats.record(name, elapsed * 1000, call.queries, call.rows, failed)
+        return wrapper
+    return decorate
+
+
+def instrument_service(cls):
+    """Class decorator: instruments every public method as 'ClassName.method'."""
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not callable(value):
+            continue
+        decorate = instrumented_generator if inspect.isgeneratorfunction(value) else instrumented
+        setattr(cls, attr, decorate(f"{cls.__name__}.{attr}")(value))
+    return cls
+
+
+# ----------------------------------------------------------------
+# CONNECTION POOL HEALTH
+# ----------------------------------------------------------------
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that also counts checkouts which found the pool exhausted
+    (no idle connection, no overflow left) and how long they waited.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.waits = 0
+        self.timeouts = 0
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def _do_get(self):
+        exhausted = self.checkedin() == 0 and self._max_overflow > -1 and self.overflow() >= self._max_overflow
+        if not exhausted:
+            return super()._do_get()
+
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = (time.perf_counter() - start) * 1000
+            with self._stats_lock:
+                self.waits += 1
+                self.total_wait_ms += waited
+                self.max_wait_ms = max(self.max_wait_ms, waited)
+
+    def health(self):
+        with self._stats_lock:
+            waits, timeouts, total_wait_ms, max_wait_ms = self.waits, self.timeouts, self.total_wait_ms, self.max_wait_ms
+        return {
+            "size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "waits": waits,
+            "timeouts": timeouts,
+            "avg_wait_ms": round(total_wait_ms / waits, 2) if waits else 0.0,
+            "max_wait_ms": round(max_wait_ms, 2),
+        }
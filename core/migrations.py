@@ -0,0 +1,126 @@
+from sqlalchemy import inspect, text
+
+# ----------------------------------------------------------------
+# SCHEMA MIGRATIONS FOR EXISTING DATABASES
+# ----------------------------------------------------------------
+# create_all() only creates missing tables, so anything added to an existing
+# table (keys, indexes, columns) is applied here. Every step checks the live
+# schema first, so running the migrations again is harmless.
+
+# Unique keys of the scores table (declared in models/all_models.py)
+SCORE_UNIQUE_KEYS = {
+    "uq_scores_judge_contestant_criteria": ["judge_id", "contestant_id", "criteria_id"],
+    "uq_scores_contestant_segment_question": ["contestant_id", "segment_id", "question_number"],
+}
+
+def _index_names(engine, table):
+    inspector = inspect(engine)
+    names = {ix["name"] for ix in inspector.get_indexes(table)}
+    names |= {uq["name"] for uq in inspector.get_unique_constraints(table)}
+    return names
+
+def _dedupe(conn, table, columns):
+    """Deletes duplicate rows of a key, keeping the most recent (highest id)."""
+    cols = ", ".join(columns)
+    not_null = " AND ".join(f"{c} IS NOT NULL" for c in columns)
+    # The inner derived table lets MySQL delete from the table it reads
+    result = conn.execute(text(
+        f"DELETE FROM {table} WHERE {not_null} AND id NOT IN ("
+        f"SELECT id FROM (SELECT MAX(id) AS id FROM {table} WHERE {not_null} GROUP BY {cols}) AS keep_rows)"
+    ))
+    return result.rowcount
+
+def migrate_score_unique_keys(engine):
+    existing = _index_names(engine, "scores")
+    for name, columns in SCORE_UNIQUE_KEYS.items():
+        if name in existing:
+            continue
+        with engine.begin() as conn:
+            removed = _dedupe(conn, "scores", columns)
+            conn.execute(text(f"CREATE UNIQUE INDEX {name} ON scores ({', '.join(columns)})"))
+        print(f"✅ Added unique key {name} (removed {removed} duplicate scores)")
+
+def migrate_declared_columns(engine):
+    """Adds nullable columns declared in the models that the live tables are missing (e.g. the audit_logs context columns)."""
+    from core.database import Base
+    import models.all_models  # noqa: F401 (registers the tables on Base.metadata)
+
+    inspector = inspect(engine)
+    live_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in live_tables:
+            continue
+        existing = {col["name"] for col in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or column.primary_key or not column.nullable:
+                continue
+            col_type = column.type.compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}"))
+            print(f"✅ Added column {column.name} to {table.name}")
+
+def migrate_sqlite_autoincrement(engine):
+    """
+    Rebuilds SQLite tables declared with sqlite_autoincrement (audit_logs) that
+    were created without it, and moves their id counter past the ids already
+    archived, so ids the audit feed has shown are never handed out again.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    from core.database import Base
+    import models.all_models  # noqa: F401 (registers the tables on Base.metadata)
+
+    inspector = inspect(engine)
+    live_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in live_tables or not table.dialect_options["sqlite"]["autoincrement"]:
+            continue
+        with engine.begin() as conn:
+            create_sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                                      {"name": table.name}).scalar()
+            if "AUTOINCREMENT" in create_sql.upper():
+                continue
+            old_name = f"{table.name}_old"
+            columns = ", ".join(col["name"] for col in inspector.get_columns(table.name) if col["name"] in table.columns)
+            indexes = [index["name"] for index in inspector.get_indexes(table.name)]
+            conn.execute(text(f"ALTER TABLE {table.name} RENAME TO {old_name}"))
+            for name in indexes:
+                conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+            table.create(bind=conn)
+            conn.execute(text(f"INSERT INTO {table.name} ({columns}) SELECT {columns} FROM {old_name}"))
+            conn.execute(text(f"DROP TABLE {old_name}"))
+
+            highest = conn.execute(text(f"SELECT MAX(id) FROM {table.name}")).scalar() or 0
+            if f"{table.name}_archive" in live_tables:
+                highest = max(highest, conn.execute(text(f"SELECT MAX(id) FROM {table.name}_archive")).scalar() or 0)
+            conn.execute(text("DELETE FROM sqlite_sequence WHERE name = :name"), {"name": table.name})
+            conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES (:name, :seq)"), {"name": table.name, "seq": highest})
+        print(f"✅ Rebuilt {table.name} with AUTOINCREMENT ids")
+
+def migrate_declared_indexes(engine):
+    """Creates every index declared in the models that the live tables are missing."""
+    from core.database import Base
+    import models.all_models  # noqa: F401 (registers the tables on Base.metadata)
+
+    inspector = inspect(engine)
+    live_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in live_tables:
+            continue
+        existing = _index_names(engine, table.name)
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            index.create(bind=engine)
+            print(f"✅ Added index {index.name} on {table.name}")
+
+MIGRATIONS = [
+    migrate_score_unique_keys,   # Must run first: removes duplicates before the unique keys exist
+    migrate_declared_columns,    # Before the indexes that cover the new columns
+    migrate_sqlite_autoincrement,
+    migrate_declared_indexes,
+]
+
+def run_migrations(engine):
+    for migration in MIGRATIONS:
+        migration(engine)
@@ -0,0 +1,103 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import bcrypt
+
+# ----------------------------------------------------------------
+# PASSWORD HASHING (bcrypt off the UI threads)
+# ----------------------------------------------------------------
+# One bcrypt check costs ~250 ms of CPU at the default work factor. Once
+# start() is called (main.py does it at startup) hashes and checks run on a
+# bounded process pool, so a login burst before an event spreads across the
+# cores instead of queueing on one. Until then they run inline on the caller's
+# thread (scripts, tests).
+#
+# bcrypt_rounds sets the work factor for new hashes. A login whose stored
+# hash has another cost is rehashed transparently (see verify()).
+
+def work_factor():
+    return int(os.getenv("bcrypt_rounds", "12"))
+
+
+def hash_cost(password_hash):
+    """The cost a bcrypt hash was made with ($2b$12$... -> 12), or None if it is not a bcrypt hash."""
+    parts = (password_hash or "").split("$")
+    if len(parts) >= 4 and parts[2].isdigit():
+        return int(parts[2])
+    return None
+
+
+def _hash(password, rounds):
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _verify(password, password_hash, rounds):
+    if not password_hash or not bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8')):
+        return False, None
+    cost = hash_cost(password_hash)
+    if cost is not None and cost != rounds:
+        # The password is at hand only now: upgrade (or downgrade) to the configured cost
+        return True, _hash(password, rounds)
+    return True, None
+
+
+class PasswordHasher:
+    def __init__(self):
+        self._pool = None
+        self._slots = None
+        self._lock = threading.Lock()
+
+    def start(self, max_workers=None, max_pending=None):
+        """
+        Starts the worker processes (env bcrypt_workers, default one per core).
+        At most `max_pending` requests (default 4 per worker) are handed to the
+        pool at once; callers beyond that wait their turn.
+        """
+        with self._lock:
+            if self._pool:
+                return
+            workers = max_workers or int(os.getenv("bcrypt_workers", "0")) or os.cpu_count() or 1
+            # spawn: workers never inherit the app's threads or locks
+            self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            self._slots = threading.BoundedSemaphore(max_pending or workers * 4)
+        atexit.register(self.stop)
+
+    def stop(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, fn, *args):
+        pool, slots = self._pool, self._slots
+        if pool is None:
+            return fn(*args)
+        with slots:
+            try:
+                return pool.submit(fn, *args).result()
+            except BrokenProcessPool:
+                # A worker died (e.g. killed by the OS): finish inline, start fresh next time
+                print("⚠️  Password worker pool broke; hashing inline until it restarts.")
+                with self._lock:
+                    if self._pool is pool:
+                        self._pool = None
+                        self._slots = None
+                self.start()
+                return fn(*args)
+
+    def hash(self, password, rounds=None):
+        """bcrypt hash (str) of `password` at `rounds` (default: bcrypt_rounds)."""
+        return self._run(_hash, password, rounds or work_factor())
+
+    def verify(self, password, password_hash):
+        """
+        (matches, new_hash). new_hash is set when the password matched but the
+        stored hash was made with another work factor; store it in place of the old one.
+        """
+        return self._run(_verify, password, password_hash, work_factor())
+
+
+passwords = PasswordHasher()
@@ -0,0 +1,26 @@
+from sqlalchemy.dialects import mysql, sqlite
+
+# ----------------------------------------------------------------
+# NATIVE UPSERT (MySQL, or the embedded SQLite backend and tests)
+# ----------------------------------------------------------------
+def upsert(db, model, rows, key_columns, update_columns):
+    """
+    Inserts one or many rows in a single statement, updating `update_columns`
+    where a row with the same unique key already exists:
+    MySQL  -> INSERT ... ON DUPLICATE KEY UPDATE
+    SQLite -> INSERT ... ON CONFLICT (key_columns) DO UPDATE
+
+    `rows` is one dict or a list of dicts (multi-row VALUES).
+    `key_columns` must match a unique index of the table (SQLite needs it as the
+    conflict target). Concurrent writers of the same key end up with one row.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        stmt = sqlite.insert(model).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={col: stmt.excluded[col] for col in update_columns}
+        )
+    else:
+        stmt = mysql.insert(model).values(rows)
+        stmt = stmt.on_duplicate_key_update({col: stmt.inserted[col] for col in update_columns})
+    return db.execute(stmt)
@@ -1,9 +1,14 @@
-import bcrypt
 from sqlalchemy.orm import Session
-from core.database import engine, Base, SessionLocal
+from core.database import get_engine, Base, SessionLocal, create_database_if_not_exists
+from core.migrations import run_migrations
+from core.passwords import passwords
 from models.all_models import User, Event, Segment
 
 def init_db():
+    # 0. Create the database itself (importing core.database no longer does this)
+    create_database_if_not_exists()
+    engine = get_engine()
+
     # 1. Create Tables
     print("⏳ Connecting to MySQL and creating tables...")
     try:
@@ -14,6 +19,13 @@ def init_db():
         print(f"❌ Error creating tables: {e}")
         return
 
+    # 1b. Upgrade tables created by older versions (keys, indexes)
+    try:
+        run_migrations(engine)
+    except Exception as e:
+        print(f"❌ Error migrating tables: {e}")
+        return
+
     # 2. Open a Session
     db: Session = SessionLocal()
 
@@ -24,10 +36,8 @@ def init_db():
         print("👤 Admin user not found. Creating one...")
         
         # IAS REQUIREMENT: Hash the password!
-        # We use bcrypt to hash "admin123"
-        password_raw = "admin123".encode('utf-8')
-        salt = bcrypt.gensalt()
-        hashed_password = bcrypt.hashpw(password_raw, salt).decode('utf-8')
+        # We use bcrypt to hash "admin123" (work factor: bcrypt_rounds)
+        hashed_password = passwords.hash("admin123")
 
         admin_user = User(
             username="admin",
@@ -1,9 +1,16 @@
 import flet as ft
 import socket
 import os
+import sys
+import threading
 from dotenv import load_dotenv 
 from services.auth_service import AuthService
-from core.database import SessionLocal
+from services.audit_writer import audit_writer
+from services.audit_retention import audit_retention
+from core.passwords import passwords
+from core.database import ensure_database
+from core.asset_store import ImmutableAssetHeaders
+from components.live_updates import stop_live_views
 
 # Views
 from views.login_view import LoginView
@@ -18,7 +25,32 @@ from views.viewer_dashboard import EventListView, EventLeaderboardView
 load_dotenv() 
 # ----------------------------------
 
+_services_lock = threading.Lock()
+_services_started = False
+
+def start_background_services():
+    """
+    Runs once per process, whichever way the app is launched (python main.py,
+    flet run, or create_web_app() under an ASGI server).
+    """
+    global _services_started
+    with _services_lock:
+        if _services_started:
+            return
+        # Connect (creating the database if missing) and bring the tables up to
+        # date once, before the first page loads; a schema that cannot be
+        # migrated stops the launch here instead of failing later queries
+        ensure_database()
+        # Audit rows are written in the background (replays any left in the spill file)
+        audit_writer.start()
+        # Moves closed events' and expired audit rows to the archive table, in the background
+        audit_retention.start()
+        # bcrypt hashing/checks run on worker processes so a login burst uses every core
+        passwords.start()
+        _services_started = True
+
 def main(page: ft.Page):
+    start_background_services()
     page.title = "JudgeMeNot"
     page.theme_mode = ft.ThemeMode.LIGHT
     
@@ -43,6 +75,8 @@ def main(page: ft.Page):
                 page.go("/leaderboard")
                 return 
 
+        # The old view's live subscriptions go away with it
+        stop_live_views(page)
         page.views.clear()
         uid = page.session.get("user_id")
         role = page.session.get("user_role")
@@ -101,8 +135,20 @@ def main(page: ft.Page):
 
     page.on_route_change = route_change
     page.on_view_pop = view_pop
+    page.on_close = lambda e: stop_live_views(page)
     page.go("/login")
 
+def create_web_app():
+    """
+    Flet web app for judge tablets and viewer phones on the venue network.
+    Content-addressed photos are served with immutable cache headers, so each
+    device downloads a photo once. Only this entry point (python main.py --web,
+    or an ASGI server pointed at main:create_web_app) adds them: the default
+    ft.app() launch and `flet run` use Flet's own server, which cannot be wrapped.
+    """
+    start_background_services()
+    return ImmutableAssetHeaders(ft.app(target=main, assets_dir="assets", export_asgi_app=True))
+
 def get_local_ip():
     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
@@ -123,5 +169,12 @@ if __name__ == "__main__":
     print(f"📱  Judges connect here: http://{my_ip}:{port}")
     print(f"--------------------------------------------------")
 
-    # ft.app(target=main, view=ft.AppView.WEB_BROWSER, port=port, host=my_ip)
-    ft.app(target=main)
\ No newline at end of file
+    start_background_services()
+
+    if "--web" in sys.argv:
+        # Serve devices over the network: python main.py --web
+        import uvicorn
+        uvicorn.run(create_web_app(), host=my_ip, port=port)
+    else:
+        # Desktop window (photos are read from disk; no cache headers involved)
+        ft.app(target=main)
\ No newline at end of file
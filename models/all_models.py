@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Text, Index
 from sqlalchemy.orm import relationship, backref
 from core.database import Base
 
@@ -48,6 +48,9 @@ class Event(Base):
 
 class Segment(Base):
     __tablename__ = 'segments'
+    __table_args__ = (
+        Index('ix_segments_event_order', 'event_id', 'order_index'),
+    )
     
     id = Column(Integer, primary_key=True)
     event_id = Column(Integer, ForeignKey('events.id'))
@@ -78,6 +81,9 @@ class Segment(Base):
 
 class Criteria(Base):
     __tablename__ = 'criteria'
+    __table_args__ = (
+        Index('ix_criteria_segment', 'segment_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     segment_id = Column(Integer, ForeignKey('segments.id'))
@@ -93,6 +99,10 @@ class Criteria(Base):
 # ---------------------------------------------------------
 class Contestant(Base):
     __tablename__ = 'contestants'
+    __table_args__ = (
+        Index('ix_contestants_event_status', 'event_id', 'status'),
+        Index('ix_contestants_event_tabulator', 'event_id', 'assigned_tabulator_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     event_id = Column(Integer, ForeignKey('events.id'))
@@ -112,6 +122,16 @@ class Contestant(Base):
 # ---------------------------------------------------------
 class Score(Base):
     __tablename__ = 'scores'
+    # One row per answer: writes upsert against these keys (see core/upsert.py).
+    # NULLs never collide, so pageant rows (no question) and quiz rows (no criteria) each use their own key.
+    __table_args__ = (
+        Index('uq_scores_judge_contestant_criteria', 'judge_id', 'contestant_id', 'criteria_id', unique=True),
+        Index('uq_scores_contestant_segment_question', 'contestant_id', 'segment_id', 'question_number', unique=True),
+        # Standings: criteria -> scores join grouped by contestant, covering the averaged value
+        Index('ix_scores_criteria_contestant', 'criteria_id', 'contestant_id', 'score_value'),
+        # Quiz totals and round deletes: segment -> scores
+        Index('ix_scores_segment', 'segment_id'),
+    )
     
     id = Column(Integer, primary_key=True)
     contestant_id = Column(Integer, ForeignKey('contestants.id'))
@@ -135,6 +155,9 @@ class Score(Base):
 
 class JudgeProgress(Base):
     __tablename__ = 'judge_progress'
+    __table_args__ = (
+        Index('ix_judge_progress_judge_segment', 'judge_id', 'segment_id'),
+    )
     id = Column(Integer, primary_key=True)
     judge_id = Column(Integer, ForeignKey('users.id'))
     segment_id = Column(Integer, ForeignKey('segments.id'))
@@ -142,18 +165,68 @@ class JudgeProgress(Base):
 
 class AuditLog(Base):
     __tablename__ = 'audit_logs'
+    __table_args__ = (
+        Index('ix_audit_logs_timestamp', 'timestamp'),
+        # Filters of the audit feed, newest first by id (AdminService.get_security_logs)
+        Index('ix_audit_logs_event', 'event_id', 'id'),
+        Index('ix_audit_logs_segment', 'segment_id', 'id'),
+        Index('ix_audit_logs_contestant', 'contestant_id', 'id'),
+        Index('ix_audit_logs_user', 'user_id', 'id'),
+        Index('ix_audit_logs_action', 'action', 'id'),
+        # Ids are never handed out twice, even after the newest rows were archived
+        # (the archive keeps them). MySQL needs 8.0+, which persists the counter across restarts.
+        {"sqlite_autoincrement": True},
+    )
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey('users.id'))
     action = Column(String(50)) 
     details = Column(Text)
     timestamp = Column(DateTime, default=datetime.datetime.now)
+    # What the entry is about. No foreign keys: entries outlive the rows they describe.
+    event_id = Column(Integer)
+    segment_id = Column(Integer)
+    contestant_id = Column(Integer)
+    entity_type = Column(String(20))   # "score", "segment", "event", "user"
+    payload = Column(Text)             # Compact JSON of the values involved (e.g. {"scores":[[criteria_id,value],...]})
     user = relationship("User", back_populates="audit_logs")
 
+class AuditLogArchive(Base):
+    """
+    Audit rows moved out of audit_logs by services/audit_retention.py (closed
+    events, and rows past the retention horizon). Same columns and ids, so the
+    audit feed reads both tables as one (AdminService.get_security_logs).
+    """
+    __tablename__ = 'audit_logs_archive'
+    __table_args__ = (
+        Index('ix_audit_logs_archive_timestamp', 'timestamp'),
+        Index('ix_audit_logs_archive_event', 'event_id', 'id'),
+        Index('ix_audit_logs_archive_segment', 'segment_id', 'id'),
+        Index('ix_audit_logs_archive_contestant', 'contestant_id', 'id'),
+        Index('ix_audit_logs_archive_user', 'user_id', 'id'),
+        Index('ix_audit_logs_archive_action', 'action', 'id'),
+    )
+    id = Column(Integer, primary_key=True, autoincrement=False)  # The id it had in audit_logs
+    user_id = Column(Integer)
+    action = Column(String(50))
+    details = Column(Text)
+    timestamp = Column(DateTime)
+    event_id = Column(Integer)
+    segment_id = Column(Integer)
+    contestant_id = Column(Integer)
+    entity_type = Column(String(20))
+    payload = Column(Text)
+    archived_at = Column(DateTime, default=datetime.datetime.now)
+    user = relationship("User", primaryjoin="foreign(AuditLogArchive.user_id) == User.id", viewonly=True)
+
 class EventJudge(Base):
     __tablename__ = 'event_judges'
+    __table_args__ = (
+        Index('ix_event_judges_event_judge', 'event_id', 'judge_id'),
+        Index('ix_event_judges_judge', 'judge_id'),
+    )
     id = Column(Integer, primary_key=True)
     event_id = Column(Integer, ForeignKey('events.id'))
     judge_id = Column(Integer, ForeignKey('users.id'))
     is_chairman = Column(Boolean, default=False) 
     event = relationship("Event", back_populates="assigned_judges")
-    judge = relationship("User")
\ No newline at end of file
+    judge = relationship("User")
@@ -1,13 +1,13 @@
-import bcrypt
 from sqlalchemy.orm import Session
-from core.database import SessionLocal, engine, Base
+from core.database import SessionLocal, get_engine, Base
+from core.passwords import passwords
 from models.all_models import User, Event, Segment, Criteria, Contestant, EventJudge
 
 def seed_data():
     print("🌱 Seeding database with Advanced Quiz Setup...")
     
     # Ensure tables exist
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
     db: Session = SessionLocal()
 
     try:
@@ -15,9 +15,7 @@ def seed_data():
         # 1. CREATE USERS
         # =====================================================
         # Password for all: 'pass123'
-        password = "pass123".encode('utf-8')
-        salt = bcrypt.gensalt()
-        hashed = bcrypt.hashpw(password, salt).decode('utf-8')
+        hashed = passwords.hash("pass123")
 
         users_config = [
             {"username": "admin", "name": "Super Admin", "role": "Admin"},
@@ -1,26 +1,27 @@
-import bcrypt
 from sqlalchemy.orm import Session, joinedload
 from core.database import SessionLocal
-from models.all_models import User, Event, AuditLog, Segment, Criteria, Score, Contestant, EventJudge
-import datetime
+from core.passwords import passwords
+from core.instrumentation import instrument_service
+from core.event_bus import event_bus
+from services.tabulation_service import notify_event_changed
+from services.quiz_scoreboard import quiz_scoreboard
+from services.audit_writer import audit_writer
+from models.all_models import User, Event, AuditLog, AuditLogArchive, Segment, Criteria, Score, Contestant, EventJudge
 
+# Audit log rows per page (see get_security_logs)
+AUDIT_PAGE_SIZE = 100
+
+@instrument_service
 class AdminService:
     # --- HELPER: LOGGING ---
-    def log_action(self, user_id, action, details):
-        db: Session = SessionLocal()
-        try:
-            new_log = AuditLog(
-                user_id=user_id,
-                action=action,
-                details=details,
-                timestamp=datetime.datetime.now()
-            )
-            db.add(new_log)
-            db.commit()
-        except Exception as e:
-            print(f"Failed to write log: {e}")
-        finally:
-            db.close()
+    def log_action(self, user_id, action, details, **fields):
+        # Queued; written in batches by the audit writer (fields: see AuditWriter.record)
+        audit_writer.record(user_id, action, details, **fields)
+
+    # --- HELPER: EVENTS SHOWING A JUDGE ---
+    def _judge_event_ids(self, db, user_id):
+        """Events the user is assigned to judge (their name is in those events' standings and exports)."""
+        return [event_id for (event_id,) in db.query(EventJudge.event_id).filter(EventJudge.judge_id == user_id).distinct()]
 
     def get_all_users(self):
         db: Session = SessionLocal()
@@ -35,8 +36,7 @@ class AdminService:
             if db.query(User).filter(User.username == username).first():
                 return False, "Username already exists."
 
-            salt = bcrypt.gensalt()
-            hashed = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+            hashed = passwords.hash(password)
 
             new_user = User(
                 name=name,
@@ -47,9 +47,11 @@ class AdminService:
                 is_pending=False # Admin created users are auto-approved
             )
             db.add(new_user)
+            db.flush()
+            new_user_id = new_user.id
             db.commit()
             
-            self.log_action(admin_id, "CREATE_USER", f"Created user '{username}' as {role}")
+            self.log_action(admin_id, "CREATE_USER", f"Created user '{username}' as {role}", entity_type="user", target_user_id=new_user_id)
             return True, "User created successfully."
         except Exception as e:
             return False, str(e)
@@ -80,12 +82,14 @@ class AdminService:
                 details += " [Account Approved/Active]"
 
             if password:
-                salt = bcrypt.gensalt()
-                user.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+                user.password_hash = passwords.hash(password)
                 details += " [Password Changed]"
                 
+            event_ids = self._judge_event_ids(db, user_id)
             db.commit()
-            self.log_action(admin_id, "UPDATE_USER", details)
+            for event_id in event_ids:
+                notify_event_changed(event_id)
+            self.log_action(admin_id, "UPDATE_USER", details, entity_type="user", target_user_id=user_id)
             return True, "User updated successfully."
         except Exception as e:
             return False, str(e)
@@ -99,10 +103,13 @@ class AdminService:
             if not user: return False, "User not found"
             
             username = user.username
+            event_ids = self._judge_event_ids(db, user_id)
             db.delete(user)
             db.commit()
+            for event_id in event_ids:
+                notify_event_changed(event_id)
             
-            self.log_action(admin_id, "DELETE_USER", f"Deleted user '{username}'")
+            self.log_action(admin_id, "DELETE_USER", f"Deleted user '{username}'", entity_type="user", target_user_id=user_id)
             return True, "User deleted successfully."
         except Exception as e:
             return False, str(e)
@@ -125,8 +132,11 @@ class AdminService:
                 status='Active'
             )
             db.add(new_event)
+            db.flush()
+            event_id = new_event.id
             db.commit()
-            self.log_action(admin_id, "CREATE_EVENT", f"Created event '{name}' ({event_type})")
+            event_bus.publish_event(event_id)
+            self.log_action(admin_id, "CREATE_EVENT", f"Created event '{name}' ({event_type})", event_id=event_id, entity_type="event")
             return True, "Event created successfully."
         except Exception as e:
             return False, str(e)
@@ -168,7 +178,9 @@ class AdminService:
             db.delete(event)
             
             db.commit()
-            self.log_action(admin_id, "DELETE_EVENT", f"Deleted event '{event_name}' and all related data.")
+            notify_event_changed(event_id)
+            quiz_scoreboard.forget(event_id)
+            self.log_action(admin_id, "DELETE_EVENT", f"Deleted event '{event_name}' and all related data.", event_id=event_id, entity_type="event")
             return True, "Event deleted successfully."
         except Exception as e:
             db.rollback()
@@ -183,12 +195,44 @@ class AdminService:
         finally:
             db.close()
 
-    def get_security_logs(self):
+    def get_security_logs(self, after_id=None, before_id=None, limit=AUDIT_PAGE_SIZE, user_id=None, action=None,
+                          event_id=None, segment_id=None, contestant_id=None, since=None, until=None, include_archive=True):
+        """
+        One page of audit logs, newest first, paged by id (keyset, no OFFSET):
+          - no ids          -> the newest `limit` rows
+          - before_id=N     -> the next older page (rows with id < N)
+          - after_id=N      -> tail mode: only rows newer than N (the oldest `limit`
+                               of them; call again with the new max id if a full page came back)
+        Optional filters (combined with AND, each backed by an index on both tables):
+        user_id, action, event_id, segment_id, contestant_id, and since/until (datetimes, inclusive).
+        Archived rows (audit_logs_archive, same ids) are merged in unless include_archive=False.
+        """
         db: Session = SessionLocal()
         try:
-            return db.query(AuditLog)\
-                     .options(joinedload(AuditLog.user))\
-                     .order_by(AuditLog.timestamp.desc())\
-                     .all()
+            logs = []
+            for model in (AuditLog, AuditLogArchive) if include_archive else (AuditLog,):
+                query = db.query(model).options(joinedload(model.user))
+                for column, value in (("user_id", user_id), ("action", action), ("event_id", event_id),
+                                      ("segment_id", segment_id), ("contestant_id", contestant_id)):
+                    if value is not None:
+                        query = query.filter(getattr(model, column) == value)
+                if since is not None:
+                    query = query.filter(model.timestamp >= since)
+                if until is not None:
+                    query = query.filter(model.timestamp <= until)
+
+                if after_id is not None:
+                    query = query.filter(model.id > after_id).order_by(model.id.asc())
+                else:
+                    if before_id is not None:
+                        query = query.filter(model.id < before_id)
+                    query = query.order_by(model.id.desc())
+                logs.extend(query.limit(limit).all())
+
+            if after_id is not None:
+                logs.sort(key=lambda log: log.id)
+                return logs[:limit][::-1]
+            logs.sort(key=lambda log: log.id, reverse=True)
+            return logs[:limit]
         finally:
             db.close()
\ No newline at end of file
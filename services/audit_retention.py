@@ -0,0 +1,126 @@
+import atexit
+import datetime
+import os
+import threading
+import time
+from sqlalchemy import select, insert, literal
+from core.database import SessionLocal
+from models.all_models import AuditLog, AuditLogArchive, Event
+
+# Columns copied as-is (the archive keeps the original ids)
+ARCHIVED_COLUMNS = ["id", "user_id", "action", "details", "timestamp",
+                    "event_id", "segment_id", "contestant_id", "entity_type", "payload"]
+
+# ----------------------------------------------------------------
+# AUDIT LOG RETENTION (Live table -> audit_logs_archive)
+# ----------------------------------------------------------------
+class AuditRetention:
+    """
+    Keeps audit_logs small: rows of events that are no longer Active, and rows
+    older than the retention horizon (env audit_retention_days, default 30),
+    are moved to audit_logs_archive in chunks of `batch_size`, one short
+    transaction per chunk with a pause in between, so scoring never waits
+    behind a long delete. The audit feed reads both tables
+    (AdminService.get_security_logs), so nothing disappears from view.
+    """
+    def __init__(self, batch_size=1000, interval=None, pause=0.05):
+        self.batch_size = batch_size
+        # Minutes between runs of the background thread (env audit_archive_interval)
+        self.interval = interval
+        self.pause = pause
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def horizon(self, now=None):
+        days = float(os.getenv("audit_retention_days", "30"))
+        return (now or datetime.datetime.now()) - datetime.timedelta(days=days)
+
+    def _closed_event_ids(self):
+        """Events with live audit rows that are ended (or deleted)."""
+        db = SessionLocal()
+        try:
+            logged = {eid for (eid,) in db.query(AuditLog.event_id).filter(AuditLog.event_id.isnot(None)).distinct()}
+            if not logged:
+                return []
+            active = {eid for (eid,) in db.query(Event.id).filter(Event.id.in_(logged), Event.status == "Active")}
+            return sorted(logged - active)
+        finally:
+            db.close()
+
+    def archive_batch(self, condition):
+        """Moves up to batch_size live rows matching `condition` (oldest ids first). Returns how many moved."""
+        db = SessionLocal()
+        try:
+            ids = [row_id for (row_id,) in db.query(AuditLog.id).filter(condition).order_by(AuditLog.id).limit(self.batch_size)]
+            if not ids:
+                return 0
+            columns = [getattr(AuditLog, name) for name in ARCHIVED_COLUMNS]
+            db.execute(insert(AuditLogArchive.__table__).from_select(
+                ARCHIVED_COLUMNS + ["archived_at"],
+                select(*columns, literal(datetime.datetime.now(), AuditLogArchive.archived_at.type)).where(AuditLog.id.in_(ids))
+            ))
+            db.query(AuditLog).filter(AuditLog.id.in_(ids)).delete(synchronize_session=False)
+            db.commit()
+            return len(ids)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def run_once(self, now=None):
+        """Archives everything currently due. Returns the number of rows moved."""
+        with self._lock:
+            conditions = [AuditLog.timestamp < self.horizon(now)]
+            conditions += [AuditLog.event_id == event_id for event_id in self._closed_event_ids()]
+            moved = 0
+            for condition in conditions:
+                while not self._stop.is_set():
+                    count = self.archive_batch(condition)
+                    moved += count
+                    if count < self.batch_size:
+                        break
+                    time.sleep(self.pause)  # Let scoring transactions in between chunks
+            return moved
+
+    # --- Lifecycle ---
+    def start(self):
+        """Runs run_once now and then every `interval` minutes on a background thread (once; later calls do nothing)."""
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="AuditRetention", daemon=True)
+            self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        with self._start_lock:
+            if not self._thread:
+                return
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout=10)
+            self._thread = None
+
+    def wake(self):
+        """Asks the thread for a run now (e.g. after an event was ended)."""
+        self._wake.set()
+
+    def _run(self):
+        interval = self.interval if self.interval is not None else float(os.getenv("audit_archive_interval", "15"))
+        while not self._stop.is_set():
+            try:
+                moved = self.run_once()
+                if moved:
+                    print(f"✅ Archived {moved} audit log rows")
+            except Exception as e:
+                print(f"Audit Archive Error: {e}")
+            self._wake.wait(interval * 60)
+            self._wake.clear()
+
+
+audit_retention = AuditRetention()
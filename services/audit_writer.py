@@ -0,0 +1,365 @@
+import atexit
+import datetime
+import glob
+import json
+import os
+import queue
+import threading
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+from core.database import SessionLocal
+from core.event_bus import event_bus, AUDIT_TOPIC
+from models.all_models import AuditLog, User, Contestant, Criteria, Segment
+
+# ----------------------------------------------------------------
+# ROW BUILDING (runs on the writer thread, per batch)
+# ----------------------------------------------------------------
+# Services record ids, not text; the names for the details column and any
+# context the caller did not have at hand (a score's segment, a segment's
+# event) are looked up once per batch here instead of on the hot path.
+
+def _load_names(db, records):
+    """
+    {"users": {id: (username, role)}, "contestants": {id: (name, event_id)},
+     "segments": {id: (name, event_id)}, "criteria": {id: (name, segment_id)}} for a batch.
+    """
+    wanted = {"users": set(), "contestants": set(), "criteria": set(), "segments": set()}
+    for rec in records:
+        if rec["action"] == "LOGOUT" and rec["details"] is None: wanted["users"].add(rec["user_id"])
+        if rec["contestant_id"] is not None: wanted["contestants"].add(rec["contestant_id"])
+        if rec["segment_id"] is not None: wanted["segments"].add(rec["segment_id"])
+        wanted["criteria"].update(c_id for c_id, _ in rec["payload"].get("scores", []))
+
+    names = {key: {} for key in wanted}
+    if wanted["users"]:
+        names["users"] = {u.id: (u.username, u.role) for u in db.query(User.id, User.username, User.role).filter(User.id.in_(wanted["users"]))}
+    if wanted["criteria"]:
+        names["criteria"] = {c.id: (c.name, c.segment_id) for c in db.query(Criteria.id, Criteria.name, Criteria.segment_id).filter(Criteria.id.in_(wanted["criteria"]))}
+    for key, model in (("contestants", Contestant), ("segments", Segment)):
+        if wanted[key]:
+            names[key] = {row.id: (row.name, row.event_id) for row in db.query(model.id, model.name, model.event_id).filter(model.id.in_(wanted[key]))}
+    return names
+
+
+def _name(names, key, item_id):
+    return names[key].get(item_id, (None, None))[0]
+
+
+def _describe(rec, names):
+    """Builds the details text for a record recorded without one."""
+    action = rec["action"]
+    if action == "SCORE_SUBMIT":
+        c_name = _name(names, "contestants", rec["contestant_id"])
+        scores = rec["payload"].get("scores", [])
+        if len(scores) == 1:
+            c_id, value = scores[0]
+            return f"Scored {value} for '{c_name}' on '{_name(names, 'criteria', c_id)}'"
+        breakdown = ", ".join(f"{_name(names, 'criteria', c_id)}: {value}" for c_id, value in scores)
+        return f"Scored '{c_name}' - {breakdown}"
+    if action == "SCORE_FINALIZED":
+        return f"Judge finalized scores for segment '{_name(names, 'segments', rec['segment_id'])}'"
+    if action == "LOGOUT":
+        username, role = names["users"].get(rec["user_id"], (None, None))
+        return f"User '{username}' ({role}) logged out."
+    return _compact(rec["payload"])
+
+
+def _compact(payload):
+    return json.dumps(payload, separators=(",", ":"), default=str) if payload else None
+
+
+def _build_row(rec, names):
+    segment_id = rec["segment_id"]
+    scores = rec["payload"].get("scores", [])
+    if segment_id is None and scores:
+        # A card's criteria all belong to one segment
+        segment_ids = {names["criteria"].get(c_id, (None, None))[1] for c_id, _ in scores}
+        if len(segment_ids) == 1:
+            segment_id = segment_ids.pop()
+    event_id = rec["event_id"]
+    if event_id is None:
+        event_id = (names["contestants"].get(rec["contestant_id"]) or names["segments"].get(segment_id) or (None, None))[1]
+    return {
+        "user_id": rec["user_id"],
+        "action": rec["action"],
+        "details": rec["details"] if rec["details"] is not None else _describe(rec, names),
+        "timestamp": datetime.datetime.fromisoformat(rec["timestamp"]),
+        "event_id": event_id,
+        "segment_id": segment_id,
+        "contestant_id": rec["contestant_id"],
+        "entity_type": rec["entity_type"],
+        "payload": _compact(rec["payload"]),
+    }
+
+
+# ----------------------------------------------------------------
+# AUDIT WRITER (Bounded queue + spill file + background batches)
+# ----------------------------------------------------------------
+class AuditWriter:
+    """
+    Takes audit records off the request path. record() appends the record to
+    the spill file and puts it on a bounded in-memory queue; a background thread
+    writes what has queued up every `flush_interval` seconds (or as soon as
+    `batch_size` are waiting) with multi-row inserts, then announces AUDIT_TOPIC.
+
+    The spill file is the durable copy: every record is written to it before
+    record() returns and is removed only after its batch has committed, so
+    records survive an app crash or a database outage and are replayed by the
+    next start(). (Writes reach the OS at once but are not fsynced: like
+    SQLite's synchronous=NORMAL, only an OS crash / power loss can drop the
+    last records.) When the queue is full the record is kept in the file only
+    and read back from there by the next batch.
+
+    Until start() is called (main.start_background_services does it however
+    the app is launched) there is no thread and no spill file: records wait in
+    memory for flush(), and a full queue is flushed on the caller's thread.
+    """
+    def __init__(self, max_queue=10000, batch_size=500, flush_interval=0.5):
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()        # spill file, segment list, spilled flag
+        self._flush_lock = threading.Lock()  # one batch at a time
+        self._spill_path = None
+        self._spill = None
+        self._segments = []    # spill files whose records are not committed yet
+        self._seq = 0
+        self._spilled = False  # records exist only on disk (queue was full / replay)
+        self._carry = []       # records of a failed batch, retried first
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    # --- Recording (hot path) ---
+    def record(self, user_id, action, details=None, event_id=None, segment_id=None,
+               contestant_id=None, entity_type=None, **payload):
+        """
+        Queues one audit row. Pass `details` when the text is already at hand,
+        otherwise the writer formats it from the ids when the batch is written.
+        The ids and `entity_type` fill the indexed columns; keyword `payload`
+        values (e.g. scores=[(criteria_id, value), ...]) are stored as compact JSON.
+        """
+        rec = {
+            "user_id": user_id,
+            "action": action,
+            "details": details,
+            "timestamp": datetime.datetime.now().isoformat(),
+            "event_id": event_id,
+            "segment_id": segment_id,
+            "contestant_id": contestant_id,
+            "entity_type": entity_type,
+            "payload": payload,
+        }
+        flush_now = False
+        with self._lock:
+            if self._spill:
+                self._spill.write(json.dumps(rec, default=str) + "\n")
+            try:
+                self._queue.put_nowait(rec)
+            except queue.Full:
+                if self._spill:
+                    self._spilled = True
+                else:
+                    self._carry.append(rec)
+                    flush_now = True
+            backlog = self._spilled or self._queue.qsize() >= self.batch_size
+        if flush_now:
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Audit Log Error: {e}")
+        elif backlog:
+            self._wake.set()
+
+    def pending(self):
+        """Records queued in memory and not written yet (spilled ones are not counted)."""
+        return self._queue.qsize() + len(self._carry)
+
+    # --- Writing ---
+    def flush(self):
+        """
+        Writes every pending record now, on the calling thread. Returns how many
+        rows were inserted. If the database is unavailable the unwritten records
+        are kept (and stay in the spill file) for the next attempt, and the error
+        is raised.
+        """
+        with self._flush_lock:
+            with self._lock:
+                records, self._carry = self._carry, []
+                while True:
+                    try: records.append(self._queue.get_nowait())
+                    except queue.Empty: break
+                spilled, self._spilled = self._spilled, False
+                if not records and not spilled and not self._segments:
+                    return 0
+                if self._spill:
+                    self._rotate()
+                segments = list(self._segments)
+            if spilled:
+                # The spill files hold everything not committed yet, including the queued copies
+                records = [rec for path in segments for rec in _read_spill(path)]
+            if not records:
+                self._forget(segments)
+                return 0
+            written, unwritten, error = self._write(records)
+            if error:
+                with self._lock:
+                    self._carry = unwritten + self._carry
+                raise error
+            self._forget(segments)
+        if written:
+            event_bus.publish(AUDIT_TOPIC)
+        return written
+
+    def _write(self, records):
+        """
+        Inserts a batch. Returns (written, unwritten, error): unwritten records
+        and the error if the database went away part way. A batch the database
+        rejects for its content is retried row by row, so one bad record is set
+        aside (see _reject) instead of blocking every record behind it.
+        """
+        try:
+            self._insert(records)
+            return len(records), [], None
+        except OperationalError as e:
+            return 0, records, e
+        except Exception as e:
+            print(f"Audit Log Error: batch rejected, writing records one by one: {e}")
+        written = 0
+        for n, rec in enumerate(records):
+            try:
+                self._insert([rec])
+                written += 1
+            except OperationalError as e:
+                return written, records[n:], e
+            except Exception as e:
+                self._reject(rec, e)
+        return written, [], None
+
+    def _reject(self, rec, error):
+        """Keeps a record the database refused in the rejected file (next to the spill file) for inspection."""
+        print(f"Audit Log Error: record rejected ({error}): {rec['action']} by user {rec['user_id']}")
+        if not self._spill_path:
+            return
+        root, ext = os.path.splitext(self._spill_path)
+        with open(f"{root}.rejected{ext}", "a", encoding="utf-8") as f:
+            f.write(json.dumps({**rec, "error": str(error)}, default=str) + "\n")
+
+    def _insert(self, records):
+        db = SessionLocal()
+        try:
+            names = _load_names(db, records)
+            rows = [_build_row(rec, names) for rec in records]
+            for start in range(0, len(rows), self.batch_size):
+                # render_nulls keeps one statement per chunk (no regrouping by which columns are None)
+                db.execute(insert(AuditLog).execution_options(render_nulls=True), rows[start:start + self.batch_size])
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    # --- Spill file ---
+    def _rotate(self):
+        """Closes the live spill file as a numbered segment and opens a fresh one (caller holds _lock)."""
+        self._spill.close()
+        self._seq += 1
+        segment = f"{self._spill_path}.{self._seq:08d}"
+        os.replace(self._spill_path, segment)
+        self._segments.append(segment)
+        self._spill = open(self._spill_path, "a", encoding="utf-8", buffering=1)
+
+    def _forget(self, segments):
+        with self._lock:
+            for path in segments:
+                if path in self._segments:
+                    self._segments.remove(path)
+                if os.path.exists(path):
+                    os.remove(path)
+
+    # --- Lifecycle ---
+    def start(self, spill_path=None):
+        """
+        Opens the spill file (env audit_spill_path, default audit_spill.jsonl),
+        queues any records left there by a previous run, and starts the writer thread.
+        Calling it again while the thread runs does nothing.
+        """
+        with self._start_lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._start(spill_path)
+
+    def _start(self, spill_path):
+        with self._lock:
+            self._spill_path = spill_path or os.getenv("audit_spill_path", "audit_spill.jsonl")
+            leftovers = sorted(glob.glob(glob.escape(self._spill_path) + ".*"))
+            if leftovers:
+                self._seq = max((int(p.rsplit(".", 1)[1]) for p in leftovers if p.rsplit(".", 1)[1].isdigit()), default=0)
+            self._segments = leftovers
+            # Anything recorded before start() is journaled now
+            self._spill = open(self._spill_path, "a", encoding="utf-8", buffering=1)
+            for rec in self._carry + list(self._queue.queue):
+                self._spill.write(json.dumps(rec, default=str) + "\n")
+            if os.path.getsize(self._spill_path) or leftovers:
+                self._spilled = True
+                self._wake.set()  # Replay at once
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="AuditWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def stop(self, flush=True):
+        """Stops the thread after a last flush. Unwritten records stay in the spill file."""
+        with self._start_lock:
+            if not self._thread:
+                return
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout=10)
+            self._thread = None
+        if flush:
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Audit Log Error: {e}")
+        with self._lock:
+            if self._spill:
+                self._spill.close()
+                self._spill = None
+                if not self._segments and os.path.exists(self._spill_path) and os.path.getsize(self._spill_path) == 0:
+                    os.remove(self._spill_path)
+
+    def _run(self):
+        delay = self.flush_interval
+        while not self._stop.is_set():
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stop.is_set():
+                break  # stop() does the last flush
+            try:
+                self.flush()
+                delay = self.flush_interval
+            except Exception as e:
+                # Database unavailable: records are safe in the spill file; back off
+                print(f"Audit Log Error: {e}")
+                delay = min(max(delay * 2, 1.0), 30.0)
+
+
+def _read_spill(path):
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                pass  # Torn last line from a crash mid-write
+    return records
+
+
+audit_writer = AuditWriter()
@@ -1,9 +1,11 @@
-import bcrypt
-import datetime
 from sqlalchemy.orm import Session
-from models.all_models import User, AuditLog
+from models.all_models import User
 from core.database import SessionLocal
+from core.passwords import passwords
+from core.instrumentation import instrument_service
+from services.audit_writer import audit_writer
 
+@instrument_service
 class AuthService:
     def login(self, username, password):
         """
@@ -19,29 +21,22 @@ class AuthService:
             if not user:
                 return None
             
-            # 2. Check Password (using bcrypt)
-            if bcrypt.checkpw(password.encode('utf-8'), user.password_hash.encode('utf-8')):
+            # 2. Check Password (bcrypt, on the password worker pool)
+            matches, new_hash = passwords.verify(password, user.password_hash)
+            if matches:
                 if not user.is_active:
                     return "DISABLED" 
                 if user.is_pending:
                     return "PENDING"
-                
-                # --- NEW: LOG THE LOGIN EVENT ---
-                try:
-                    log = AuditLog(
-                        user_id=user.id,
-                        action="LOGIN",
-                        details=f"User '{user.username}' ({user.role}) logged in.",
-                        timestamp=datetime.datetime.now()
-                    )
-                    db.add(log)
+
+                # Stored with an older work factor: replace it while we have the password
+                if new_hash:
+                    user.password_hash = new_hash
                     db.commit()
-                    
-                    # FIX: Refresh user to reload attributes because commit() expired them
                     db.refresh(user)
-                    
-                except Exception as e:
-                    print(f"Logging Failed: {e}") 
+                
+                # --- LOG THE LOGIN EVENT (written in the background) ---
+                audit_writer.record(user.id, "LOGIN", f"User '{user.username}' ({user.role}) logged in.", entity_type="user")
                 # --------------------------------
                 
                 # FIX: Detach user from this session so it persists after db.close()
@@ -57,23 +52,8 @@ class AuthService:
     
     # --- NEW LOGOUT METHOD ---
     def logout(self, user_id):
-        """Logs the logout event."""
-        db: Session = SessionLocal()
-        try:
-            user = db.query(User).get(user_id)
-            if user:
-                log = AuditLog(
-                    user_id=user.id,
-                    action="LOGOUT",
-                    details=f"User '{user.username}' ({user.role}) logged out.",
-                    timestamp=datetime.datetime.now()
-                )
-                db.add(log)
-                db.commit()
-        except Exception as e:
-            print(f"Logout Log Error: {e}")
-        finally:
-            db.close()
+        """Logs the logout event (the writer looks up the username)."""
+        audit_writer.record(user_id, "LOGOUT", entity_type="user")
 
     def get_user_by_id(self, user_id):
         """Helper to retrieve user details during session check"""
@@ -115,7 +95,7 @@ class AuthService:
 
             hashed_password = None
             if password:
-                hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+                hashed_password = passwords.hash(password)
 
             new_user = User(
                 name=name,
@@ -1,7 +1,10 @@
 from sqlalchemy.orm import Session
 from core.database import SessionLocal
+from core.instrumentation import instrument_service
+from services.tabulation_service import notify_event_changed
 from models.all_models import Contestant
 
+@instrument_service
 class ContestantService:
     def add_contestant(self, event_id, number, name, gender, image_path=None, assigned_tabulator_id=None):
         db = SessionLocal()
@@ -36,6 +39,7 @@ class ContestantService:
             )
             db.add(new_c)
             db.commit()
+            notify_event_changed(event_id)
             return True, "Contestant added."
         except Exception as e:
             return False, str(e)
@@ -76,7 +80,9 @@ class ContestantService:
             if image_path:
                 c.image_path = image_path
             
+            event_id = c.event_id
             db.commit()
+            notify_event_changed(event_id)
             return True, "Contestant updated."
         except Exception as e:
             return False, str(e)
@@ -106,6 +112,7 @@ class ContestantService:
                 c.candidate_number -= 1
             
             db.commit()
+            notify_event_changed(event_id)
             return True, "Deleted and reordered."
         except Exception as e:
             db.rollback()
@@ -1,9 +1,13 @@
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
 from core.database import SessionLocal
-from models.all_models import Event, Segment, EventJudge, User, Contestant, AuditLog
-import datetime
+from core.instrumentation import instrument_service
+from services.tabulation_service import notify_event_changed
+from services.audit_writer import audit_writer
+from services.audit_retention import audit_retention
+from models.all_models import Event, Segment, EventJudge, User, Contestant
 
+@instrument_service
 class EventService:
     # ---------------------------------------------------------
     # EVENT FETCHING
@@ -62,6 +66,7 @@ class EventService:
             )
             db.add(new_segment)
             db.commit()
+            notify_event_changed(event_id)
             return True, "Segment added."
         except Exception as e:
             return False, str(e)
@@ -84,7 +89,9 @@ class EventService:
                 seg.percentage_weight = weight
                 seg.is_final = is_final
                 seg.qualifier_limit = limit
+                event_id = seg.event_id
                 db.commit()
+                notify_event_changed(event_id)
                 return True, "Updated."
             return False, "Not found."
         finally:
@@ -97,8 +104,9 @@ class EventService:
             seg = db.query(Segment).get(segment_id)
             if seg:
                 seg.is_revealed = not seg.is_revealed
+                event_id, status = seg.event_id, ("Visible" if seg.is_revealed else "Hidden")
                 db.commit()
-                status = "Visible" if seg.is_revealed else "Hidden"
+                notify_event_changed(event_id)
                 return True, f"Segment is now {status}"
             return False, "Segment not found"
         except Exception as e:
@@ -133,6 +141,7 @@ class EventService:
                 msg = "All segments deactivated."
 
             db.commit()
+            notify_event_changed(event_id)
             return True, msg
         except Exception as e:
             return False, str(e)
@@ -160,11 +169,13 @@ class EventService:
             if exists:
                 exists.is_chairman = is_chairman
                 db.commit()
+                notify_event_changed(event_id)
                 return True, "Judge role updated."
             
             new_assign = EventJudge(event_id=event_id, judge_id=judge_id, is_chairman=is_chairman)
             db.add(new_assign)
             db.commit()
+            notify_event_changed(event_id)
             return True, "Judge assigned."
         except Exception as e:
             return False, str(e)
@@ -176,8 +187,10 @@ class EventService:
         try:
             assign = db.query(EventJudge).get(assignment_id)
             if assign:
+                event_id = assign.event_id
                 db.delete(assign)
                 db.commit()
+                notify_event_changed(event_id)
                 return True, "Judge removed."
             return False, "Not found."
         finally:
@@ -198,17 +211,14 @@ class EventService:
             event = db.query(Event).get(event_id)
             if event:
                 event.status = status
-                
-                # AUDIT LOG
-                log = AuditLog(
-                    user_id=admin_id, 
-                    action="UPDATE_EVENT_STATUS", 
-                    details=f"Changed event '{event.name}' status to {status}", 
-                    timestamp=datetime.datetime.now()
-                )
-                db.add(log)
+                event_name = event.name
                 
                 db.commit()
+                audit_writer.record(admin_id, "UPDATE_EVENT_STATUS", f"Changed event '{event_name}' status to {status}",
+                                    event_id=event_id, entity_type="event", status=status)
+                notify_event_changed(event_id)
+                if status != "Active":
+                    audit_retention.wake()  # Its audit rows move to the archive
                 return True, f"Event set to {status}"
             return False, "Event not found"
         except Exception as e:
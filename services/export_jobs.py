@@ -0,0 +1,174 @@
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from core.database import SessionLocal
+from services.export_service import ExportService
+from services.pageant_service import PageantService
+from services.tabulation_service import data_version
+from models.all_models import Event, Segment
+
+# Report a progress message every this many raw score rows
+RAW_PROGRESS_EVERY = 2000
+
+# ---------------------------------------------------------
+# EXPORT BUILDER (runs on a worker thread)
+# ---------------------------------------------------------
+def build_export(event_id, scope, fmt, filepath, progress):
+    """
+    Writes one results file. `scope` is "overall", "raw" or a segment id (as str),
+    `fmt` is "xlsx" or "pdf". `progress(fraction, message)` is called as it goes
+    (fraction is None while the total is unknown).
+    """
+    pageant_service = PageantService()
+    export_service = ExportService()
+
+    progress(0.05, "Loading results...")
+    db = SessionLocal()
+    try:
+        ev = db.query(Event.name).filter(Event.id == event_id).first()
+        event_name = ev.name if ev else "Event"
+        seg_name = None
+        if scope not in ("overall", "raw"):
+            seg = db.query(Segment.name).filter(Segment.id == int(scope)).first()
+            seg_name = seg.name.upper() if seg else "SEGMENT"
+    finally:
+        db.close()
+
+    if scope == "raw":
+        if fmt != "xlsx":
+            raise ValueError("Raw scores can only be exported to Excel.")
+
+        def counted(rows):
+            for count, row in enumerate(rows, 1):
+                if count % RAW_PROGRESS_EVERY == 0:
+                    progress(None, f"Writing scores... {count:,}")
+                yield row
+
+        export_service.generate_raw_scores_excel(filepath, event_name, "RAW SCORES (AUDIT)", counted(pageant_service.iter_scores_detailed(event_id)))
+        return
+
+    if scope == "overall":
+        data = pageant_service.get_overall_breakdown(event_id)
+        mode = "overall"
+        doc_title = "OFFICIAL OVERALL STANDINGS"
+    else:
+        data = pageant_service.get_segment_tabulation(event_id, int(scope))
+        mode = "segment"
+        doc_title = f"OFFICIAL RESULTS: {seg_name}"
+
+    progress(0.5, "Writing file...")
+    generate = export_service.generate_excel if fmt == "xlsx" else export_service.generate_pdf
+    if not generate(filepath=filepath, event_name=event_name, title=doc_title, data_matrix=data, mode=mode):
+        raise RuntimeError("Export failed.")
+
+
+# ---------------------------------------------------------
+# EXPORT JOB QUEUE (Worker pool + finished-file cache)
+# ---------------------------------------------------------
+class ExportJobQueue:
+    """
+    Runs exports off the UI thread and keeps the finished file per
+    (event, scope, format) together with the event's data version
+    (tabulation_service.data_version, bumped by every committed write).
+    Asking again while the data is unchanged returns the same file at once;
+    asking while an identical job is still running joins that job.
+
+    Files live in `cache_dir`, or in a temporary directory of its own that
+    stop() removes (at exit at the latest).
+    """
+    def __init__(self, max_workers=2, build=build_export, cache_dir=None):
+        self.build = build
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="Export")
+        self._lock = threading.Lock()
+        self._files = {}       # {(event_id, scope, fmt): (version, path)}
+        self._running = {}     # {(event_id, scope, fmt, version): (Future, [progress callbacks])}
+        self._cache_dir = cache_dir
+        self._owns_dir = False
+
+    def _dir(self):
+        with self._lock:
+            if self._cache_dir is None:
+                self._cache_dir = tempfile.mkdtemp(prefix="judgemenot_exports_")
+                self._owns_dir = True
+                atexit.register(self.stop)
+            return self._cache_dir
+
+    def stop(self):
+        """Waits for running exports, then deletes the cached files (and the temporary directory)."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            files, self._files = self._files, {}
+            if self._owns_dir:
+                shutil.rmtree(self._cache_dir, ignore_errors=True)
+                self._cache_dir = None
+                self._owns_dir = False
+                return
+        for _, path in files.values():
+            if os.path.exists(path):
+                os.remove(path)
+
+    def cached(self, event_id, scope, fmt):
+        """Path of the finished file if it matches the current data, else None."""
+        version = data_version(event_id)
+        with self._lock:
+            entry = self._files.get((event_id, str(scope), fmt))
+            if entry and entry[0] == version and os.path.exists(entry[1]):
+                return entry[1]
+            return None
+
+    def submit(self, event_id, scope, fmt, on_progress=None):
+        """Returns a Future resolving to the finished file's path (a cached copy; copy it, don't move it)."""
+        path = self.cached(event_id, scope, fmt)
+        if path:
+            if on_progress: on_progress(1.0, "Ready")
+            future = Future()
+            future.set_result(path)
+            return future
+
+        slot = (event_id, str(scope), fmt)
+        version = data_version(event_id)
+        with self._lock:
+            key = slot + (version,)
+            if key in self._running:
+                future, listeners = self._running[key]
+                if on_progress: listeners.append(on_progress)
+                return future
+
+            listeners = [on_progress] if on_progress else []
+            future = self._executor.submit(self._run, slot, version, listeners)
+            self._running[key] = (future, listeners)
+            return future
+
+    def _run(self, slot, version, listeners):
+        def progress(fraction, message):
+            for callback in list(listeners):
+                try: callback(fraction, message)
+                except Exception: pass
+
+        event_id, scope, fmt = slot
+        path = os.path.join(self._dir(), f"event{event_id}_{scope}_v{version}_{uuid.uuid4().hex[:8]}.{fmt}")
+        try:
+            self.build(event_id, scope, fmt, path, progress)
+            with self._lock:
+                # Only keep it if no write happened while it was being built
+                if data_version(event_id) == version:
+                    previous = self._files.get(slot)
+                    self._files[slot] = (version, path)
+                    if previous and previous[1] != path and os.path.exists(previous[1]):
+                        os.remove(previous[1])
+            progress(1.0, "Ready")
+            return path
+        except Exception:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        finally:
+            with self._lock:
+                self._running.pop(slot + (version,), None)
+
+
+export_jobs = ExportJobQueue()
@@ -1,5 +1,6 @@
 import os
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, Border, Side
 from reportlab.lib import colors
 from reportlab.lib.units import inch
@@ -7,36 +8,41 @@ from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph,
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER
 from reportlab.lib.utils import ImageReader
+from core.instrumentation import instrument_service
 
+@instrument_service
 class ExportService:
+    # ---------------------------------------------------------
+    # EXCEL (write-only mode: rows are streamed to disk as they are appended)
+    # ---------------------------------------------------------
+    def _styled(self, ws, value, font=None, border=None):
+        cell = WriteOnlyCell(ws, value=value)
+        if font: cell.font = font
+        if border: cell.border = border
+        return cell
+
+    def _write_excel_title(self, ws, event_name, title):
+        ws.append([self._styled(ws, event_name, Font(size=16, bold=True))])
+        ws.append([self._styled(ws, title, Font(size=14, bold=True))])
+        ws.append([])
+
+    def _write_excel_headers(self, ws, headers):
+        ws.append([self._styled(ws, h, Font(bold=True), Border(bottom=Side(style='thin'))) for h in headers])
+
     def generate_excel(self, filepath, event_name, title, data_matrix, mode="segment"):
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Tabulation"
-        
-        ws['A1'] = event_name; ws['A1'].font = Font(size=16, bold=True)
-        ws['A2'] = title; ws['A2'].font = Font(size=14, bold=True)
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Tabulation")
+        self._write_excel_title(ws, event_name, title)
         
-        row_num = 4
         cols = data_matrix.get('judges', []) if mode == 'segment' else data_matrix.get('segments', [])
         
         def write_gender_table(gender_name, rows):
-            nonlocal row_num
-            ws.cell(row=row_num, column=1, value=f"{gender_name} RANKING").font = Font(bold=True)
-            row_num += 1
-            headers = ["Rank", "#", "Candidate"] + cols + ["Total"]
-            for col_idx, h in enumerate(headers, 1):
-                cell = ws.cell(row=row_num, column=col_idx, value=h)
-                cell.font = Font(bold=True)
-                cell.border = Border(bottom=Side(style='thin'))
-            row_num += 1
+            ws.append([self._styled(ws, f"{gender_name} RANKING", Font(bold=True))])
+            self._write_excel_headers(ws, ["Rank", "#", "Candidate"] + cols + ["Total"])
             for r in rows:
                 scores = r['scores'] if mode == 'segment' else r['segment_scores']
-                row_data = [r['rank'], r['number'], r['name']] + scores + [r['total']]
-                for col_idx, val in enumerate(row_data, 1):
-                    ws.cell(row=row_num, column=col_idx, value=val)
-                row_num += 1
-            row_num += 2
+                ws.append([r['rank'], r['number'], r['name']] + scores + [r['total']])
+            ws.append([]); ws.append([])
 
         write_gender_table("MALE", data_matrix['Male'])
         write_gender_table("FEMALE", data_matrix['Female'])
@@ -44,6 +50,21 @@ class ExportService:
         wb.save(filepath)
         return True
 
+    def generate_raw_scores_excel(self, filepath, event_name, title, rows):
+        """
+        Audit sheet with one row per score. `rows` is any iterable of
+        (segment, candidate #, candidate, judge, criteria, score), e.g.
+        PageantService.iter_scores_detailed(); it is consumed lazily and never held in memory.
+        """
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Raw Scores")
+        self._write_excel_title(ws, event_name, title)
+        self._write_excel_headers(ws, ["Segment", "#", "Candidate", "Judge", "Criteria", "Score"])
+        for row in rows:
+            ws.append(row)
+        wb.save(filepath)
+        return True
+
     def generate_pdf(self, filepath, event_name, title, data_matrix, mode="segment"):
         # Custom Paper Size: 8.5" x 13" (Folio/Long Bond Paper)
         FOLIO_SIZE = (8.5 * inch, 13 * inch)
@@ -0,0 +1,111 @@
+import threading
+from core.event_bus import event_bus, event_topic
+from services.tabulation_service import TabulationService, standings_cache
+
+# Safety re-read for writes that never reach this process's event bus
+# (e.g. a second app instance or manual DB edits). In-process writes are pushed instantly.
+RESYNC_SECONDS = 30
+
+# ---------------------------------------------------------
+# SHARED LEADERBOARD FEED (One refresher per event)
+# ---------------------------------------------------------
+class _EventFeed:
+    def __init__(self, hub, event_id):
+        self.hub = hub
+        self.event_id = event_id
+        self.subscribers = []        # callbacks, in subscription order
+        self.new_subscribers = []    # still waiting for their first result
+        self.last_result = None
+        self.wake = threading.Event()
+        self.stopped = False
+        self.unsubscribe_bus = event_bus.subscribe(event_topic(event_id), lambda payload: self.wake.set())
+        self.thread = threading.Thread(target=self.run, daemon=True, name=f"Leaderboard-{event_id}")
+
+    def run(self):
+        while True:
+            woken = self.wake.wait(timeout=self.hub.resync_seconds)
+            self.wake.clear()
+            if self.stopped:
+                return
+            if not woken:
+                standings_cache.invalidate(self.event_id)
+            try:
+                matrix = self.hub.tabulation_service.get_matrix(self.event_id)
+                result = (matrix.event_name, matrix.leaderboard())
+            except Exception as e:
+                print(f"Leaderboard refresh error (event {self.event_id}): {e}")
+                continue
+
+            with self.hub._lock:
+                changed = result != self.last_result
+                self.last_result = result
+                targets = list(self.subscribers) if changed else list(self.new_subscribers)
+                self.new_subscribers = []
+            for callback in targets:
+                try:
+                    callback(result)
+                except Exception as e:
+                    print(f"Leaderboard subscriber error (event {self.event_id}): {e}")
+
+
+class LeaderboardHub:
+    """
+    Computes each event's public leaderboard once per change and fans the
+    result out to every session watching it, so database and CPU load scale
+    with the number of events, not the number of spectators.
+
+    A refresher thread exists only while an event has subscribers
+    (reference counted); it stops when the last viewer leaves.
+    """
+    def __init__(self, resync_seconds=RESYNC_SECONDS):
+        self.resync_seconds = resync_seconds
+        self.tabulation_service = TabulationService()
+        self._lock = threading.Lock()
+        self._feeds = {}   # {event_id: _EventFeed}
+
+    def subscribe(self, event_id, callback):
+        """
+        callback((event_name, leaderboard)) is called from the refresher thread
+        with the current result and again whenever it changes.
+        Returns a function that unsubscribes.
+        """
+        with self._lock:
+            feed = self._feeds.get(event_id)
+            is_new = feed is None
+            if is_new:
+                feed = _EventFeed(self, event_id)
+                self._feeds[event_id] = feed
+            feed.subscribers.append(callback)
+            feed.new_subscribers.append(callback)
+        if is_new:
+            feed.thread.start()
+        feed.wake.set()
+        return lambda: self.unsubscribe(event_id, callback)
+
+    def unsubscribe(self, event_id, callback):
+        with self._lock:
+            feed = self._feeds.get(event_id)
+            if not feed or callback not in feed.subscribers:
+                return
+            feed.subscribers.remove(callback)
+            if callback in feed.new_subscribers:
+                feed.new_subscribers.remove(callback)
+            if feed.subscribers:
+                return
+            # Last viewer left: stop the refresher
+            del self._feeds[event_id]
+            feed.stopped = True
+        feed.unsubscribe_bus()
+        feed.wake.set()
+
+    def subscriber_count(self, event_id):
+        with self._lock:
+            feed = self._feeds.get(event_id)
+            return len(feed.subscribers) if feed else 0
+
+    def active_events(self):
+        with self._lock:
+            return list(self._feeds)
+
+
+leaderboard_hub = LeaderboardHub()
@@ -1,9 +1,14 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, desc
+from sqlalchemy import func, desc, select
 from core.database import SessionLocal
-from models.all_models import Segment, Criteria, Score, Contestant, Event, User, JudgeProgress, EventJudge, AuditLog
-import datetime
-
+from core.instrumentation import instrument_service
+from core.event_bus import SCORES
+from core.upsert import upsert
+from services.tabulation_service import TabulationService, notify_event_changed, structure_cache
+from services.audit_writer import audit_writer
+from models.all_models import Segment, Criteria, Score, Contestant, Event, User, JudgeProgress, EventJudge
+
+@instrument_service
 class PageantService:
     # ---------------------------------------------------------
     # SEGMENT MANAGEMENT
@@ -25,6 +30,7 @@ class PageantService:
             )
             db.add(new_segment)
             db.commit()
+            notify_event_changed(event_id)
             return True, "Segment added."
         except Exception as e:
             return False, str(e)
@@ -46,7 +52,9 @@ class PageantService:
                 seg.percentage_weight = weight
                 seg.is_final = is_final
                 seg.qualifier_limit = limit
+                event_id = seg.event_id
                 db.commit()
+                notify_event_changed(event_id)
                 return True, "Updated."
             return False, "Not found."
         finally:
@@ -66,7 +74,9 @@ class PageantService:
 
             new_crit = Criteria(segment_id=segment_id, name=name, weight=weight, max_score=max_score)
             db.add(new_crit)
+            event_id = db.query(Segment.event_id).filter(Segment.id == segment_id).scalar()
             db.commit()
+            notify_event_changed(event_id)
             return True, "Criteria added."
         except Exception as e:
             return False, str(e)
@@ -87,7 +97,9 @@ class PageantService:
                 crit.name = name
                 crit.weight = weight
                 crit.max_score = max_score # Fixed: No longer hardcoded to 100
+                event_id = db.query(Segment.event_id).filter(Segment.id == crit.segment_id).scalar()
                 db.commit()
+                notify_event_changed(event_id)
                 return True, "Updated."
             return False, "Not found."
         finally:
@@ -99,44 +111,65 @@ class PageantService:
     def submit_score(self, judge_id, contestant_id, criteria_id, score_value):
         db = SessionLocal()
         try:
-            existing_score = db.query(Score).filter(
-                Score.judge_id == judge_id,
-                Score.contestant_id == contestant_id,
-                Score.criteria_id == criteria_id
-            ).first()
-
-            if existing_score:
-                existing_score.score_value = score_value
-            else:
-                criteria = db.query(Criteria).get(criteria_id)
-                new_score = Score(
-                    judge_id=judge_id,
-                    contestant_id=contestant_id,
-                    criteria_id=criteria_id,
-                    segment_id=criteria.segment_id,
-                    score_value=score_value
-                )
-                db.add(new_score)
-            
-            # AUDIT LOG
-            c_name = db.query(Contestant.name).filter(Contestant.id == contestant_id).scalar()
-            crit_name = db.query(Criteria.name).filter(Criteria.id == criteria_id).scalar()
-            
-            log = AuditLog(
-                user_id=judge_id,
-                action="SCORE_SUBMIT",
-                details=f"Scored {score_value} for '{c_name}' on '{crit_name}'",
-                timestamp=datetime.datetime.now()
-            )
-            db.add(log)
+            # One statement: insert, or overwrite this judge's previous score for the criteria
+            upsert(db, Score, {
+                "judge_id": judge_id,
+                "contestant_id": contestant_id,
+                "criteria_id": criteria_id,
+                "segment_id": select(Criteria.segment_id).where(Criteria.id == criteria_id).scalar_subquery(),
+                "score_value": score_value
+            }, key_columns=["judge_id", "contestant_id", "criteria_id"], update_columns=["score_value"])
             
+            event_id = db.query(Contestant.event_id).filter(Contestant.id == contestant_id).scalar()
             db.commit()
+            # AUDIT LOG (written in the background, names resolved there)
+            audit_writer.record(judge_id, "SCORE_SUBMIT", event_id=event_id, contestant_id=contestant_id, entity_type="score",
+                                scores=[(criteria_id, score_value)])
+            if event_id: notify_event_changed(event_id, SCORES)
             return True, "Score saved."
         except Exception as e:
             return False, str(e)
         finally:
             db.close()
 
+    def submit_scores_bulk(self, judge_id, contestant_id, scores):
+        """
+        Saves a judge's whole card ({criteria_id: score_value}) in one transaction
+        with one consolidated audit record.
+        """
+        if not scores:
+            return False, "No scores to save."
+        db = SessionLocal()
+        try:
+            criteria_ids = list(scores)
+            criterias = {c.id: c for c in db.query(Criteria.id, Criteria.segment_id).filter(Criteria.id.in_(criteria_ids)).all()}
+            missing = [c_id for c_id in criteria_ids if c_id not in criterias]
+            if missing:
+                return False, f"Unknown criteria: {missing}"
+
+            # One multi-row upsert for the whole card
+            rows = [{
+                "judge_id": judge_id,
+                "contestant_id": contestant_id,
+                "criteria_id": criteria_id,
+                "segment_id": criterias[criteria_id].segment_id,
+                "score_value": score_value
+            } for criteria_id, score_value in scores.items()]
+            upsert(db, Score, rows, key_columns=["judge_id", "contestant_id", "criteria_id"], update_columns=["score_value"])
+
+            event_id = db.query(Contestant.event_id).filter(Contestant.id == contestant_id).scalar()
+            db.commit()
+            # AUDIT LOG (One row for the whole card, written in the background)
+            segment_ids = {c.segment_id for c in criterias.values()}
+            audit_writer.record(judge_id, "SCORE_SUBMIT", event_id=event_id, contestant_id=contestant_id, entity_type="score",
+                                segment_id=segment_ids.pop() if len(segment_ids) == 1 else None, scores=list(scores.items()))
+            if event_id: notify_event_changed(event_id, SCORES)
+            return True, "Scores saved."
+        except Exception as e:
+            return False, str(e)
+        finally:
+            db.close()
+
     def get_active_pageants(self):
         db = SessionLocal()
         try:
@@ -145,17 +178,22 @@ class PageantService:
             db.close()
 
     def get_event_structure(self, event_id):
+        """
+        [{"segment": Segment, "criteria": [Criteria, ...]}, ...] in segment order.
+        Cached per event until a structure change (notify_event_changed); treat as read-only.
+        """
+        return structure_cache.get(event_id, self._load_event_structure)
+
+    def _load_event_structure(self, event_id):
         db = SessionLocal()
-        structure = []
         try:
             segments = db.query(Segment).filter(Segment.event_id == event_id).order_by(Segment.order_index).all()
-            for seg in segments:
-                criterias = db.query(Criteria).filter(Criteria.segment_id == seg.id).all()
-                structure.append({
-                    "segment": seg,
-                    "criteria": criterias
-                })
-            return structure
+            criteria_map = {}
+            if segments:
+                criterias = db.query(Criteria).filter(Criteria.segment_id.in_([seg.id for seg in segments])).order_by(Criteria.id).all()
+                for crit in criterias:
+                    criteria_map.setdefault(crit.segment_id, []).append(crit)
+            return [{"segment": seg, "criteria": criteria_map.get(seg.id, [])} for seg in segments]
         finally:
             db.close()
 
@@ -174,96 +212,31 @@ class PageantService:
         finally:
             db.close()
             
-    def calculate_standing(self, event_id):
+    def get_judge_scores_for_segment(self, judge_id, segment_id):
+        """All of a judge's scores in one segment as {contestant_id: {criteria_id: value}}, in one query."""
         db = SessionLocal()
-        results = []
+        scores_map = {}
         try:
-            contestants = db.query(Contestant).filter(Contestant.event_id == event_id).all()
-            segments = db.query(Segment).filter(Segment.event_id == event_id).all()
-
-            for c in contestants:
-                total_event_score = 0.0
-                for s in segments:
-                    segment_score = 0.0
-                    criterias = db.query(Criteria).filter(Criteria.segment_id == s.id).all()
-                    for crit in criterias:
-                        avg_score = db.query(func.avg(Score.score_value))\
-                            .filter(Score.contestant_id == c.id, Score.criteria_id == crit.id)\
-                            .scalar() or 0.0
-                        segment_score += (avg_score * crit.weight)
-                    total_event_score += (segment_score * s.percentage_weight)
-                
-                results.append({
-                    "contestant_id": c.id,
-                    "name": c.name,
-                    "candidate_number": c.candidate_number,
-                    "gender": c.gender, 
-                    "total_score": round(total_event_score, 2)
-                })
-
-            results.sort(key=lambda x: x['total_score'], reverse=True)
-            return results
+            rows = db.query(Score.contestant_id, Score.criteria_id, Score.score_value).filter(
+                Score.judge_id == judge_id,
+                Score.segment_id == segment_id,
+                Score.criteria_id.isnot(None)
+            ).all()
+            for c_id, crit_id, value in rows:
+                scores_map.setdefault(c_id, {})[crit_id] = value
+            return scores_map
         finally:
             db.close()
 
+    def calculate_standing(self, event_id):
+        """Weighted standings for every contestant (all segments), from one bulk load."""
+        return TabulationService().get_matrix(event_id).standing()
+
     # ---------------------------------------------------------
     # NEW: OVERALL BREAKDOWN (UPDATED WITH JUDGES)
     # ---------------------------------------------------------
     def get_overall_breakdown(self, event_id):
-        db = SessionLocal()
-        try:
-            # 1. Get Segments
-            segments = db.query(Segment).filter(Segment.event_id == event_id, Segment.is_final == False).order_by(Segment.order_index).all()
-            segment_names = [s.name for s in segments]
-            
-            # 2. Get Contestants
-            contestants = db.query(Contestant).filter(Contestant.event_id == event_id).all()
-            
-            # 3. Get Judges
-            assigned = db.query(User).join(EventJudge).filter(EventJudge.event_id == event_id).order_by(User.name).all()
-            judge_list = [u.name for u in assigned]
-            
-            data = {'Male': [], 'Female': []}
-
-            for c in contestants:
-                row = {
-                    "number": c.candidate_number,
-                    "name": c.name,
-                    "segment_scores": [],
-                    "total": 0.0
-                }
-                
-                overall_weighted_score = 0.0
-                
-                for s in segments:
-                    segment_raw_score = 0.0
-                    criterias = db.query(Criteria).filter(Criteria.segment_id == s.id).all()
-                    for crit in criterias:
-                        avg = db.query(func.avg(Score.score_value))\
-                            .filter(Score.contestant_id == c.id, Score.criteria_id == crit.id)\
-                            .scalar() or 0.0
-                        segment_raw_score += (avg * crit.weight)
-                    
-                    row['segment_scores'].append(round(segment_raw_score, 2))
-                    overall_weighted_score += (segment_raw_score * s.percentage_weight)
-                
-                row['total'] = round(overall_weighted_score, 2)
-                if c.gender in data:
-                    data[c.gender].append(row)
-
-            for gender in ['Male', 'Female']:
-                data[gender].sort(key=lambda x: x['total'], reverse=True)
-                for i, r in enumerate(data[gender]):
-                    r['rank'] = i + 1
-            
-            return {
-                'segments': segment_names,
-                'judges': judge_list,
-                'Male': data['Male'],
-                'Female': data['Female']
-            }
-        finally:
-            db.close()
+        return TabulationService().get_matrix(event_id).overall_breakdown()
 
     # ---------------------------------------------------------
     # TABULATION MATRIX
@@ -322,30 +295,44 @@ class PageantService:
     # ---------------------------------------------------------
     # ADMIN REPORTING
     # ---------------------------------------------------------
+    def _scores_detailed_select(self, event_id):
+        """(segment, candidate #, candidate, judge, criteria, score) for every criteria score of the event."""
+        return select(
+            Segment.name, Contestant.candidate_number, Contestant.name, User.name, Criteria.name, Score.score_value
+        ).select_from(Score)\
+         .join(Contestant, Score.contestant_id == Contestant.id)\
+         .join(User, Score.judge_id == User.id)\
+         .join(Criteria, Score.criteria_id == Criteria.id)\
+         .join(Segment, Score.segment_id == Segment.id)\
+         .where(Segment.event_id == event_id)\
+         .order_by(Segment.order_index, Contestant.candidate_number, User.name, Criteria.id)
+
     def get_all_scores_detailed(self, event_id):
         db = SessionLocal()
         try:
-            results = db.query(
-                Score, Contestant.name.label("c_name"), User.name.label("j_name"),
-                Criteria.name.label("crit_name"), Segment.name.label("seg_name")
-            ).join(Contestant, Score.contestant_id == Contestant.id)\
-             .join(User, Score.judge_id == User.id)\
-             .join(Criteria, Score.criteria_id == Criteria.id)\
-             .join(Segment, Score.segment_id == Segment.id)\
-             .filter(Segment.event_id == event_id)\
-             .order_by(Segment.order_index, Contestant.candidate_number, User.name).all()
-            
             data = []
-            for row in results:
-                score_obj, c_name, j_name, crit_name, seg_name = row
+            for seg_name, _, c_name, j_name, crit_name, value in db.execute(self._scores_detailed_select(event_id)):
                 data.append({
                     "segment": seg_name, "candidate": c_name, "judge": j_name,
-                    "criteria": crit_name, "score": score_obj.score_value
+                    "criteria": crit_name, "score": value
                 })
             return data
         finally:
             db.close()
 
+    def iter_scores_detailed(self, event_id, batch_size=1000):
+        """
+        Yields one (segment, candidate #, candidate, judge, criteria, score) tuple per score,
+        streamed from the cursor `batch_size` rows at a time, so memory stays flat
+        however large the event is. The session stays open until the generator is exhausted or closed.
+        """
+        db = SessionLocal()
+        try:
+            for row in db.execute(self._scores_detailed_select(event_id).execution_options(yield_per=batch_size)):
+                yield tuple(row)
+        finally:
+            db.close()
+
     # ---------------------------------------------------------
     # ACTIVE SEGMENT CONTROL
     # ---------------------------------------------------------
@@ -372,6 +359,7 @@ class PageantService:
                 msg = "All segments deactivated."
 
             db.commit()
+            notify_event_changed(event_id)
             return True, msg
         except Exception as e:
             return False, str(e)
@@ -397,18 +385,8 @@ class PageantService:
             prog = db.query(JudgeProgress).filter(JudgeProgress.judge_id == judge_id, JudgeProgress.segment_id == segment_id).first()
             if prog: prog.is_finished = True
             else: db.add(JudgeProgress(judge_id=judge_id, segment_id=segment_id, is_finished=True))
-            
-            # AUDIT LOG
-            seg_name = db.query(Segment.name).filter(Segment.id == segment_id).scalar()
-            log = AuditLog(
-                user_id=judge_id,
-                action="SCORE_FINALIZED",
-                details=f"Judge finalized scores for segment '{seg_name}'",
-                timestamp=datetime.datetime.now()
-            )
-            db.add(log)
-            
             db.commit()
+            audit_writer.record(judge_id, "SCORE_FINALIZED", segment_id=segment_id, entity_type="segment")
             return True
         except: return False
         finally: db.close()
@@ -425,38 +403,13 @@ class PageantService:
     # ELIMINATION ENGINE
     # ---------------------------------------------------------
     def get_preliminary_rankings(self, event_id):
-        db = SessionLocal()
-        results = {'Male': [], 'Female': []}
-        try:
-            contestants = db.query(Contestant).filter(Contestant.event_id == event_id).all()
-            segments = db.query(Segment).filter(Segment.event_id == event_id, Segment.is_final == False).all()
-
-            for c in contestants:
-                total_score = 0.0
-                for s in segments:
-                    segment_score = 0.0
-                    criterias = db.query(Criteria).filter(Criteria.segment_id == s.id).all()
-                    for crit in criterias:
-                        avg = db.query(func.avg(Score.score_value))\
-                            .filter(Score.contestant_id == c.id, Score.criteria_id == crit.id)\
-                            .scalar() or 0.0
-                        segment_score += (avg * crit.weight)
-                    total_score += (segment_score * s.percentage_weight)
-                
-                entry = {"contestant": c, "score": round(total_score, 2)}
-                if c.gender in results:
-                    results[c.gender].append(entry)
-
-            results['Male'].sort(key=lambda x: x['score'], reverse=True)
-            results['Female'].sort(key=lambda x: x['score'], reverse=True)
-            return results
-        finally:
-            db.close()
+        return TabulationService().get_matrix(event_id).preliminary_rankings()
 
     def activate_final_round(self, event_id, segment_id, limit):
         db = SessionLocal()
         try:
-            rankings = self.get_preliminary_rankings(event_id)
+            # Eliminations are final: rank from the database, never from a cached matrix
+            rankings = TabulationService().load_matrix(event_id).preliminary_rankings()
             qualifiers = []
             eliminated = []
             
@@ -483,6 +436,7 @@ class PageantService:
                 s.is_active = (s.id == segment_id)
             
             db.commit()
+            notify_event_changed(event_id)
             return True, qualifiers, eliminated
         except Exception as e:
             return False, [], []
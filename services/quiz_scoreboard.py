@@ -0,0 +1,131 @@
+import threading
+from core.database import SessionLocal
+from models.all_models import Segment, Score
+
+# ---------------------------------------------------------
+# QUIZ BEE RUNNING TOTALS (In-memory)
+# ---------------------------------------------------------
+class QuizScoreboard:
+    """
+    Running per-(contestant, round) point totals for Quiz Bee events.
+
+    Each event is read from the scores table once (first use after startup,
+    or rebuild()). After that QuizService.submit_answer keeps it current in
+    O(1): it stores the points for the answered question and adds only the
+    difference to the round total, so overwriting Correct -> Wrong subtracts
+    the points again.
+    """
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._answers = {}   # {event_id: {(contestant_id, round_id, question_number): points}}
+        self._totals = {}    # {event_id: {(contestant_id, round_id): points}}
+        self._write_locks = {}   # {round_id: threading.Lock}
+        self._replays = {}   # {event_id: [ops list per load in progress]}
+
+    # --- LOADING ---
+    def _load(self, event_id):
+        db = SessionLocal()
+        try:
+            rows = db.query(Score.contestant_id, Score.segment_id, Score.question_number, Score.score_value)\
+                .join(Segment, Score.segment_id == Segment.id)\
+                .filter(Segment.event_id == event_id).all()
+        finally:
+            db.close()
+
+        answers = {}
+        for c_id, r_id, q_num, points in rows:
+            answers[(c_id, r_id, q_num)] = points or 0
+        totals = {}
+        for (c_id, r_id, _), points in answers.items():
+            totals[(c_id, r_id)] = totals.get((c_id, r_id), 0) + points
+        return answers, totals
+
+    def _ensure_loaded(self, event_id):
+        with self._lock:
+            if event_id in self._totals:
+                return
+        self.rebuild(event_id)
+
+    def rebuild(self, event_id):
+        """
+        Re-reads the event from the scores table (first use after startup, or
+        Mission Control's Recount). The query runs without the lock, so answers
+        and reads on other events carry on meanwhile; answers recorded while it
+        runs are replayed on the new maps, which then replace the old ones in
+        one assignment.
+        """
+        ops = []
+        with self._lock:
+            self._replays.setdefault(event_id, []).append(ops)
+        try:
+            answers, totals = self._load(event_id)
+        finally:
+            with self._lock:
+                self._replays[event_id].remove(ops)
+                if not self._replays[event_id]:
+                    del self._replays[event_id]
+        with self._lock:
+            for op, args in ops:
+                op(answers, totals, *args)
+            self._answers[event_id], self._totals[event_id] = answers, totals
+
+    def forget(self, event_id):
+        """Drops an event (e.g. deleted). It is reloaded on next use."""
+        with self._lock:
+            self._answers.pop(event_id, None)
+            self._totals.pop(event_id, None)
+
+    def _apply(self, event_id, op, *args):
+        # Called with the lock held; an event that is not loaded is read fresh on next use
+        for ops in self._replays.get(event_id, []):
+            ops.append((op, args))
+        if event_id in self._totals:
+            op(self._answers[event_id], self._totals[event_id], *args)
+
+    @staticmethod
+    def _set_answer(answers, totals, contestant_id, round_id, question_number, points):
+        key = (contestant_id, round_id, question_number)
+        previous = answers.get(key, 0)
+        answers[key] = points
+        totals[(contestant_id, round_id)] = totals.get((contestant_id, round_id), 0) + (points - previous)
+
+    @staticmethod
+    def _drop_round(answers, totals, round_id):
+        for key in [k for k in answers if k[1] == round_id]:
+            del answers[key]
+        for key in [k for k in totals if k[1] == round_id]:
+            del totals[key]
+
+    # --- WRITES ---
+    def write_lock(self, round_id):
+        """Lock held around commit + record_answer, so concurrent answers reach the totals in commit order."""
+        with self._lock:
+            return self._write_locks.setdefault(round_id, threading.Lock())
+
+    def record_answer(self, event_id, contestant_id, round_id, question_number, points):
+        """Applies one committed answer. Safe to call again with the same values."""
+        self._ensure_loaded(event_id)
+        with self._lock:
+            self._apply(event_id, self._set_answer, contestant_id, round_id, question_number, points)
+
+    def drop_round(self, event_id, round_id):
+        """Removes every answer of a deleted round."""
+        with self._lock:
+            self._apply(event_id, self._drop_round, round_id)
+
+    # --- READS ---
+    def live_totals(self, event_id):
+        """A snapshot of the event's {(contestant_id, round_id): points} map, taken under the lock."""
+        self._ensure_loaded(event_id)
+        with self._lock:
+            return dict(self._totals.get(event_id, {}))
+
+    def answered_count(self, event_id, contestant_id, round_id):
+        """Number of distinct questions (Q1 and up) recorded for a contestant in a round."""
+        self._ensure_loaded(event_id)
+        with self._lock:
+            return sum(1 for (c_id, r_id, q_num) in self._answers.get(event_id, {})
+                       if c_id == contestant_id and r_id == round_id and q_num and q_num > 0)
+
+
+quiz_scoreboard = QuizScoreboard()
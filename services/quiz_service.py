@@ -1,9 +1,14 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 from core.database import SessionLocal
-from models.all_models import Segment, Score, Contestant, AuditLog
-import datetime
+from core.instrumentation import instrument_service
+from core.event_bus import event_bus, SCORES
+from core.upsert import upsert
+from services.tabulation_service import TabulationService, notify_event_changed
+from services.quiz_scoreboard import quiz_scoreboard
+from services.audit_writer import audit_writer
+from models.all_models import Segment, Score, Contestant
 
+@instrument_service
 class QuizService:
     # ... (Keep existing methods: add_round, update_round, delete_round, submit_answer) ...
     def add_round(self, admin_id, event_id, name, points, total_questions, order, is_final=False, qualifier_limit=0, participating_ids=None, related_id=None):
@@ -34,11 +39,11 @@ class QuizService:
             )
             db.add(new_round)
             
-            log = AuditLog(user_id=admin_id, action="ADD_ROUND", details=f"Added Round {order}: '{name}'", timestamp=datetime.datetime.now())
-            db.add(log)
-            
             db.commit()
+            notify_event_changed(event_id)
             db.refresh(new_round) # Refresh to get the generated ID
+            audit_writer.record(admin_id, "ADD_ROUND", f"Added Round {order}: '{name}'",
+                                event_id=event_id, segment_id=new_round.id, entity_type="segment")
             return True, new_round.id # Return ID instead of string message
         except Exception as e:
             return False, str(e)
@@ -73,16 +78,11 @@ class QuizService:
             target.is_final = is_final
             target.qualifier_limit = qualifier_limit
             
-            # AUDIT LOG
-            log = AuditLog(
-                user_id=admin_id,
-                action="UPDATE_ROUND",
-                details=f"Updated Round {order}: '{name}'",
-                timestamp=datetime.datetime.now()
-            )
-            db.add(log)
-            
+            event_id = target.event_id
             db.commit()
+            audit_writer.record(admin_id, "UPDATE_ROUND", f"Updated Round {order}: '{name}'",
+                                event_id=event_id, segment_id=round_id, entity_type="segment")
+            notify_event_changed(event_id)
             return True, "Round updated."
         except Exception as e:
             return False, str(e)
@@ -100,6 +100,7 @@ class QuizService:
                 return False, "Round not found."
             
             round_name = target.name
+            event_id = target.event_id
             
             # 1. Delete associated scores first (Cascade usually handles this, but explicit is safer)
             db.query(Score).filter(Score.segment_id == round_id).delete()
@@ -107,16 +108,11 @@ class QuizService:
             # 2. Delete the round
             db.delete(target)
             
-            # AUDIT LOG
-            log = AuditLog(
-                user_id=admin_id,
-                action="DELETE_ROUND",
-                details=f"Deleted Round: '{round_name}'",
-                timestamp=datetime.datetime.now()
-            )
-            db.add(log)
-            
             db.commit()
+            audit_writer.record(admin_id, "DELETE_ROUND", f"Deleted Round: '{round_name}'",
+                                event_id=event_id, segment_id=round_id, entity_type="segment")
+            quiz_scoreboard.drop_round(event_id, round_id)
+            notify_event_changed(event_id)
             return True, "Round deleted."
         except Exception as e:
             db.rollback()
@@ -124,39 +120,46 @@ class QuizService:
         finally:
             db.close()
 
+    def recount_scores(self, event_id):
+        """
+        Rebuilds the event's running totals from the scores table (Mission Control's
+        Recount button). Picks up answers this process never saw: manual DB edits or
+        a second app instance.
+        """
+        try:
+            quiz_scoreboard.rebuild(event_id)
+            notify_event_changed(event_id, SCORES)
+            return True, "Scores recounted from the database."
+        except Exception as e:
+            return False, str(e)
+
     def submit_answer(self, tabulator_id, contestant_id, round_id, question_num, is_correct):
         """
         Records a Correct/Wrong answer.
         """
         db: Session = SessionLocal()
         try:
-            # 1. Check if already scored
-            existing_score = db.query(Score).filter(
-                Score.contestant_id == contestant_id,
-                Score.segment_id == round_id,
-                Score.question_number == question_num
-            ).first()
-
             # Calculate points immediately based on the round settings
             round_info = db.query(Segment).get(round_id)
             points = round_info.points_per_question if is_correct else 0
 
-            if existing_score:
-                existing_score.is_correct = is_correct
-                existing_score.score_value = points
-                existing_score.judge_id = tabulator_id 
-            else:
-                new_score = Score(
-                    contestant_id=contestant_id,
-                    segment_id=round_id,
-                    judge_id=tabulator_id,
-                    question_number=question_num,
-                    is_correct=is_correct,
-                    score_value=points
-                )
-                db.add(new_score)
-            
-            db.commit()
+            event_id = round_info.event_id
+
+            # Same-round writes are serialized so the running totals apply them in commit order
+            with quiz_scoreboard.write_lock(round_id):
+                # One statement: insert, or overwrite the earlier mark for this question
+                upsert(db, Score, {
+                    "contestant_id": contestant_id,
+                    "segment_id": round_id,
+                    "judge_id": tabulator_id,
+                    "question_number": question_num,
+                    "is_correct": is_correct,
+                    "score_value": points
+                }, key_columns=["contestant_id", "segment_id", "question_number"], update_columns=["is_correct", "score_value", "judge_id"])
+                db.commit()
+                # Running totals are patched in O(1); the cached standings read them live
+                quiz_scoreboard.record_answer(event_id, contestant_id, round_id, question_num, points)
+            event_bus.publish_event(event_id, SCORES)
             return True, "Answer recorded."
         except Exception as e:
             return False, str(e)
@@ -204,98 +207,82 @@ class QuizService:
         if not active_seg or total_qs_in_round <= 0 or not participants:
             return {'unsubmitted': [], 'submitted': []}
 
-        db = SessionLocal()
         unsubmitted_teams = []
         submitted_teams = []
 
-        try:
-            for p in participants:
-                contestant_id = p['id']
-                
-                # Count distinct question numbers scored by this contestant in this segment
-                scores_count = db.query(func.count(func.distinct(Score.question_number))).filter(
-                    Score.contestant_id == contestant_id,
-                    Score.segment_id == active_seg.id,
-                    Score.question_number > 0 # Ignore initialization scores (Q0)
-                ).scalar() or 0
-                
-                is_complete = (scores_count >= total_qs_in_round)
-                p['is_complete'] = is_complete
-                p['progress_count'] = scores_count
-                
-                if not is_complete:
-                    unsubmitted_teams.append(p)
-                else:
-                    submitted_teams.append(p)
+        for p in participants:
+            contestant_id = p['id']
+            
+            # Count distinct question numbers scored by this contestant in this segment
+            # (Ignores initialization scores (Q0); read from the in-memory scoreboard)
+            scores_count = quiz_scoreboard.answered_count(event_id, contestant_id, active_seg.id)
+            
+            is_complete = (scores_count >= total_qs_in_round)
+            p['is_complete'] = is_complete
+            p['progress_count'] = scores_count
+            
+            if not is_complete:
+                unsubmitted_teams.append(p)
+            else:
+                submitted_teams.append(p)
 
-            return {'unsubmitted': unsubmitted_teams, 'submitted': submitted_teams}
-        finally:
-            db.close()
+        return {'unsubmitted': unsubmitted_teams, 'submitted': submitted_teams}
             
 
     def get_live_scores(self, event_id, specific_round_id=None, limit_to_participants=None):
         """
         Calculates scores. 
         - Filters out 'Eliminated' contestants automatically.
+        - Reads the cached event snapshot + in-memory running totals (no DB reads in steady state).
         """
-        db: Session = SessionLocal()
         results = []
-        try:
-            # 1. Determine the context
-            target_round_id = specific_round_id
-            
-            active_segment = None
-            if not target_round_id:
-                active_segment = db.query(Segment).filter(Segment.event_id == event_id, Segment.is_active == True).first()
-                if active_segment:
-                    if active_segment.is_final or "Clincher" in active_segment.name:
-                        target_round_id = active_segment.id
-            
-            if target_round_id and not active_segment:
-                active_segment = db.query(Segment).get(target_round_id)
+        matrix = TabulationService().get_matrix(event_id)
+        seg_map = {s.id: s for s in matrix.segments}
+        totals = quiz_scoreboard.live_totals(event_id)
 
-            # 2. Determine Contestants to Fetch
-            query = db.query(Contestant).filter(Contestant.event_id == event_id)
-            
-            # --- FILTER ELIMINATED CONTESTANTS ---
-            query = query.filter(Contestant.status == 'Active')
-            
-            # Apply Participant Filters (used primarily during clinchers/advancement logic)
-            if limit_to_participants:
-                query = query.filter(Contestant.id.in_(limit_to_participants))
-            elif target_round_id and active_segment and active_segment.participating_school_ids:
-                p_ids = [int(x) for x in active_segment.participating_school_ids.split(",") if x.strip()]
-                query = query.filter(Contestant.id.in_(p_ids))
-            
-            contestants = query.all()
-            
-            # 3. Calculate Scores
-            for c in contestants:
-                score_query = db.query(func.sum(Score.score_value))\
-                    .join(Segment, Score.segment_id == Segment.id)\
-                    .filter(Score.contestant_id == c.id, Segment.event_id == event_id)
-                
-                if target_round_id:
-                    # If specific_round_id is set (Back-to-Zero mode), only sum that round's scores
-                    score_query = score_query.filter(Score.segment_id == target_round_id)
-                else:
-                    # If no specific round (Cumulative mode), filter out Final/Clincher rounds
-                    # This ensures only prelim cumulative scores are used if we are NOT in a final round.
-                    score_query = score_query.filter(Segment.is_final == False, Segment.related_segment_id == None) 
-                
-                total_points = score_query.scalar() or 0.0
-                
-                results.append({
-                    "contestant_id": c.id,
-                    "name": c.name,
-                    "total_score": int(total_points) 
-                })
+        # 1. Determine the context
+        target_round_id = specific_round_id
+        
+        active_segment = None
+        if not target_round_id:
+            active_segment = next((s for s in matrix.segments if s.is_active), None)
+            if active_segment:
+                if active_segment.is_final or "Clincher" in active_segment.name:
+                    target_round_id = active_segment.id
+        
+        if target_round_id and not active_segment:
+            active_segment = seg_map.get(target_round_id)
 
-            results.sort(key=lambda x: x['total_score'], reverse=True)
-            return results
+        # 2. Determine Contestants to Fetch
+        # --- FILTER ELIMINATED CONTESTANTS ---
+        contestants = [c for c in matrix.contestants if c.status == 'Active']
+        
+        # Apply Participant Filters (used primarily during clinchers/advancement logic)
+        if limit_to_participants:
+            contestants = [c for c in contestants if c.id in limit_to_participants]
+        elif target_round_id and active_segment and active_segment.participating_school_ids:
+            p_ids = [int(x) for x in active_segment.participating_school_ids.split(",") if x.strip()]
+            contestants = [c for c in contestants if c.id in p_ids]
+        
+        # 3. Calculate Scores
+        if target_round_id:
+            # If specific_round_id is set (Back-to-Zero mode), only sum that round's scores
+            counted_rounds = [target_round_id]
+        else:
+            # If no specific round (Cumulative mode), filter out Final/Clincher rounds
+            # This ensures only prelim cumulative scores are used if we are NOT in a final round.
+            counted_rounds = [s.id for s in matrix.segments if not s.is_final and s.related_segment_id is None]
 
-        finally:
-            db.close()
+        for c in contestants:
+            total_points = sum(totals.get((c.id, r_id), 0) for r_id in counted_rounds)
+            results.append({
+                "contestant_id": c.id,
+                "name": c.name,
+                "total_score": int(total_points) 
+            })
+
+        results.sort(key=lambda x: x['total_score'], reverse=True)
+        return results
 
     def check_round_ties(self, event_id, round_id, limit):
         scores = self.get_live_scores(event_id, specific_round_id=round_id)
@@ -352,6 +339,7 @@ class QuizService:
             
             if not next_round:
                 db.commit()
+                notify_event_changed(event_id)
                 return True, "Event Concluded. Losers eliminated."
 
             # 3. Deactivate Current
@@ -365,18 +353,13 @@ class QuizService:
             combined_ids = list(set(existing_ids + qualified_ids))
             next_round.participating_school_ids = ",".join(map(str, combined_ids))
             next_round.is_active = True
-            
-            # Log
-            log = AuditLog(
-                user_id=admin_id,
-                action="ADVANCE_ROUND",
-                details=f"Advanced to '{next_round.name}'. Elimination processed.",
-                timestamp=datetime.datetime.now()
-            )
-            db.add(log)
+            next_id, next_name = next_round.id, next_round.name
             
             db.commit()
-            return True, f"Advanced to {next_round.name}"
+            audit_writer.record(admin_id, "ADVANCE_ROUND", f"Advanced to '{next_name}'. Elimination processed.",
+                                event_id=event_id, segment_id=next_id, entity_type="segment", qualified_ids=qualified_ids)
+            notify_event_changed(event_id)
+            return True, f"Advanced to {next_name}"
         except Exception as e:
             return False, str(e)
         finally:
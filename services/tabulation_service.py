@@ -0,0 +1,291 @@
+import threading
+from sqlalchemy import func
+from core.database import SessionLocal
+from core.instrumentation import instrument_service
+from core.event_cache import EventCache
+from core.event_bus import event_bus, STRUCTURE
+from services.quiz_scoreboard import quiz_scoreboard
+from models.all_models import Event, Segment, Criteria, Score, Contestant, User, EventJudge
+
+# Standings cache: one ScoreMatrix per event, shared by every viewer/admin session.
+# Services that write scores, contestant status or segment settings call
+# notify_event_changed(event_id) after committing.
+standings_cache = EventCache("standings")
+# Event structure (segments + criteria) for the judge dashboard. Only admin
+# config changes it, so score writes (kind=SCORES) leave it cached.
+structure_cache = EventCache("structure")
+
+# Committed changes per event (see data_version)
+_data_lock = threading.Lock()
+_data_versions = {}    # {event_id: int}
+
+def data_version(event_id):
+    """
+    Counts the event's committed changes (every notify_event_changed). Unlike
+    standings_cache.version it is not bumped by cache refreshes such as the
+    leaderboard resync, so it can key files built from the data (exports).
+    """
+    with _data_lock:
+        return _data_versions.get(event_id, 0)
+
+def notify_event_changed(event_id, kind=STRUCTURE):
+    """Drops the event's cached standings (and structure) and pushes the change to subscribed views."""
+    if event_id is not None:
+        with _data_lock:
+            _data_versions[event_id] = _data_versions.get(event_id, 0) + 1
+    standings_cache.invalidate(event_id)
+    if kind == STRUCTURE:
+        structure_cache.invalidate(event_id)
+    event_bus.publish_event(event_id, kind)
+
+# ---------------------------------------------------------
+# SCORE MATRIX (In-memory snapshot of one event)
+# ---------------------------------------------------------
+class ScoreMatrix:
+    """
+    Everything needed to rank an event, loaded once:
+    segments, criteria, contestants, judges and the score aggregates.
+    Every ranking/leaderboard output is computed from this in memory.
+    """
+    def __init__(self, event, segments, criteria_map, contestants, judge_names, averages, quiz_totals):
+        self.event_id = event.id if event else None
+        self.event_name = event.name if event else ""
+        self.event_type = event.event_type if event else "Pageant"
+        self.segments = segments                # ordered by order_index
+        self.criteria_map = criteria_map        # {segment_id: [Criteria, ...]}
+        self.contestants = contestants
+        self.judge_names = judge_names          # ordered by name
+        self.averages = averages                # {(contestant_id, criteria_id): avg score}
+        self.quiz_totals = quiz_totals          # () -> {(contestant_id, segment_id): points} snapshot (Quiz Bee, from quiz_scoreboard)
+
+    # --- BASIC SCORES ---
+    def segment_raw_score(self, contestant_id, segment):
+        """Weighted criteria average for one contestant in one segment (0-100 scale)."""
+        score = 0.0
+        for crit in self.criteria_map.get(segment.id, []):
+            score += (self.averages.get((contestant_id, crit.id), 0.0) * crit.weight)
+        return score
+
+    def weighted_total(self, contestant_id, segments):
+        return sum(self.segment_raw_score(contestant_id, s) * s.percentage_weight for s in segments)
+
+    def prelim_segments(self):
+        return [s for s in self.segments if not s.is_final]
+
+    def split_prelim_final(self):
+        """Splits segments into (prelims, finals). Clinchers of a final round count as finals."""
+        seg_map = {s.id: s for s in self.segments}
+        prelim_segs = []
+        final_segs = []
+        for seg in self.segments:
+            is_final = seg.is_final
+            if not is_final and seg.related_segment_id:
+                parent = seg_map.get(seg.related_segment_id)
+                if parent and parent.is_final: is_final = True
+
+            if is_final: final_segs.append(seg)
+            else: prelim_segs.append(seg)
+        return prelim_segs, final_segs
+
+    # --- VIEW 1: OVERALL STANDING (All segments) ---
+    def standing(self):
+        results = []
+        for c in self.contestants:
+            results.append({
+                "contestant_id": c.id,
+                "name": c.name,
+                "candidate_number": c.candidate_number,
+                "gender": c.gender,
+                "total_score": round(self.weighted_total(c.id, self.segments), 2)
+            })
+        results.sort(key=lambda x: x['total_score'], reverse=True)
+        return results
+
+    # --- VIEW 2: OVERALL BREAKDOWN (Prelim segments as columns) ---
+    def overall_breakdown(self):
+        segments = self.prelim_segments()
+        data = {'Male': [], 'Female': []}
+
+        for c in self.contestants:
+            row = {
+                "number": c.candidate_number,
+                "name": c.name,
+                "segment_scores": [],
+                "total": 0.0
+            }
+            overall_weighted_score = 0.0
+            for s in segments:
+                segment_raw_score = self.segment_raw_score(c.id, s)
+                row['segment_scores'].append(round(segment_raw_score, 2))
+                overall_weighted_score += (segment_raw_score * s.percentage_weight)
+
+            row['total'] = round(overall_weighted_score, 2)
+            if c.gender in data:
+                data[c.gender].append(row)
+
+        for gender in ['Male', 'Female']:
+            data[gender].sort(key=lambda x: x['total'], reverse=True)
+            for i, r in enumerate(data[gender]):
+                r['rank'] = i + 1
+
+        return {
+            'segments': [s.name for s in segments],
+            'judges': list(self.judge_names),
+            'Male': data['Male'],
+            'Female': data['Female']
+        }
+
+    # --- VIEW 3: PRELIMINARY RANKINGS (Elimination engine) ---
+    def preliminary_rankings(self):
+        segments = self.prelim_segments()
+        results = {'Male': [], 'Female': []}
+        for c in self.contestants:
+            entry = {"contestant": c, "score": round(self.weighted_total(c.id, segments), 2)}
+            if c.gender in results:
+                results[c.gender].append(entry)
+
+        results['Male'].sort(key=lambda x: x['score'], reverse=True)
+        results['Female'].sort(key=lambda x: x['score'], reverse=True)
+        return results
+
+    # --- VIEW 4: PUBLIC LEADERBOARD ---
+    def leaderboard(self):
+        """
+        Returns (scores, mode_label, prelim_headers, final_headers, show_prelim_total)
+        exactly as the viewer dashboard renders it.
+        """
+        scores = []
+        mode_label = "LIVE RESULTS"
+        prelim_segs, final_segs = self.split_prelim_final()
+
+        if self.event_type == "QuizBee":
+            # AUTO-SHOW ALL FOR QUIZ BEE
+            revealed_prelims = prelim_segs
+            revealed_finals = final_segs
+        else:
+            # Respect Admin Toggle for Pageants
+            revealed_prelims = [s for s in prelim_segs if s.is_revealed]
+            revealed_finals = [s for s in final_segs if s.is_revealed]
+
+        p_headers = [s.name for s in revealed_prelims]
+        f_headers = [s.name for s in revealed_finals]
+
+        # Show Prelim Total ONLY if ALL prelim segments are revealed
+        show_prelim_total = bool(prelim_segs) and (len(revealed_prelims) == len(prelim_segs))
+        # If ANY final round is shown, rank by Final Score.
+        rank_by_final = (len(revealed_finals) > 0)
+
+        if self.event_type == "QuizBee":
+            # One snapshot per render, so every row reflects the same answers
+            segment_sums = self.quiz_totals()
+            for c in self.contestants:
+                p_breakdown = [int(segment_sums.get((c.id, seg.id), 0)) for seg in prelim_segs]
+                f_breakdown = [int(segment_sums.get((c.id, seg.id), 0)) for seg in final_segs]
+                prelim_total = sum(segment_sums.get((c.id, seg.id), 0) for seg in prelim_segs)
+                final_total = sum(segment_sums.get((c.id, seg.id), 0) for seg in final_segs)
+
+                dname = c.name + (" (Eliminated)" if c.status == "Eliminated" else "")
+                scores.append({
+                    "name": dname,
+                    "p_bd": p_breakdown,
+                    "f_bd": f_breakdown,
+                    "p_tot": int(prelim_total),
+                    "f_tot": int(final_total),
+                    "status": c.status
+                })
+        else:
+            mode_label = "OFFICIAL RANKINGS"
+            for c in self.contestants:
+                prelim_row_scores = []
+                final_row_scores = []
+                prelim_weighted_total = 0.0
+                final_weighted_total = 0.0
+
+                for seg in prelim_segs:
+                    seg_raw_score = self.segment_raw_score(c.id, seg)
+                    # Weighted Total (Score * Percentage Weight), e.g. 90 * 0.40 = 36.0
+                    prelim_weighted_total += (seg_raw_score * seg.percentage_weight)
+                    if seg.is_revealed:
+                        prelim_row_scores.append(round(seg_raw_score, 2))
+
+                for seg in final_segs:
+                    seg_raw_score = self.segment_raw_score(c.id, seg)
+                    final_weighted_total += seg_raw_score
+                    if seg.is_revealed:
+                        final_row_scores.append(round(seg_raw_score, 2))
+
+                scores.append({
+                    "name": c.name,
+                    "gender": c.gender,
+                    "segment_scores": prelim_row_scores,
+                    "final_scores": final_row_scores,
+                    "p_tot": round(prelim_weighted_total, 2),
+                    "f_tot": round(final_weighted_total, 2)
+                })
+
+        # Sort with Tie-Breaker: Final first, Prelim breaks ties
+        if rank_by_final:
+            scores.sort(key=lambda x: (x['f_tot'], x['p_tot']), reverse=True)
+        else:
+            scores.sort(key=lambda x: x['p_tot'], reverse=True)
+
+        if self.event_type != "QuizBee":
+            # Pageant tables are split by gender, each ranked on its own
+            for gender in ['Male', 'Female']:
+                for idx, r in enumerate([r for r in scores if r['gender'] == gender]):
+                    r['rank'] = idx + 1
+
+        return scores, mode_label, p_headers, f_headers, show_prelim_total
+
+
+# ---------------------------------------------------------
+# TABULATION SERVICE (Bulk loader)
+# ---------------------------------------------------------
+@instrument_service
+class TabulationService:
+    def get_matrix(self, event_id):
+        """Cached ScoreMatrix for the event. Only rebuilt after a write invalidates it."""
+        return standings_cache.get(event_id, self.load_matrix)
+
+    def load_matrix(self, event_id):
+        """
+        Loads one event into a ScoreMatrix with a fixed number of queries
+        (no per-contestant / per-criteria lookups).
+        """
+        db = SessionLocal()
+        try:
+            event = db.query(Event).get(event_id)
+            segments = db.query(Segment).filter(Segment.event_id == event_id).order_by(Segment.order_index).all()
+            contestants = db.query(Contestant).filter(Contestant.event_id == event_id).all()
+            assigned = db.query(User).join(EventJudge).filter(EventJudge.event_id == event_id).order_by(User.name).all()
+
+            is_quiz = bool(event) and event.event_type == "QuizBee"
+            criteria_map = {} if is_quiz else self._load_criteria_map(db, [s.id for s in segments])
+            averages = {} if is_quiz else self._load_score_averages(db, event_id)
+            # Quiz totals are kept current in memory by QuizService.submit_answer;
+            # the cached matrix reads a fresh snapshot of them on every render
+            quiz_totals = (lambda: quiz_scoreboard.live_totals(event_id)) if is_quiz else dict
+
+            return ScoreMatrix(event, segments, criteria_map, contestants, [u.name for u in assigned], averages, quiz_totals)
+        finally:
+            db.close()
+
+    # --- BULK LOADERS ---
+    def _load_criteria_map(self, db, segment_ids):
+        """Returns {segment_id: [Criteria, ...]} for all given segments in one query."""
+        criteria_map = {}
+        if not segment_ids:
+            return criteria_map
+        criterias = db.query(Criteria).filter(Criteria.segment_id.in_(segment_ids)).order_by(Criteria.id).all()
+        for crit in criterias:
+            criteria_map.setdefault(crit.segment_id, []).append(crit)
+        return criteria_map
+
+    def _load_score_averages(self, db, event_id):
+        """Returns {(contestant_id, criteria_id): average score} for the whole event in one GROUP BY query."""
+        rows = db.query(Score.contestant_id, Score.criteria_id, func.avg(Score.score_value))\
+            .join(Criteria, Score.criteria_id == Criteria.id)\
+            .join(Segment, Criteria.segment_id == Segment.id)\
+            .filter(Segment.event_id == event_id)\
+            .group_by(Score.contestant_id, Score.criteria_id).all()
+        return {(c_id, crit_id): (avg or 0.0) for c_id, crit_id, avg in rows}
@@ -0,0 +1,60 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from core.database import Base
+import models.all_models  # noqa: F401 (registers the tables on Base.metadata)
+
+# Every service that opens its own sessions (`from core.database import SessionLocal`)
+SERVICE_MODULES = [
+    'services.admin_service',
+    'services.audit_retention',
+    'services.audit_writer',
+    'services.auth_service',
+    'services.contestant_service',
+    'services.event_service',
+    'services.export_jobs',
+    'services.pageant_service',
+    'services.quiz_scoreboard',
+    'services.quiz_service',
+    'services.tabulation_service',
+]
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Base class for tests that run the services against a real database.
+
+    setUp() builds an in-memory SQLite engine (one shared connection, usable
+    from any thread), creates the tables and points every service's
+    SessionLocal at self.Session. self.query_count counts the statements run.
+    Override make_engine() for a different engine (file-backed, instrumented).
+    """
+
+    def setUp(self):
+        self.engine = self.make_engine()
+        self.addCleanup(self.engine.dispose)
+        Base.metadata.create_all(bind=self.engine)
+        self.Session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+        self.query_count = 0
+        event.listen(self.engine, "before_cursor_execute", self._count_query)
+
+        for module in SERVICE_MODULES:
+            patcher = patch(f"{module}.SessionLocal", self.Session)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def make_engine(self):
+        return create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+    def _count_query(self, conn, cursor, statement, parameters, context, executemany):
+        self.query_count += 1
@@ -0,0 +1,118 @@
+import unittest
+import sys
+import os
+import datetime
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import inspect, text
+
+from tests.db_fixture import DatabaseTestCase
+from core.database import Base
+from core.migrations import run_migrations
+from services.admin_service import AdminService
+from models.all_models import User, AuditLog
+
+
+class TestAuditFeed(DatabaseTestCase):
+    """Checks the keyset-paginated audit log feed behind the Audit Log view."""
+
+    def setUp(self):
+        super().setUp()
+
+        db = self.Session()
+        admin = User(username="admin", name="Admin", role="Admin")
+        db.add(admin)
+        db.flush()
+        db.commit()
+        self.admin_id = admin.id
+        db.close()
+        self.add_logs(25)
+
+    def add_logs(self, count):
+        db = self.Session()
+        db.add_all([AuditLog(user_id=self.admin_id, action="TEST", details=f"log {n}") for n in range(count)])
+        db.commit()
+        db.close()
+
+    def test_pages_walk_back_by_id(self):
+        """Verify before_id pages cover every row once, newest first, with users loaded."""
+        service = AdminService()
+        first = service.get_security_logs(limit=10)
+        self.assertEqual([log.id for log in first], list(range(25, 15, -1)))
+        self.assertEqual(first[0].user.username, "admin")  # Usable after the session closed
+
+        seen = [log.id for log in first]
+        while True:
+            page = service.get_security_logs(before_id=seen[-1], limit=10)
+            if not page: break
+            seen.extend(log.id for log in page)
+        self.assertEqual(seen, list(range(25, 0, -1)))
+        print("✅ TEST PASSED: Audit log pages walk back by id.")
+
+    def test_tail_returns_only_new_rows(self):
+        """Verify tail mode returns nothing until new rows arrive, then only those."""
+        service = AdminService()
+        newest = service.get_security_logs(limit=1)[0].id
+        self.assertEqual(service.get_security_logs(after_id=newest), [])
+
+        self.add_logs(15)
+        tail = service.get_security_logs(after_id=newest, limit=10)
+        self.assertEqual([log.id for log in tail], list(range(35, 25, -1)))  # The oldest 10 new rows, newest first
+        rest = service.get_security_logs(after_id=tail[0].id, limit=10)
+        self.assertEqual([log.id for log in rest], list(range(40, 35, -1)))
+        print("✅ TEST PASSED: Audit log tail mode returns only new rows.")
+
+    def test_filters_run_in_the_database(self):
+        """Verify filters by user, action, event, contestant and time narrow the page server-side."""
+        db = self.Session()
+        judge = User(username="judge", name="Judge", role="Judge")
+        db.add(judge)
+        db.flush()
+        noon = datetime.datetime(2026, 3, 1, 12, 0)
+        db.add_all([
+            AuditLog(user_id=judge.id, action="SCORE_SUBMIT", event_id=7, contestant_id=70, entity_type="score", timestamp=noon),
+            AuditLog(user_id=judge.id, action="SCORE_SUBMIT", event_id=7, contestant_id=71, entity_type="score", timestamp=noon),
+            AuditLog(user_id=judge.id, action="SCORE_SUBMIT", event_id=8, contestant_id=80, entity_type="score", timestamp=noon + datetime.timedelta(hours=2)),
+            AuditLog(user_id=judge.id, action="LOGOUT", entity_type="user", timestamp=noon + datetime.timedelta(hours=3)),
+        ])
+        db.commit()
+        judge_id = judge.id
+        db.close()
+
+        service = AdminService()
+        def ids(**filters):
+            return [(log.action, log.event_id, log.contestant_id) for log in service.get_security_logs(**filters)]
+
+        self.assertEqual(len(ids(user_id=judge_id)), 4)
+        self.assertEqual(ids(user_id=judge_id, action="LOGOUT"), [("LOGOUT", None, None)])
+        self.assertEqual(ids(event_id=7), [("SCORE_SUBMIT", 7, 71), ("SCORE_SUBMIT", 7, 70)])
+        self.assertEqual(ids(event_id=7, contestant_id=70), [("SCORE_SUBMIT", 7, 70)])
+        self.assertEqual(ids(user_id=judge_id, since=noon + datetime.timedelta(hours=1), until=noon + datetime.timedelta(hours=2)),
+                         [("SCORE_SUBMIT", 8, 80)])
+        print("✅ TEST PASSED: Audit log filters run in the database.")
+
+    def test_migration_adds_context_columns(self):
+        """Verify an audit_logs table from before the structured columns gets them (and their indexes)."""
+        engine = self.make_engine()
+        self.addCleanup(engine.dispose)
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as conn:
+            conn.execute(text("DROP TABLE audit_logs"))
+            conn.execute(text("CREATE TABLE audit_logs (id INTEGER PRIMARY KEY, user_id INTEGER, action VARCHAR(50), details TEXT, timestamp DATETIME)"))
+            conn.execute(text("INSERT INTO audit_logs (user_id, action, details) VALUES (1, 'LOGIN', 'old row')"))
+
+        run_migrations(engine)
+
+        inspector = inspect(engine)
+        columns = {col["name"] for col in inspector.get_columns("audit_logs")}
+        self.assertTrue({"event_id", "segment_id", "contestant_id", "entity_type", "payload"} <= columns)
+        self.assertIn("ix_audit_logs_event", {ix["name"] for ix in inspector.get_indexes("audit_logs")})
+        with engine.connect() as conn:
+            self.assertEqual(conn.execute(text("SELECT details, event_id FROM audit_logs")).all(), [("old row", None)])
+        print("✅ TEST PASSED: Migration adds the audit context columns.")
+
+
+if __name__ == '__main__':
+    unittest.main()
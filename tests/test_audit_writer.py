@@ -0,0 +1,159 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+import json
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from tests.db_fixture import DatabaseTestCase
+from services.audit_writer import AuditWriter
+from models.all_models import User, Event, Segment, Criteria, Contestant, AuditLog
+
+
+class TestAuditWriter(DatabaseTestCase):
+    """Checks the background audit writer: batched inserts, the bounded queue and the spill file."""
+
+    def setUp(self):
+        super().setUp()
+
+        self.inserts = 0
+        def count_inserts(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("INSERT INTO AUDIT_LOGS"):
+                self.inserts += 1
+        event.listen(self.engine, "before_cursor_execute", count_inserts)
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.spill_path = os.path.join(tmp.name, "audit_spill.jsonl")
+
+        db = self.Session()
+        judge = User(username="judge1", name="Judge One", role="Judge")
+        ev = Event(name="Pageant", event_type="Pageant")
+        db.add_all([judge, ev])
+        db.flush()
+        seg = Segment(event_id=ev.id, name="Swimwear", order_index=1)
+        db.add(seg)
+        db.flush()
+        crit = Criteria(segment_id=seg.id, name="Poise", weight=1.0, max_score=100)
+        contestant = Contestant(event_id=ev.id, candidate_number=1, name="Alice")
+        db.add_all([crit, contestant])
+        db.commit()
+        self.judge_id, self.event_id, self.segment_id, self.crit_id, self.contestant_id = judge.id, ev.id, seg.id, crit.id, contestant.id
+        db.close()
+
+    def audit_rows(self):
+        db = self.Session()
+        try:
+            return [(a.action, a.details) for a in db.query(AuditLog).order_by(AuditLog.id)]
+        finally:
+            db.close()
+
+    def test_batch_formats_names_once(self):
+        """Verify queued records land with one multi-row insert and readable details."""
+        writer = AuditWriter()
+        for value in (80, 85, 90):
+            writer.record(self.judge_id, "SCORE_SUBMIT", contestant_id=self.contestant_id, scores=[(self.crit_id, value)])
+        writer.record(self.judge_id, "SCORE_FINALIZED", segment_id=self.segment_id)
+        writer.record(self.judge_id, "LOGOUT")
+        self.assertEqual(self.audit_rows(), [])
+
+        self.assertEqual(writer.flush(), 5)
+        self.assertEqual(self.inserts, 1)
+        rows = self.audit_rows()
+        self.assertEqual(rows[0], ("SCORE_SUBMIT", "Scored 80 for 'Alice' on 'Poise'"))
+        self.assertEqual(rows[3], ("SCORE_FINALIZED", "Judge finalized scores for segment 'Swimwear'"))
+        self.assertEqual(rows[4], ("LOGOUT", "User 'judge1' (Judge) logged out."))
+        print("✅ TEST PASSED: Audit records are written in one batch.")
+
+    def test_structured_columns(self):
+        """Verify records fill the indexed context columns, deriving what the caller did not pass."""
+        writer = AuditWriter()
+        writer.record(self.judge_id, "SCORE_SUBMIT", event_id=self.event_id, contestant_id=self.contestant_id,
+                      entity_type="score", scores=[(self.crit_id, 9.5)])
+        writer.record(self.judge_id, "SCORE_FINALIZED", segment_id=self.segment_id, entity_type="segment")
+        writer.flush()
+
+        db = self.Session()
+        score, finalized = db.query(AuditLog).order_by(AuditLog.id).all()
+        self.assertEqual((score.event_id, score.segment_id, score.contestant_id, score.entity_type),
+                         (self.event_id, self.segment_id, self.contestant_id, "score"))  # Segment from the criteria
+        self.assertEqual(json.loads(score.payload), {"scores": [[self.crit_id, 9.5]]})
+        self.assertEqual((finalized.event_id, finalized.payload), (self.event_id, None))  # Event from the segment
+        db.close()
+        print("✅ TEST PASSED: Audit records fill the structured columns.")
+
+    def test_bad_record_does_not_block_batch(self):
+        """Verify a record the database refuses is set aside and the rest of the batch is written."""
+        writer = AuditWriter()
+        writer.record(self.judge_id, "TEST", "good 1")
+        writer.record(self.judge_id, "TEST", "bad", event_id=object())  # Not bindable
+        writer.record(self.judge_id, "TEST", "good 2")
+        self.assertEqual(writer.flush(), 2)
+        self.assertEqual([details for _, details in self.audit_rows()], ["good 1", "good 2"])
+        self.assertEqual(writer.pending(), 0)
+        print("✅ TEST PASSED: A rejected audit record does not block the batch.")
+
+    def test_spill_file_survives_crash(self):
+        """Verify records left in the spill file by a dead process are written by the next start()."""
+        crashed = AuditWriter(flush_interval=60)
+        crashed.start(self.spill_path)
+        crashed.record(self.judge_id, "LOGIN", "User 'judge1' (Judge) logged in.")
+        crashed.record(self.judge_id, "SCORE_SUBMIT", contestant_id=self.contestant_id, scores=[(self.crit_id, 75)])
+        crashed.stop(flush=False)  # Simulated crash: nothing is written to the database
+
+        # Durable before record() returned
+        with open(self.spill_path, encoding="utf-8") as f:
+            self.assertEqual(len(f.readlines()), 2)
+
+        restarted = AuditWriter()
+        restarted.start(self.spill_path)
+        restarted.stop()  # Joins the replay (or runs it as the last flush)
+        self.assertEqual([action for action, _ in self.audit_rows()], ["LOGIN", "SCORE_SUBMIT"])
+        self.assertFalse(os.path.exists(self.spill_path))  # Nothing left to replay
+        print("✅ TEST PASSED: Spilled audit records are replayed after a crash.")
+
+    def test_start_is_idempotent(self):
+        """Verify starting an already running writer keeps the same thread and spill file."""
+        writer = AuditWriter(flush_interval=60)
+        writer.start(self.spill_path)
+        thread = writer._thread
+        writer.start(self.spill_path)
+        self.assertIs(writer._thread, thread)
+        writer.record(self.judge_id, "LOGIN", "User 'judge1' (Judge) logged in.")
+        writer.stop()
+        self.assertEqual([action for action, _ in self.audit_rows()], ["LOGIN"])
+        print("✅ TEST PASSED: Starting the audit writer twice is harmless.")
+
+    def test_full_queue_spills_and_failed_batches_are_kept(self):
+        """Verify overflow is read back from disk and a database error loses nothing."""
+        writer = AuditWriter(max_queue=2, flush_interval=60)
+        writer.start(self.spill_path)
+        self.addCleanup(writer.stop)
+        # Drive flushes by hand
+        writer._stop.set()
+        writer._wake.set()
+        writer._thread.join(5)
+        for n in range(5):
+            writer.record(self.judge_id, "TEST", f"record {n}")
+        self.assertEqual(writer.pending(), 2)  # The other three exist only in the spill file
+
+        with patch.object(writer, "_insert", side_effect=OperationalError("INSERT", {}, Exception("database down"))):
+            with self.assertRaises(OperationalError):
+                writer.flush()
+        self.assertEqual(self.audit_rows(), [])
+
+        writer.record(self.judge_id, "TEST", "record 5")
+        self.assertEqual(writer.flush(), 6)
+        self.assertEqual([details for _, details in self.audit_rows()], [f"record {n}" for n in range(6)])
+        self.assertEqual(writer.flush(), 0)
+        print("✅ TEST PASSED: Full queue spills to disk and failed batches are retried.")
+
+
+if __name__ == '__main__':
+    unittest.main()
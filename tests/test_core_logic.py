@@ -12,7 +12,7 @@ from services.pageant_service import PageantService
 from services.quiz_service import QuizService
 from services.admin_service import AdminService
 from services.event_service import EventService
-from models.all_models import User, Event, Segment, Score, Criteria
+from models.all_models import User, Event, Segment
 
 class TestJudgeMeNotCore(unittest.TestCase):
 
@@ -113,9 +113,10 @@ class TestJudgeMeNotCore(unittest.TestCase):
     # =================================================================
 
     # --- ENHANCEMENT: SECURITY (AUDIT LOGGING) ---
+    @patch('services.auth_service.audit_writer')
     @patch('services.auth_service.SessionLocal')
     @patch('bcrypt.checkpw')
-    def test_security_audit_logging(self, mock_checkpw, mock_session):
+    def test_security_audit_logging(self, mock_checkpw, mock_session, mock_audit):
         """Verify that a sensitive action (Login) creates an Audit Log entry."""
         mock_db = MagicMock()
         mock_session.return_value = mock_db
@@ -128,17 +129,8 @@ class TestJudgeMeNotCore(unittest.TestCase):
         # Action: Login
         self.auth_service.login("test_user", "pass")
 
-        # Assert: Check if AuditLog was added to DB
-        # db.add is called twice: once for User (if creating) or AuditLog
-        # In login, we expect db.add(log)
-        
-        # Iterate through calls to db.add to find an AuditLog object
-        audit_log_created = False
-        for call in mock_db.add.call_args_list:
-            obj = call[0][0] # The argument passed to db.add()
-            if hasattr(obj, 'action') and obj.action == "LOGIN":
-                audit_log_created = True
-                break
+        # Assert: The LOGIN record was handed to the audit writer (written in the background)
+        audit_log_created = any(call[0][:2] == (1, "LOGIN") for call in mock_audit.record.call_args_list)
         
         self.assertTrue(audit_log_created, "Security Audit Log was NOT created on login.")
         print("✅ TEST PASSED: Security Enhancement (Audit Log creation).")
@@ -246,25 +238,21 @@ class TestJudgeMeNotCore(unittest.TestCase):
         self.assertEqual(logged_in_user.id, 5)
         
         # 3. SUBMIT SCORE (Restricted Action)
-        # We need to mock the criteria lookup inside submit_score
-        mock_criteria = Criteria(id=101, segment_id=202, name="Poise")
-        mock_db.query.return_value.get.return_value = mock_criteria
-        
-        # Ensure 'existing_score' check returns None (so we add a new one)
-        # The query logic in services uses filter().first()
         # We reset the mock response for the scoring phase to avoid returning the 'User' object
         mock_db.query.return_value.filter.return_value.first.return_value = None
         
         self.pageant_service.submit_score(logged_in_user.id, 1, 101, 95.0)
         
         # 4. VERIFY
-        # Check if Score was added to DB
+        # Scores are written with one upsert statement (INSERT ... ON DUPLICATE KEY UPDATE)
         score_added = False
-        for call in mock_db.add.call_args_list:
-            obj = call[0][0]
-            if isinstance(obj, Score) and obj.score_value == 95.0 and obj.judge_id == 5:
-                score_added = True
-                break
+        for call in mock_db.execute.call_args_list:
+            stmt = call[0][0]
+            if getattr(stmt, "table", None) is not None and stmt.table.name == "scores":
+                params = stmt.compile().params
+                if params.get("score_value") == 95.0 and params.get("judge_id") == 5:
+                    score_added = True
+                    break
         
         self.assertTrue(score_added, "Score was not recorded after login.")
         print("✅ TEST PASSED: Integration Workflow (Login -> Submit Score).")
@@ -0,0 +1,75 @@
+import unittest
+import subprocess
+import sys
+import os
+import tempfile
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+
+class TestDatabaseBootstrap(unittest.TestCase):
+    """Checks that importing core.database and the services has no database side effects."""
+
+    def run_python(self, code):
+        # Fresh interpreter, so nothing imported by other tests is reused
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return result.stdout
+
+    def test_import_does_not_connect(self):
+        """Verify no engine is created and no provisioning runs on import."""
+        out = self.run_python(
+            "import core.database as d\n"
+            "import services.pageant_service, services.quiz_service, services.admin_service, services.tabulation_service\n"
+            "print('ENGINE', d._engine is None)\n"
+        )
+        self.assertIn("ENGINE True", out)
+        self.assertNotIn("Database", out) # No "Database check" / "Database Warning" output
+        print("✅ TEST PASSED: Importing services does not touch the database.")
+
+    def test_session_binds_on_first_use(self):
+        """Verify the first SessionLocal() creates the engine from the environment settings."""
+        out = self.run_python(
+            "import os\n"
+            "os.environ['db_pool_size'] = '7'\n"
+            "import core.database as d\n"
+            "s = d.SessionLocal()\n"
+            "print('BOUND', s.get_bind() is d.get_engine(), d.get_engine().pool.size())\n"
+            "s.close()\n"
+        )
+        self.assertIn("BOUND True 7", out)
+        print("✅ TEST PASSED: Sessions bind to the lazily created engine.")
+    def test_startup_prepares_schema(self):
+        """Verify ensure_database() creates the tables once and fails loudly if they cannot be migrated."""
+        with tempfile.TemporaryDirectory() as tmp:
+            out = self.run_python(
+                "import os\n"
+                "os.environ['db_backend'] = 'sqlite'\n"
+                f"os.environ['db_sqlite_path'] = {os.path.join(tmp, 'app.sqlite3')!r}\n"
+                "import core.database as d\n"
+                "from unittest.mock import patch\n"
+                "from sqlalchemy import inspect\n"
+                "print('READY', d.ensure_database())\n"
+                "print('TABLES', sorted(inspect(d.get_engine()).get_table_names()))\n"
+                "with patch('core.migrations.run_migrations') as again:\n"
+                "    d.ensure_database()\n"
+                "print('AGAIN', again.called)\n"
+                "d._schema_ready = False\n"
+                "with patch('core.migrations.run_migrations', side_effect=ValueError('boom')):\n"
+                "    try:\n"
+                "        d.ensure_database()\n"
+                "    except RuntimeError as e:\n"
+                "        print('FAILED', 'init_db.py' in str(e))\n"
+            )
+        self.assertIn("READY True", out)
+        self.assertIn("'scores'", out)
+        self.assertIn("'users'", out)
+        self.assertIn("AGAIN False", out)  # Once per process
+        self.assertIn("FAILED True", out)
+        print("✅ TEST PASSED: Startup creates and migrates the schema once.")
+
+if __name__ == '__main__':
+    unittest.main()
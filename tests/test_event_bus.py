@@ -0,0 +1,131 @@
+import unittest
+import sys
+import os
+import threading
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.db_fixture import DatabaseTestCase
+from core.event_bus import event_bus, event_topic, AUDIT_TOPIC, SCORES, STRUCTURE
+from components.live_updates import LiveView, stop_live_views
+from services.admin_service import AdminService
+from services.event_service import EventService
+from services.quiz_service import QuizService
+from services.quiz_scoreboard import quiz_scoreboard
+from services.audit_writer import audit_writer
+from services.tabulation_service import standings_cache
+from models.all_models import User, Event, Segment, Contestant
+
+
+class FakePage:
+    """Stands in for ft.Page: runs page.run_thread work on a real thread."""
+    def __init__(self):
+        self.threads = []
+
+    def run_thread(self, handler, *args):
+        t = threading.Thread(target=handler, args=args, daemon=True)
+        self.threads.append(t)
+        t.start()
+
+    def join(self):
+        for t in list(self.threads):
+            t.join(timeout=5)
+
+
+class TestEventBus(DatabaseTestCase):
+    """
+    Checks the push updates that replaced the polling threads:
+    services publish after commit (core/event_bus.py), views re-render
+    through LiveView (components/live_updates.py).
+    """
+
+    def setUp(self):
+        super().setUp()
+        standings_cache.clear()
+
+        db = self.Session()
+        tabulator = User(username="tab1", name="Tabulator", role="Tabulator")
+        ev = Event(name="Quiz Bee", event_type="QuizBee")
+        db.add_all([tabulator, ev])
+        db.flush()
+        seg = Segment(event_id=ev.id, name="Easy", order_index=1, points_per_question=1, total_questions=5)
+        team = Contestant(event_id=ev.id, candidate_number=1, name="School A")
+        db.add_all([seg, team])
+        db.commit()
+        self.tabulator_id, self.event_id, self.round_id, self.team_id = tabulator.id, ev.id, seg.id, team.id
+        db.close()
+        quiz_scoreboard.forget(self.event_id)
+
+    def listen(self, topic):
+        received = []
+        unsubscribe = event_bus.subscribe(topic, received.append)
+        self.addCleanup(unsubscribe)
+        return received
+
+    def test_writes_publish_after_commit(self):
+        """Verify score and structure writes reach the event's subscribers with their kind."""
+        received = self.listen(event_topic(self.event_id))
+
+        QuizService().submit_answer(self.tabulator_id, self.team_id, self.round_id, 1, True)
+        EventService().set_active_segment(self.event_id, self.round_id)
+
+        self.assertEqual(received, [(self.event_id, SCORES), (self.event_id, STRUCTURE)])
+        print("✅ TEST PASSED: Service writes publish event changes.")
+
+    def test_audit_batches_publish(self):
+        """Verify each written audit batch notifies the audit topic once."""
+        audit_writer.flush()
+        received = self.listen(AUDIT_TOPIC)
+        AdminService().log_action(self.tabulator_id, "LOGIN", "User logged in")
+        AdminService().log_action(self.tabulator_id, "LOGOUT", "User logged out")
+        self.assertEqual(received, [])  # Queued, not written yet
+        audit_writer.flush()
+        self.assertEqual(len(received), 1)  # One announcement per batch
+        self.assertEqual(audit_writer.flush(), 0)
+        self.assertEqual(len(received), 1)  # Nothing written, nothing announced
+        print("✅ TEST PASSED: Audit log batches publish to the audit topic.")
+
+    def test_live_view_coalesces_and_stops(self):
+        """Verify bursts collapse into few refreshes and stopped views get nothing."""
+        page = FakePage()
+        calls = []
+        release = threading.Event()
+        def refresh():
+            calls.append(1)
+            release.wait(timeout=5)
+
+        live = LiveView(page, refresh)
+        live.watch(event_topic(self.event_id))
+        for _ in range(20):
+            event_bus.publish_event(self.event_id, SCORES)
+        release.set()
+        page.join()
+        # One run for the first publish plus one for everything that arrived meanwhile
+        self.assertEqual(len(calls), 2)
+
+        stop_live_views(page)
+        self.assertEqual(event_bus.subscriber_count(event_topic(self.event_id)), 0)
+        event_bus.publish_event(self.event_id, SCORES)
+        page.join()
+        self.assertEqual(len(calls), 2)
+        print("✅ TEST PASSED: LiveView coalesces pushes and unsubscribes cleanly.")
+
+    def test_live_view_kind_filter(self):
+        """Verify views watching structure changes ignore score pushes."""
+        page = FakePage()
+        calls = []
+        live = LiveView(page, lambda: calls.append(1))
+        live.watch(event_topic(self.event_id), kinds={STRUCTURE})
+        self.addCleanup(live.stop)
+
+        event_bus.publish_event(self.event_id, SCORES)
+        page.join()
+        self.assertEqual(calls, [])
+        event_bus.publish_event(self.event_id, STRUCTURE)
+        page.join()
+        self.assertEqual(calls, [1])
+        print("✅ TEST PASSED: LiveView filters by change kind.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from openpyxl import load_workbook
+
+from tests.db_fixture import DatabaseTestCase
+from services.export_jobs import ExportJobQueue
+from services.tabulation_service import standings_cache, notify_event_changed
+from models.all_models import Event, Segment, Contestant
+
+
+class TestExportJobs(unittest.TestCase):
+    """Checks the background export queue and its (event, scope, format, data version) file cache."""
+
+    def setUp(self):
+        standings_cache.clear()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache_dir = tmp.name
+        self.builds = []
+        self.release = threading.Event()
+        self.release.set()
+
+        def fake_build(event_id, scope, fmt, filepath, progress):
+            self.builds.append((event_id, scope, fmt))
+            progress(0.5, "Writing file...")
+            self.release.wait(5)
+            with open(filepath, "w") as f:
+                f.write(f"{event_id}-{scope}-{len(self.builds)}")
+
+        self.jobs = ExportJobQueue(build=fake_build, cache_dir=self.cache_dir)
+        self.addCleanup(self.jobs.stop)
+
+    def test_unchanged_data_served_from_cache(self):
+        """Verify a second export of unchanged data skips the build, and a write forces a new one."""
+        messages = []
+        first = self.jobs.submit(1, "overall", "xlsx", on_progress=lambda f, m: messages.append((f, m))).result(5)
+        self.assertIn((0.5, "Writing file..."), messages)
+        self.assertEqual(messages[-1], (1.0, "Ready"))
+
+        again = self.jobs.submit(1, "overall", "xlsx")
+        self.assertTrue(again.done()) # Returned without queueing
+        self.assertEqual(again.result(), first)
+        self.assertEqual(len(self.builds), 1)
+
+        # Other scope / format are separate files
+        self.jobs.submit(1, "overall", "pdf").result(5)
+        self.assertEqual(len(self.builds), 2)
+
+        # A cache refresh (leaderboard resync) is not a data change
+        standings_cache.invalidate(1)
+        self.assertEqual(self.jobs.submit(1, "overall", "xlsx").result(5), first)
+        self.assertEqual(len(self.builds), 2)
+
+        # A committed write bumps the data version
+        notify_event_changed(1)
+        rebuilt = self.jobs.submit(1, "overall", "xlsx").result(5)
+        self.assertEqual(len(self.builds), 3)
+        self.assertNotEqual(rebuilt, first)
+        self.assertFalse(os.path.exists(first)) # Superseded file removed
+        print("✅ TEST PASSED: Unchanged exports are served from cache.")
+
+    def test_identical_jobs_share_one_build(self):
+        """Verify clicking export twice while it is still running joins the running job."""
+        self.release.clear()
+        first = self.jobs.submit(2, "raw", "xlsx")
+        second = self.jobs.submit(2, "raw", "xlsx")
+        self.assertIs(first, second)
+        self.release.set()
+        self.assertEqual(first.result(5), second.result(5))
+        self.assertEqual(len(self.builds), 1)
+        print("✅ TEST PASSED: Identical running exports share one build.")
+
+    def test_write_during_build_not_cached(self):
+        """Verify a file built while scores changed is returned but not reused."""
+        self.release.clear()
+        job = self.jobs.submit(3, "overall", "xlsx")
+        notify_event_changed(3)
+        self.release.set()
+        job.result(5)
+        self.assertIsNone(self.jobs.cached(3, "overall", "xlsx"))
+        print("✅ TEST PASSED: Exports racing a write are not cached.")
+
+    def test_failure_reported(self):
+        def failing_build(event_id, scope, fmt, filepath, progress):
+            open(filepath, "w").close()
+            raise RuntimeError("disk full")
+        jobs = ExportJobQueue(build=failing_build, cache_dir=self.cache_dir)
+        self.addCleanup(jobs.stop)
+        with self.assertRaises(RuntimeError):
+            jobs.submit(4, "overall", "xlsx").result(5)
+        self.assertIsNone(jobs.cached(4, "overall", "xlsx"))
+        print("✅ TEST PASSED: Failed exports raise and are not cached.")
+
+    def test_stop_removes_own_directory(self):
+        """Verify a queue without a cache_dir deletes its temporary directory and files on stop()."""
+        jobs = ExportJobQueue(build=lambda event_id, scope, fmt, filepath, progress: open(filepath, "w").close())
+        path = jobs.submit(5, "overall", "xlsx").result(5)
+        self.assertTrue(os.path.exists(path))
+        jobs.stop()
+        self.assertFalse(os.path.exists(os.path.dirname(path)))
+        print("✅ TEST PASSED: Stopping the export queue removes its cache directory.")
+
+
+class TestBuildExport(DatabaseTestCase):
+    """Runs the real builder against an in-memory SQLite event."""
+
+    def setUp(self):
+        super().setUp()
+        standings_cache.clear()
+
+        db = self.Session()
+        ev = Event(name="Gala", event_type="Pageant")
+        db.add(ev)
+        db.flush()
+        db.add_all([Segment(event_id=ev.id, name="Talent", order_index=1, percentage_weight=1.0),
+                    Contestant(event_id=ev.id, candidate_number=1, name="Lady", gender="Female")])
+        db.commit()
+        self.event_id = ev.id
+        db.close()
+
+    def test_overall_excel_in_background(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        jobs = ExportJobQueue(cache_dir=tmp.name)
+        self.addCleanup(jobs.stop)
+        path = jobs.submit(self.event_id, "overall", "xlsx").result(30)
+        ws = load_workbook(path)["Tabulation"]
+        self.assertEqual(ws['A1'].value, "Gala")
+        self.assertEqual(ws['A2'].value, "OFFICIAL OVERALL STANDINGS")
+        with self.assertRaises(ValueError):
+            jobs.submit(self.event_id, "raw", "pdf").result(30)
+        print("✅ TEST PASSED: Export builder runs on the worker pool.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import sys
+import os
+import tempfile
+import tracemalloc
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from openpyxl import load_workbook
+from sqlalchemy import insert
+
+from tests.db_fixture import DatabaseTestCase
+from services.export_service import ExportService
+from services.pageant_service import PageantService
+from models.all_models import User, Event, Segment, Criteria, Contestant, Score
+
+
+class TestExportStreaming(DatabaseTestCase):
+    """Checks the write-only Excel exports and the streamed raw-scores rows."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        super().setUp()
+        self.pageant_service = PageantService()
+        self.export_service = ExportService()
+
+    def seed_event(self, name, num_contestants, num_judges=10, num_criteria=10):
+        """Creates a one-segment pageant with num_contestants * num_judges * num_criteria scores."""
+        db = self.Session()
+        ev = Event(name=name, event_type="Pageant")
+        judges = [User(username=f"{name}_judge{i}", name=f"Judge {i:02d}", role="Judge") for i in range(num_judges)]
+        db.add_all(judges + [ev])
+        db.flush()
+        seg = Segment(event_id=ev.id, name="Talent", order_index=1, percentage_weight=1.0)
+        db.add(seg)
+        db.flush()
+        crits = [Criteria(segment_id=seg.id, name=f"Crit {k}", weight=1.0 / num_criteria, max_score=100) for k in range(num_criteria)]
+        contestants = [Contestant(event_id=ev.id, candidate_number=n + 1, name=f"Candidate {n}", gender="Female") for n in range(num_contestants)]
+        db.add_all(crits + contestants)
+        db.flush()
+        db.execute(insert(Score), [
+            {"contestant_id": c.id, "judge_id": j.id, "segment_id": seg.id, "criteria_id": k.id, "score_value": float((c.id + j.id + k.id) % 40 + 60)}
+            for c in contestants for j in judges for k in crits
+        ])
+        db.commit()
+        event_id = ev.id
+        db.close()
+        return event_id
+
+    def export_raw(self, event_id, filename):
+        path = os.path.join(self.tmp.name, filename)
+        self.export_service.generate_raw_scores_excel(path, "Pageant", "RAW SCORES", self.pageant_service.iter_scores_detailed(event_id, batch_size=500))
+        return path
+
+    def test_raw_scores_sheet(self):
+        """Verify one row per score, in the same order as get_all_scores_detailed."""
+        event_id = self.seed_event("small", num_contestants=5)
+        path = self.export_raw(event_id, "raw.xlsx")
+
+        wb = load_workbook(path, read_only=True)
+        rows = list(wb["Raw Scores"].iter_rows(values_only=True))
+        wb.close()
+        self.assertEqual(rows[0][0], "Pageant")
+        self.assertEqual(list(rows[3]), ["Segment", "#", "Candidate", "Judge", "Criteria", "Score"])
+        data_rows = rows[4:]
+        detailed = self.pageant_service.get_all_scores_detailed(event_id)
+        self.assertEqual(len(data_rows), 500)
+        self.assertEqual(len(detailed), 500)
+        for row, d in zip(data_rows, detailed):
+            self.assertEqual((row[0], row[2], row[3], row[4], row[5]), (d['segment'], d['candidate'], d['judge'], d['criteria'], d['score']))
+        print("✅ TEST PASSED: Raw scores export writes one row per score.")
+
+    def test_raw_export_memory_is_flat(self):
+        """Verify peak memory does not grow with the number of exported scores."""
+        small = self.seed_event("flat_small", num_contestants=5)     # 500 scores
+        large = self.seed_event("flat_large", num_contestants=100)   # 10,000 scores
+
+        peaks = []
+        for event_id in (small, large):
+            tracemalloc.start()
+            self.export_raw(event_id, f"raw_{event_id}.xlsx")
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        print(f"\n   500 scores   : peak {peaks[0] / 1024:.0f} KiB")
+        print(f"   10,000 scores: peak {peaks[1] / 1024:.0f} KiB")
+        self.assertLess(peaks[1], peaks[0] * 3)
+        print("✅ TEST PASSED: Raw export memory stays flat.")
+
+    def test_tabulation_layout_unchanged(self):
+        """Verify the ranked sheet keeps its layout in write-only mode."""
+        path = os.path.join(self.tmp.name, "segment.xlsx")
+        data = {
+            'judges': ["Judge A", "Judge B"],
+            'Male': [{'rank': 1, 'number': 2, 'name': "Sir", 'scores': [90.0, 80.0], 'total': 85.0}],
+            'Female': [{'rank': 1, 'number': 1, 'name': "Lady", 'scores': [70.0, 60.0], 'total': 65.0}],
+        }
+        self.export_service.generate_excel(path, "Pageant", "OFFICIAL RESULTS: TALENT", data, mode="segment")
+        ws = load_workbook(path)["Tabulation"]
+        self.assertEqual(ws['A1'].value, "Pageant")
+        self.assertTrue(ws['A1'].font.bold)
+        self.assertEqual(ws['A2'].value, "OFFICIAL RESULTS: TALENT")
+        self.assertEqual(ws['A4'].value, "MALE RANKING")
+        self.assertEqual([c.value for c in ws[5]], ["Rank", "#", "Candidate", "Judge A", "Judge B", "Total"])
+        self.assertEqual([c.value for c in ws[6]], [1, 2, "Sir", 90.0, 80.0, 85.0])
+        self.assertEqual(ws['A9'].value, "FEMALE RANKING")
+        self.assertEqual(ws['C11'].value, "Lady")
+        print("✅ TEST PASSED: Tabulation sheet layout unchanged.")
+
+if __name__ == '__main__':
+    unittest.main()
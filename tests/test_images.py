@@ -0,0 +1,148 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PIL import Image
+
+from core import images, asset_store
+from core.images import process_upload, image_url, SIZES
+
+
+class TestImagePipeline(unittest.TestCase):
+    """Checks the contestant photo pipeline (core/images.py) on a temporary assets dir."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = patch.object(asset_store, "ASSETS_DIR", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        images._legacy_variants.clear()
+        images._legacy_failures.clear()
+
+    def make_photo(self, name, size=(3000, 4000), color="red"):
+        """A large 'phone photo' with EXIF metadata (camera model + orientation)."""
+        path = os.path.join(self.tmp.name, name)
+        exif = Image.Exif()
+        exif[0x0110] = "Phone Camera"  # Model
+        exif[0x0112] = 1               # Orientation
+        Image.new("RGB", size, color).save(path, "JPEG", exif=exif)
+        return path
+
+    def asset(self, image_path):
+        return os.path.join(self.tmp.name, image_path)
+
+    def test_variants_sized_and_stripped(self):
+        """Verify every display size is generated at its pixel size without metadata."""
+        image_path = process_upload(self.make_photo("phone.jpg"))
+        self.assertTrue(image_path.startswith("uploads/") and image_path.endswith("_preview.jpg"))
+
+        for name, (width, height, crop) in SIZES.items():
+            with Image.open(self.asset(image_url(image_path, name))) as out:
+                if crop:
+                    self.assertEqual(out.size, (width, height))
+                else:
+                    self.assertLessEqual(max(out.size), max(width, height))
+                self.assertEqual(len(out.getexif()), 0)
+        self.assertLess(os.path.getsize(self.asset(image_url(image_path, "card"))), os.path.getsize(os.path.join(self.tmp.name, "phone.jpg")))
+        print("✅ TEST PASSED: Photo variants are right-sized and metadata-free.")
+
+    def test_same_content_processed_once(self):
+        """Verify re-uploading the same photo reuses the cached outputs."""
+        first = process_upload(self.make_photo("a.jpg"))
+        card = self.asset(image_url(first, "card"))
+        mtime = os.stat(card).st_mtime_ns
+        second = process_upload(self.make_photo("b.jpg"))
+        self.assertEqual(first, second)
+        self.assertEqual(os.stat(card).st_mtime_ns, mtime)
+
+        other = process_upload(self.make_photo("c.jpg", color="blue"))
+        self.assertNotEqual(first, other)
+        print("✅ TEST PASSED: Identical uploads share one set of outputs.")
+
+    def wait_for_conversions(self):
+        images._legacy_executor.submit(lambda: None).result(30)  # One worker: runs after the queued conversions
+
+    def test_legacy_paths(self):
+        """Verify photos stored before the pipeline are converted in the background, and broken ones fall back."""
+        os.makedirs(self.asset("uploads"), exist_ok=True)
+        Image.new("RGB", (800, 600), "green").save(self.asset("uploads/img_1_old.png"))
+        self.assertEqual(image_url("uploads/img_1_old.png", "card"), "uploads/img_1_old.png")  # Not on the render path
+        self.wait_for_conversions()
+        card = image_url("uploads/img_1_old.png", "card")
+        self.assertTrue(card.endswith("_card.jpg"))
+        self.assertTrue(os.path.exists(self.asset(card)))
+
+        self.assertEqual(image_url("uploads/missing.jpg", "card"), "uploads/missing.jpg")
+        self.wait_for_conversions()
+        self.assertEqual(image_url("uploads/missing.jpg", "card"), "uploads/missing.jpg")
+        self.assertIsNone(image_url(None, "card"))
+        print("✅ TEST PASSED: Legacy photo paths still display.")
+
+    def test_failed_conversion_retried(self):
+        """Verify a failed legacy conversion is not remembered forever."""
+        self.assertEqual(image_url("uploads/late.png", "card"), "uploads/late.png")
+        self.wait_for_conversions()
+        self.assertIn("uploads/late.png", images._legacy_failures)
+
+        os.makedirs(self.asset("uploads"), exist_ok=True)
+        Image.new("RGB", (800, 600), "blue").save(self.asset("uploads/late.png"))
+        image_url("uploads/late.png", "card")
+        self.wait_for_conversions()
+        self.assertEqual(image_url("uploads/late.png", "card"), "uploads/late.png")  # Still inside the retry delay
+
+        with patch.object(images, "LEGACY_RETRY_SECONDS", 0):
+            image_url("uploads/late.png", "card")
+            self.wait_for_conversions()
+            self.assertTrue(image_url("uploads/late.png", "card").endswith("_card.jpg"))
+        print("✅ TEST PASSED: Failed photo conversions are retried.")
+
+class TestAssetStore(unittest.TestCase):
+    """Checks deduplication and the immutable cache headers (core/asset_store.py)."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_put_deduplicates(self):
+        name = asset_store.stored_name("0" * 32, "card")
+        writes = []
+        def write(tmp_path):
+            writes.append(tmp_path)
+            with open(tmp_path, "wb") as f: f.write(b"jpeg")
+        self.assertTrue(asset_store.put(name, write, self.tmp.name))
+        self.assertFalse(asset_store.put(name, write, self.tmp.name))
+        self.assertEqual(len(writes), 1)
+        self.assertEqual(os.listdir(os.path.join(self.tmp.name, "uploads")), [f"{'0' * 32}_card.jpg"])
+        print("✅ TEST PASSED: Stored files are written once per content.")
+
+    def test_immutable_headers(self):
+        """Verify only content-addressed files are served as immutable."""
+        from starlette.applications import Starlette
+        from starlette.staticfiles import StaticFiles
+        from starlette.testclient import TestClient
+
+        os.makedirs(os.path.join(self.tmp.name, "uploads"))
+        stored = asset_store.stored_name("a" * 32, "card")
+        for name in [stored, "uploads/img_1_photo.jpg", "header.png"]:
+            with open(os.path.join(self.tmp.name, name), "wb") as f: f.write(b"data")
+
+        app = Starlette()
+        app.mount("/", StaticFiles(directory=self.tmp.name))
+        client = TestClient(asset_store.ImmutableAssetHeaders(app))
+
+        response = client.get(f"/{stored}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["cache-control"], asset_store.CACHE_CONTROL_IMMUTABLE)
+        for path in ["/uploads/img_1_photo.jpg", "/header.png"]:
+            self.assertNotIn("immutable", client.get(path).headers.get("cache-control", ""))
+        self.assertEqual(client.get(f"/uploads/{'b' * 32}_card.jpg").status_code, 404)
+        print("✅ TEST PASSED: Content-addressed files get immutable cache headers.")
+
+if __name__ == '__main__':
+    unittest.main()
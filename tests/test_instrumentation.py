@@ -0,0 +1,121 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine
+
+from tests.db_fixture import DatabaseTestCase
+from core.instrumentation import instrument_engine, service_stats, InstrumentedQueuePool
+from services.pageant_service import PageantService
+from services.contestant_service import ContestantService
+from services.tabulation_service import standings_cache
+from models.all_models import Event, Contestant
+
+
+class TestInstrumentation(DatabaseTestCase):
+    """Checks per-service-method query attribution (core/instrumentation.py)."""
+
+    def make_engine(self):
+        return instrument_engine(super().make_engine())
+
+    def setUp(self):
+        super().setUp()
+        standings_cache.clear()
+
+        db = self.Session()
+        ev = Event(name="Pageant", event_type="Pageant")
+        db.add(ev)
+        db.flush()
+        db.add_all([Contestant(event_id=ev.id, candidate_number=n, name=f"C{n}", gender="Female") for n in range(1, 4)])
+        db.commit()
+        self.event_id = ev.id
+        db.close()
+        service_stats.reset()
+
+    def stats(self):
+        return {r['method']: r for r in service_stats.snapshot()}
+
+    def test_queries_attributed_to_methods(self):
+        """Verify calls, queries and percentiles are recorded per 'Class.method'."""
+        for _ in range(4):
+            ContestantService().get_contestants(self.event_id)
+        stats = self.stats()['ContestantService.get_contestants']
+        self.assertEqual(stats['calls'], 4)
+        self.assertEqual(stats['max_queries'], 1)
+        self.assertLessEqual(stats['p50_ms'], stats['p99_ms'])
+        print("✅ TEST PASSED: Service calls are counted per method.")
+
+    def test_nested_calls_count_for_both(self):
+        """Verify a service calling another service shows the SQL under both methods."""
+        PageantService().calculate_standing(self.event_id)
+        stats = self.stats()
+        inner = stats['TabulationService.get_matrix']['max_queries']
+        self.assertGreater(inner, 0)
+        self.assertEqual(stats['PageantService.calculate_standing']['max_queries'], inner)
+
+        # Outside any service call nothing is attributed
+        before = sum(r['total_queries'] for r in service_stats.snapshot())
+        db = self.Session()
+        db.query(Contestant).all()
+        db.close()
+        self.assertEqual(sum(r['total_queries'] for r in service_stats.snapshot()), before)
+        self.assertIn("PageantService.calculate_standing", service_stats.report())
+        print("✅ TEST PASSED: Nested service calls are attributed inclusively.")
+
+    def test_generator_methods_measured_while_iterated(self):
+        """Verify a streaming (generator) method is recorded with the SQL it runs while being consumed."""
+        rows = PageantService().iter_scores_detailed(self.event_id)
+        self.assertNotIn('PageantService.iter_scores_detailed', self.stats())  # Nothing has run yet
+
+        ContestantService().get_contestants(self.event_id)
+        self.assertEqual(list(rows), [])
+        stats = self.stats()
+        self.assertEqual((stats['PageantService.iter_scores_detailed']['calls'], stats['PageantService.iter_scores_detailed']['max_queries']), (1, 1))
+        self.assertEqual(stats['ContestantService.get_contestants']['max_queries'], 1)  # Not charged with the stream's SQL
+        print("✅ TEST PASSED: Generator methods are measured while they are iterated.")
+
+class TestPoolHealth(unittest.TestCase):
+    """Checks the wait/timeout counters of InstrumentedQueuePool."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.engine = create_engine(f"sqlite:///{os.path.join(tmp.name, 'pool.db')}", connect_args={"check_same_thread": False},
+                                    poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.3)
+        self.addCleanup(self.engine.dispose)
+
+    def test_waits_and_timeouts_counted(self):
+        """Verify a checkout that finds the pool exhausted is counted as a wait, and a timeout as both."""
+        held = self.engine.connect()
+        self.assertEqual(self.engine.pool.health()['checked_out'], 1)
+
+        # Released while the second checkout is blocked -> one wait, no timeout
+        releaser = threading.Timer(0.1, held.close)
+        releaser.start()
+        with self.engine.connect():
+            pass
+        releaser.join()
+        health = self.engine.pool.health()
+        self.assertEqual(health['waits'], 1)
+        self.assertEqual(health['timeouts'], 0)
+        self.assertGreater(health['max_wait_ms'], 50)
+
+        # Never released -> the checkout times out
+        held = self.engine.connect()
+        with self.assertRaises(Exception):
+            self.engine.connect()
+        held.close()
+        health = self.engine.pool.health()
+        self.assertEqual(health['waits'], 2)
+        self.assertEqual(health['timeouts'], 1)
+        self.assertEqual(health['checked_out'], 0)
+        print("✅ TEST PASSED: Pool waits and timeouts are counted.")
+
+
+if __name__ == '__main__':
+    unittest.main()
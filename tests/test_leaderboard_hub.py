@@ -0,0 +1,105 @@
+import unittest
+import sys
+import os
+import threading
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.db_fixture import DatabaseTestCase
+from core.event_bus import event_bus, event_topic
+from services.leaderboard_hub import LeaderboardHub
+from services.pageant_service import PageantService
+from services.tabulation_service import standings_cache
+from models.all_models import User, Event, Segment, Criteria, Contestant, Score
+
+
+class TestLeaderboardHub(DatabaseTestCase):
+    """
+    Checks the shared per-event leaderboard feed (services/leaderboard_hub.py):
+    many spectators, one computation.
+    """
+
+    def setUp(self):
+        super().setUp()
+        standings_cache.clear()
+        # Long resync so only pushes trigger refreshes during the test
+        self.hub = LeaderboardHub(resync_seconds=60)
+
+        db = self.Session()
+        judge = User(username="judge_hub", name="Judge", role="Judge")
+        ev = Event(name="Pageant Hub", event_type="Pageant")
+        db.add_all([judge, ev])
+        db.flush()
+        seg = Segment(event_id=ev.id, name="Talent", order_index=1, percentage_weight=1.0, is_revealed=True)
+        db.add(seg)
+        db.flush()
+        crit = Criteria(segment_id=seg.id, name="Skill", weight=1.0, max_score=100)
+        a = Contestant(event_id=ev.id, candidate_number=1, name="A", gender="Female")
+        b = Contestant(event_id=ev.id, candidate_number=2, name="B", gender="Female")
+        db.add_all([crit, a, b])
+        db.flush()
+        db.add_all([Score(contestant_id=a.id, judge_id=judge.id, segment_id=seg.id, criteria_id=crit.id, score_value=90),
+                    Score(contestant_id=b.id, judge_id=judge.id, segment_id=seg.id, criteria_id=crit.id, score_value=80)])
+        db.commit()
+        self.event_id, self.judge_id, self.crit_id, self.b_id = ev.id, judge.id, crit.id, b.id
+        db.close()
+
+    def subscribe_spectators(self, count):
+        """Subscribes `count` fake sessions; returns (received lists, unsubscribers, first-result barrier)."""
+        self.query_count = 0
+        received = [[] for _ in range(count)]
+        ready = threading.Semaphore(0)
+        unsubscribers = []
+        for i in range(count):
+            def on_result(result, box=received[i]):
+                box.append(result)
+                ready.release()
+            unsubscribe = self.hub.subscribe(self.event_id, on_result)
+            self.addCleanup(unsubscribe) # Safe to call twice
+            unsubscribers.append(unsubscribe)
+        return received, unsubscribers, ready
+
+    def wait_for(self, ready, count):
+        for _ in range(count):
+            self.assertTrue(ready.acquire(timeout=5), "Timed out waiting for leaderboard push")
+
+    def test_one_load_for_many_spectators(self):
+        """Verify 25 spectators share one refresher and one database load."""
+        received, unsubscribers, ready = self.subscribe_spectators(25)
+        self.wait_for(ready, 25)
+
+        self.assertEqual(self.hub.active_events(), [self.event_id])
+        self.assertLessEqual(self.query_count, 6)
+        first = received[0][-1]
+        self.assertTrue(all(box[-1] == first for box in received))
+        self.assertEqual([r['name'] for r in first[1][0]], ["A", "B"])
+
+        # A score write reaches everyone, with one reload for all of them
+        self.query_count = 0
+        PageantService().submit_score(self.judge_id, self.b_id, self.crit_id, 100)
+        write_queries = self.query_count
+        self.wait_for(ready, 25)
+        self.assertLessEqual(self.query_count - write_queries, 6)
+        self.assertTrue(all(box[-1][1][0][0]['name'] == "B" for box in received))
+        print("✅ TEST PASSED: Leaderboard computed once and fanned out.")
+
+    def test_refresher_stops_with_last_viewer(self):
+        """Verify the reference count stops the refresher and its bus subscription."""
+        _, unsubscribers, ready = self.subscribe_spectators(3)
+        self.wait_for(ready, 3)
+        feed_thread = self.hub._feeds[self.event_id].thread
+
+        unsubscribers[0]()
+        unsubscribers[1]()
+        self.assertEqual(self.hub.subscriber_count(self.event_id), 1)
+        unsubscribers[2]()
+
+        self.assertEqual(self.hub.active_events(), [])
+        self.assertEqual(event_bus.subscriber_count(event_topic(self.event_id)), 0)
+        feed_thread.join(timeout=5)
+        self.assertFalse(feed_thread.is_alive())
+        print("✅ TEST PASSED: Leaderboard refresher stops with the last viewer.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.db_fixture import DatabaseTestCase
+from core.passwords import PasswordHasher, hash_cost
+from models.all_models import User
+from services.auth_service import AuthService
+
+
+class TestPasswords(DatabaseTestCase):
+    """Checks bcrypt hashing on the worker pool and the transparent rehash at login."""
+
+    def setUp(self):
+        super().setUp()
+        # Low work factors keep the real bcrypt calls fast
+        env = patch.dict(os.environ, {"bcrypt_rounds": "5"})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def test_hash_and_verify_inline(self):
+        """Verify hashes use the configured cost and only a differing cost produces a new hash."""
+        hasher = PasswordHasher()
+        hashed = hasher.hash("secret")
+        self.assertEqual(hash_cost(hashed), 5)
+        self.assertEqual(hasher.verify("secret", hashed), (True, None))
+        self.assertEqual(hasher.verify("wrong", hashed), (False, None))
+        self.assertEqual(hasher.verify("secret", None), (False, None))  # Google accounts have no password
+
+        old = hasher.hash("secret", rounds=4)
+        matches, new_hash = hasher.verify("secret", old)
+        self.assertTrue(matches)
+        self.assertEqual(hash_cost(new_hash), 5)
+        self.assertEqual(hasher.verify("secret", new_hash), (True, None))
+        print("✅ TEST PASSED: Password hashes follow the configured work factor.")
+
+    def test_worker_pool(self):
+        """Verify hashing and checks give the same answers on the process pool."""
+        hasher = PasswordHasher()
+        hasher.start(max_workers=1)
+        self.addCleanup(hasher.stop)
+        hashed = hasher.hash("secret")
+        self.assertEqual(hash_cost(hashed), 5)
+        self.assertEqual(hasher.verify("secret", hashed), (True, None))
+        self.assertEqual(hasher.verify("wrong", hashed), (False, None))
+        print("✅ TEST PASSED: Passwords are hashed and checked on worker processes.")
+
+    def test_login_rehashes_old_cost(self):
+        """Verify a login with an outdated hash stores a new one at the configured cost."""
+        db = self.Session()
+        db.add(User(username="judge1", name="Judge One", role="Judge", is_active=True, is_pending=False,
+                    password_hash=PasswordHasher().hash("secret", rounds=4)))
+        db.commit()
+        db.close()
+
+        with patch('services.auth_service.audit_writer'):
+            user = AuthService().login("judge1", "secret")
+            self.assertEqual(user.username, "judge1")
+            self.assertEqual(hash_cost(user.password_hash), 5)
+            self.assertIsNone(AuthService().login("judge1", "wrong"))
+
+        db = self.Session()
+        stored = db.query(User).filter(User.username == "judge1").first().password_hash
+        db.close()
+        self.assertEqual(hash_cost(stored), 5)
+        print("✅ TEST PASSED: Login upgrades hashes to the configured work factor.")
+
+
+if __name__ == '__main__':
+    unittest.main()
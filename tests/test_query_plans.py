@@ -0,0 +1,150 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import re
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event, text, inspect
+
+from tests.db_fixture import DatabaseTestCase
+import core.database
+from core.database import Base
+from core.migrations import run_migrations
+from services.pageant_service import PageantService
+from services.quiz_service import QuizService
+from services.contestant_service import ContestantService
+from services.event_service import EventService
+from services.admin_service import AdminService
+from services.quiz_scoreboard import quiz_scoreboard
+from services.tabulation_service import standings_cache
+from models.all_models import User, Event, Segment, Criteria, Contestant, Score, EventJudge
+
+# Tables that grow with an event; a plain "SCAN <table>" on them is a regression
+HOT_TABLES = {"scores", "contestants", "criteria", "segments", "audit_logs", "event_judges", "judge_progress"}
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+# ...except a newest-first page in primary key order: SQLite reports it as SCAN,
+# but it walks the rowid b-tree from the end and stops after LIMIT rows
+PK_PAGE = re.compile(r"ORDER BY (\w+)\.id DESC\s+LIMIT", re.IGNORECASE)
+
+
+class TestQueryPlans(DatabaseTestCase):
+    """
+    Runs the hot service paths against SQLite, captures every SELECT they
+    issue and checks its EXPLAIN QUERY PLAN uses the indexes declared in
+    models/all_models.py instead of scanning whole tables.
+    """
+
+    def setUp(self):
+        super().setUp()
+        standings_cache.clear()
+        self.seed()
+        quiz_scoreboard.forget(self.quiz_id)
+
+        self.captured = []
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT") and not executemany:
+                self.captured.append((statement, parameters))
+        event.listen(self.engine, "before_cursor_execute", capture)
+
+    def seed(self):
+        db = self.Session()
+        judge = User(username="judge_plan", name="Judge", role="Judge")
+        tab = User(username="tab_plan", name="Tab", role="Tabulator")
+        pageant = Event(name="Pageant", event_type="Pageant")
+        quiz = Event(name="Quiz", event_type="QuizBee")
+        db.add_all([judge, tab, pageant, quiz])
+        db.flush()
+        seg = Segment(event_id=pageant.id, name="Talent", order_index=1, percentage_weight=1.0, is_active=True)
+        rnd = Segment(event_id=quiz.id, name="Easy", order_index=1, points_per_question=1, total_questions=3, is_active=True)
+        db.add_all([seg, rnd, EventJudge(event_id=pageant.id, judge_id=judge.id)])
+        db.flush()
+        crit = Criteria(segment_id=seg.id, name="Skill", weight=1.0, max_score=100)
+        lady = Contestant(event_id=pageant.id, candidate_number=1, name="Lady", gender="Female")
+        school = Contestant(event_id=quiz.id, candidate_number=1, name="School", assigned_tabulator_id=tab.id)
+        db.add_all([crit, lady, school])
+        db.flush()
+        db.add(Score(judge_id=judge.id, contestant_id=lady.id, segment_id=seg.id, criteria_id=crit.id, score_value=90))
+        db.commit()
+        self.ids = dict(judge=judge.id, tab=tab.id, pageant=pageant.id, quiz=quiz.id, seg=seg.id, rnd=rnd.id, crit=crit.id, lady=lady.id, school=school.id)
+        self.quiz_id = quiz.id
+        db.close()
+
+    def run_hot_paths(self):
+        i = self.ids
+        pageant, quiz = PageantService(), QuizService()
+        pageant.calculate_standing(i['pageant'])
+        pageant.get_judge_scores(i['judge'], i['lady'])
+        pageant.submit_scores_bulk(i['judge'], i['lady'], {i['crit']: 95.0})
+        pageant.has_judge_finished(i['judge'], i['seg'])
+        pageant.get_active_segment(i['pageant'])
+        quiz.submit_answer(i['tab'], i['school'], i['rnd'], 1, True)
+        quiz.get_live_scores(i['quiz'])
+        quiz.get_participants_for_active_round(i['quiz'], None)
+        ContestantService().get_contestants(i['quiz'], active_only=True)
+        EventService().get_judge_events(i['judge'])
+        EventService().is_judge_assigned(i['judge'], i['pageant'])
+        AdminService().get_security_logs()
+        AdminService().get_security_logs(before_id=100)
+        AdminService().get_security_logs(after_id=1)
+        AdminService().get_security_logs(event_id=i['pageant'], contestant_id=i['lady'])
+        AdminService().get_security_logs(user_id=i['judge'], before_id=100)
+        AdminService().get_security_logs(action="SCORE_SUBMIT")
+        AdminService().get_security_logs(segment_id=i['seg'])
+        db = self.Session()
+        db.query(Contestant).filter(Contestant.event_id == i['quiz'], Contestant.assigned_tabulator_id == i['tab']).first()
+        db.close()
+
+    @staticmethod
+    def is_pk_page(statement, table):
+        page = PK_PAGE.search(statement)
+        return bool(page) and page.group(1) == table
+
+    def test_hot_queries_use_indexes(self):
+        """Verify no hot query falls back to a full table scan."""
+        self.run_hot_paths()
+        self.assertGreater(len(self.captured), 10)
+
+        offenders = []
+        with self.engine.connect() as conn:
+            for statement, parameters in self.captured:
+                plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+                for row in plan:
+                    match = FULL_SCAN.match(row[-1])
+                    if match and match.group(1) in HOT_TABLES and not self.is_pk_page(statement, match.group(1)):
+                        offenders.append(f"{row[-1]} <- {' '.join(statement.split())[:160]}")
+        self.assertEqual(offenders, [], "Full scans on hot tables:\n" + "\n".join(offenders))
+        print("✅ TEST PASSED: Hot queries are served by indexes.")
+
+    def test_migration_adds_missing_indexes(self):
+        """Verify databases created before the indexes get them from the migration."""
+        declared = {ix.name: table.name for table in Base.metadata.sorted_tables for ix in table.indexes if not ix.unique}
+        with self.engine.begin() as conn:
+            for name in declared:
+                conn.execute(text(f"DROP INDEX {name}"))
+
+        run_migrations(self.engine)
+
+        inspector = inspect(self.engine)
+        for name, table in declared.items():
+            self.assertIn(name, {ix["name"] for ix in inspector.get_indexes(table)})
+        print("✅ TEST PASSED: Migration restores the declared indexes.")
+    def test_startup_adds_missing_indexes(self):
+        """Verify the app's startup check creates the declared indexes without init_db.py."""
+        declared = {ix.name: table.name for table in Base.metadata.sorted_tables for ix in table.indexes if not ix.unique}
+        with self.engine.begin() as conn:
+            for name in declared:
+                conn.execute(text(f"DROP INDEX {name}"))
+
+        with patch.object(core.database, "_engine", self.engine), patch.object(core.database, "_schema_ready", False):
+            self.assertTrue(core.database.ensure_database())
+
+        inspector = inspect(self.engine)
+        for name, table in declared.items():
+            self.assertIn(name, {ix["name"] for ix in inspector.get_indexes(table)})
+        print("✅ TEST PASSED: App startup restores the declared indexes.")
+
+if __name__ == '__main__':
+    unittest.main()
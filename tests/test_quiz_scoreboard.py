@@ -0,0 +1,149 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import threading
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from tests.db_fixture import DatabaseTestCase
+from services.quiz_service import QuizService
+from services.quiz_scoreboard import quiz_scoreboard
+from services.tabulation_service import standings_cache
+from models.all_models import User, Event, Segment, Contestant, Score
+
+
+class TestQuizScoreboard(DatabaseTestCase):
+    """
+    Checks the in-memory Quiz Bee running totals (services/quiz_scoreboard.py)
+    against a real (in-memory SQLite) database.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        self.quiz_service = QuizService()
+        self.seed()
+        # Each test gets a fresh database, so drop anything cached by a previous test
+        standings_cache.clear()
+        quiz_scoreboard.forget(self.event_id)
+
+    def seed(self):
+        db = self.Session()
+        tabulator = User(username="tab1", name="Tabulator", role="Tabulator")
+        ev = Event(name="Quiz Bee", event_type="QuizBee")
+        db.add_all([tabulator, ev])
+        db.flush()
+        easy = Segment(event_id=ev.id, name="Easy", order_index=1, points_per_question=1, total_questions=5, is_active=True)
+        hard = Segment(event_id=ev.id, name="Hard", order_index=2, points_per_question=3, total_questions=5)
+        teams = [Contestant(event_id=ev.id, candidate_number=i + 1, name=f"School {i}") for i in range(3)]
+        db.add_all([easy, hard] + teams)
+        db.commit()
+        self.tabulator_id, self.event_id = tabulator.id, ev.id
+        self.easy_id, self.hard_id = easy.id, hard.id
+        self.team_ids = [t.id for t in teams]
+        db.close()
+
+    def totals(self):
+        return {r['contestant_id']: r['total_score'] for r in self.quiz_service.get_live_scores(self.event_id)}
+
+    def test_overwrite_subtracts_points(self):
+        """Verify re-scoring a question Correct -> Wrong removes its points again."""
+        a, b, _ = self.team_ids
+        self.quiz_service.submit_answer(self.tabulator_id, a, self.easy_id, 1, True)
+        self.quiz_service.submit_answer(self.tabulator_id, a, self.hard_id, 1, True)
+        self.quiz_service.submit_answer(self.tabulator_id, b, self.hard_id, 1, True)
+        self.assertEqual(self.totals()[a], 4)
+
+        self.quiz_service.submit_answer(self.tabulator_id, a, self.hard_id, 1, False)
+        self.quiz_service.submit_answer(self.tabulator_id, a, self.hard_id, 1, False) # Repeated click
+        totals = self.totals()
+        self.assertEqual(totals[a], 1)
+        self.assertEqual(totals[b], 3)
+
+        # A cold rebuild from the scores table agrees with the running totals
+        live = dict(quiz_scoreboard.live_totals(self.event_id))
+        quiz_scoreboard.rebuild(self.event_id)
+        self.assertEqual(dict(quiz_scoreboard.live_totals(self.event_id)), live)
+        print("✅ TEST PASSED: Quiz running totals follow overwritten answers.")
+
+    def test_recount_picks_up_outside_writes(self):
+        """Verify Mission Control's recount brings the totals in line with rows written behind the app's back."""
+        a, b, _ = self.team_ids
+        self.quiz_service.submit_answer(self.tabulator_id, a, self.easy_id, 1, True)
+        self.assertEqual(self.totals()[a], 1)
+
+        # Manual DB edit / second app instance: never reaches this process's scoreboard
+        db = self.Session()
+        db.add(Score(contestant_id=b, judge_id=self.tabulator_id, segment_id=self.hard_id, question_number=1, score_value=3, is_correct=True))
+        db.query(Score).filter(Score.contestant_id == a).update({Score.score_value: 0, Score.is_correct: False})
+        db.commit()
+        db.close()
+        self.assertEqual(self.totals()[a], 1)  # Still the in-memory figure
+
+        success, _ = self.quiz_service.recount_scores(self.event_id)
+        self.assertTrue(success)
+        totals = self.totals()
+        self.assertEqual((totals[a], totals[b]), (0, 3))
+        print("✅ TEST PASSED: Recount reconciles quiz totals with the scores table.")
+
+    def test_rebuild_keeps_answers_recorded_meanwhile(self):
+        """Verify answers recorded while a rebuild is querying survive the swap, and readers get copies."""
+        a, b, _ = self.team_ids
+        self.quiz_service.submit_answer(self.tabulator_id, a, self.easy_id, 1, True)
+        snapshot = quiz_scoreboard.live_totals(self.event_id)
+
+        load = quiz_scoreboard._load
+        def load_then_answer(event_id):
+            result = load(event_id)
+            # Lands after the query read the table, before the new totals are installed
+            done = threading.Thread(target=self.quiz_service.submit_answer, args=(self.tabulator_id, b, self.hard_id, 1, True))
+            done.start()
+            done.join(timeout=5)
+            self.assertFalse(done.is_alive())  # The query did not hold the scoreboard lock
+            return result
+
+        with patch.object(quiz_scoreboard, "_load", side_effect=load_then_answer):
+            quiz_scoreboard.rebuild(self.event_id)
+
+        totals = quiz_scoreboard.live_totals(self.event_id)
+        self.assertEqual((totals[(a, self.easy_id)], totals[(b, self.hard_id)]), (1, 3))
+        self.assertNotIn((b, self.hard_id), snapshot)  # An earlier snapshot does not change
+        print("✅ TEST PASSED: Rebuild swaps in new totals without losing concurrent answers.")
+
+    def test_live_scores_do_not_query(self):
+        """Verify polling live scores between answers never touches the database."""
+        a = self.team_ids[0]
+        self.quiz_service.submit_answer(self.tabulator_id, a, self.easy_id, 1, True)
+        self.totals() # Warm up
+
+        self.query_count = 0
+        for _ in range(10):
+            self.totals()
+        self.assertEqual(self.query_count, 0)
+
+        # A new answer shows up on the next poll without reloading the standings
+        self.quiz_service.submit_answer(self.tabulator_id, a, self.easy_id, 2, True)
+        self.query_count = 0
+        self.assertEqual(self.totals()[a], 2)
+        self.assertEqual(self.query_count, 0)
+        print("✅ TEST PASSED: Quiz live scores served from memory.")
+
+    def test_completion_uses_answer_count(self):
+        """Verify scoring progress counts distinct answered questions."""
+        a, b, _ = self.team_ids
+        for q in range(1, 6):
+            self.quiz_service.submit_answer(self.tabulator_id, a, self.easy_id, q, q % 2 == 0)
+        self.quiz_service.submit_answer(self.tabulator_id, b, self.easy_id, 1, True)
+
+        db = self.Session()
+        seg = db.query(Segment).get(self.easy_id)
+        db.close()
+        result = self.quiz_service.check_scoring_completion(self.event_id, seg, [{'id': a}, {'id': b}], 5)
+        self.assertEqual([p['id'] for p in result['submitted']], [a])
+        self.assertEqual([p['progress_count'] for p in result['unsubmitted']], [1])
+        print("✅ TEST PASSED: Quiz scoring progress counts answered questions.")
+
+if __name__ == '__main__':
+    unittest.main()
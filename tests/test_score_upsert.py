@@ -0,0 +1,136 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+import threading
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import create_engine, text, inspect
+
+from tests.db_fixture import DatabaseTestCase
+import core.database
+from core.migrations import run_migrations, SCORE_UNIQUE_KEYS
+from services.pageant_service import PageantService
+from services.quiz_service import QuizService
+from services.quiz_scoreboard import quiz_scoreboard
+from services.tabulation_service import standings_cache
+from models.all_models import User, Event, Segment, Criteria, Contestant, Score
+
+
+class TestScoreUpsert(DatabaseTestCase):
+    """
+    Checks the unique score keys and the one-statement upserts
+    (core/upsert.py, core/migrations.py) on a file-backed SQLite database,
+    so concurrent writers use separate connections like they would on MySQL.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        super().setUp()
+        standings_cache.clear()
+
+        db = self.Session()
+        judge = User(username="judge_u", name="Judge", role="Judge")
+        pageant = Event(name="Pageant", event_type="Pageant")
+        quiz = Event(name="Quiz", event_type="QuizBee")
+        db.add_all([judge, pageant, quiz])
+        db.flush()
+        seg = Segment(event_id=pageant.id, name="Talent", order_index=1, percentage_weight=1.0)
+        rnd = Segment(event_id=quiz.id, name="Easy", order_index=1, points_per_question=2, total_questions=5)
+        db.add_all([seg, rnd])
+        db.flush()
+        crit = Criteria(segment_id=seg.id, name="Skill", weight=1.0, max_score=100)
+        lady = Contestant(event_id=pageant.id, candidate_number=1, name="Lady", gender="Female")
+        school = Contestant(event_id=quiz.id, candidate_number=1, name="School")
+        db.add_all([crit, lady, school])
+        db.commit()
+        self.judge_id, self.quiz_id, self.round_id = judge.id, quiz.id, rnd.id
+        self.crit_id, self.seg_id, self.lady_id, self.school_id = crit.id, seg.id, lady.id, school.id
+        db.close()
+        quiz_scoreboard.forget(self.quiz_id)
+
+    def make_engine(self):
+        return create_engine(f"sqlite:///{self.tmp.name}/scores.db", connect_args={"check_same_thread": False, "timeout": 30})
+
+    def scores(self, **filters):
+        db = self.Session()
+        try:
+            return db.query(Score).filter_by(**filters).all()
+        finally:
+            db.close()
+
+    def test_resubmitted_score_overwrites(self):
+        """Verify a re-locked pageant score and a re-marked quiz answer keep one row."""
+        pageant = PageantService()
+        self.assertTrue(pageant.submit_score(self.judge_id, self.lady_id, self.crit_id, 80.0)[0])
+        self.assertTrue(pageant.submit_score(self.judge_id, self.lady_id, self.crit_id, 92.5)[0])
+        rows = self.scores(contestant_id=self.lady_id)
+        self.assertEqual([(r.score_value, r.segment_id) for r in rows], [(92.5, self.seg_id)])
+
+        quiz = QuizService()
+        quiz.submit_answer(self.judge_id, self.school_id, self.round_id, 1, True)
+        quiz.submit_answer(self.judge_id, self.school_id, self.round_id, 1, False)
+        rows = self.scores(contestant_id=self.school_id)
+        self.assertEqual([(r.is_correct, r.score_value) for r in rows], [(False, 0)])
+        print("✅ TEST PASSED: Score upserts overwrite instead of duplicating.")
+
+    def test_concurrent_taps_leave_one_row(self):
+        """Verify simultaneous submits of the same answer cannot create duplicates."""
+        quiz = QuizService()
+        start = threading.Barrier(8)
+        results = []
+        def tap(is_correct):
+            start.wait()
+            results.append(quiz.submit_answer(self.judge_id, self.school_id, self.round_id, 3, is_correct)[0])
+        threads = [threading.Thread(target=tap, args=(i % 2 == 0,)) for i in range(8)]
+        for t in threads: t.start()
+        for t in threads: t.join()
+
+        self.assertTrue(all(results))
+        rows = self.scores(contestant_id=self.school_id, question_number=3)
+        self.assertEqual(len(rows), 1)
+        # The in-memory running total agrees with whichever tap committed last
+        totals = quiz_scoreboard.live_totals(self.quiz_id)
+        self.assertEqual(totals.get((self.school_id, self.round_id), 0), rows[0].score_value)
+        print("✅ TEST PASSED: Concurrent taps leave a single score row.")
+
+    def test_migration_dedupes_and_adds_keys(self):
+        """Verify an old database without the keys is cleaned up and upgraded."""
+        with self.engine.begin() as conn:
+            for name in SCORE_UNIQUE_KEYS:
+                conn.execute(text(f"DROP INDEX {name}"))
+        db = self.Session()
+        for value in [70.0, 75.0, 88.0]:
+            db.add(Score(judge_id=self.judge_id, contestant_id=self.lady_id, segment_id=self.seg_id, criteria_id=self.crit_id, score_value=value))
+        for value in [0, 2]:
+            db.add(Score(judge_id=self.judge_id, contestant_id=self.school_id, segment_id=self.round_id, question_number=1, score_value=value))
+        db.commit()
+        db.close()
+
+        run_migrations(self.engine)
+        run_migrations(self.engine) # Second run is a no-op
+
+        self.assertEqual([r.score_value for r in self.scores(contestant_id=self.lady_id)], [88.0])
+        self.assertEqual([r.score_value for r in self.scores(contestant_id=self.school_id)], [2])
+        index_names = {ix["name"] for ix in inspect(self.engine).get_indexes("scores")}
+        self.assertTrue(set(SCORE_UNIQUE_KEYS) <= index_names)
+        print("✅ TEST PASSED: Migration removes duplicate scores and adds unique keys.")
+    def test_startup_adds_keys(self):
+        """Verify the app's startup check upgrades a database that init_db.py was never re-run on."""
+        with self.engine.begin() as conn:
+            for name in SCORE_UNIQUE_KEYS:
+                conn.execute(text(f"DROP INDEX {name}"))
+
+        with patch.object(core.database, "_engine", self.engine), patch.object(core.database, "_schema_ready", False):
+            self.assertTrue(core.database.ensure_database())
+
+        index_names = {ix["name"] for ix in inspect(self.engine).get_indexes("scores")}
+        self.assertTrue(set(SCORE_UNIQUE_KEYS) <= index_names)
+        print("✅ TEST PASSED: App startup adds the unique score keys.")
+
+if __name__ == '__main__':
+    unittest.main()
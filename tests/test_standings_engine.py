@@ -0,0 +1,307 @@
+import unittest
+import sys
+import os
+import time
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import event
+
+from tests.db_fixture import DatabaseTestCase
+from services.pageant_service import PageantService
+from services.admin_service import AdminService
+from services.tabulation_service import TabulationService, standings_cache, structure_cache
+from services.audit_writer import audit_writer
+from models.all_models import User, Event, Segment, Criteria, Contestant, Score, AuditLog, EventJudge
+
+
+class TestStandingsEngine(DatabaseTestCase):
+    """
+    Benchmark for PageantService.calculate_standing and the shared
+    tabulation core (services/tabulation_service.py).
+    Runs against a real (in-memory SQLite) database and counts every SQL
+    statement, proving the query count stays flat as the event grows.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # Each test gets a fresh database, so drop anything cached by a previous test
+        standings_cache.clear()
+        structure_cache.clear()
+        self.pageant_service = PageantService()
+        self.tabulation_service = TabulationService()
+
+    def seed_event(self, num_contestants, num_segments=6, num_criteria=5, num_judges=3):
+        """Creates a full pageant and returns (event_id, expected standings by contestant id)."""
+        db = self.Session()
+        judges = [User(username=f"judge{num_contestants}_{i}", name=f"Judge {i}", role="Judge") for i in range(num_judges)]
+        ev = Event(name=f"Pageant {num_contestants}", event_type="Pageant")
+        db.add_all(judges + [ev])
+        db.flush()
+
+        segments = []
+        for s in range(num_segments):
+            seg = Segment(event_id=ev.id, name=f"Segment {s}", order_index=s, percentage_weight=1.0 / num_segments)
+            db.add(seg)
+            db.flush()
+            crits = [Criteria(segment_id=seg.id, name=f"Crit {s}.{k}", weight=1.0 / num_criteria, max_score=100) for k in range(num_criteria)]
+            db.add_all(crits)
+            db.flush()
+            segments.append((seg, crits))
+
+        contestants = []
+        for n in range(num_contestants):
+            c = Contestant(event_id=ev.id, candidate_number=n + 1, name=f"Candidate {n}", gender="Male" if n % 2 else "Female")
+            db.add(c)
+            contestants.append(c)
+        db.flush()
+
+        # Reference computation (the original nested-loop formula), done in Python
+        expected = {}
+        for c in contestants:
+            total = 0.0
+            for seg, crits in segments:
+                seg_score = 0.0
+                for crit in crits:
+                    values = [float((c.id * 7 + crit.id * 3 + j.id) % 40 + 60) for j in judges]
+                    for j, v in zip(judges, values):
+                        db.add(Score(contestant_id=c.id, judge_id=j.id, segment_id=seg.id, criteria_id=crit.id, score_value=v))
+                    seg_score += (sum(values) / len(values)) * crit.weight
+                total += seg_score * seg.percentage_weight
+            expected[c.id] = round(total, 2)
+
+        db.commit()
+        event_id = ev.id
+        db.close()
+        return event_id, expected
+
+    def run_standing(self, event_id):
+        standings_cache.invalidate(event_id) # Measure the real load, not a cache hit
+        self.query_count = 0
+        start = time.perf_counter()
+        results = self.pageant_service.calculate_standing(event_id)
+        elapsed = (time.perf_counter() - start) * 1000
+        return results, self.query_count, elapsed
+
+    def test_results_match_reference(self):
+        """Verify the aggregated engine reproduces the weighted-average formula."""
+        event_id, expected = self.seed_event(num_contestants=8)
+        results, _, _ = self.run_standing(event_id)
+
+        self.assertEqual(len(results), 8)
+        for r in results:
+            self.assertAlmostEqual(r['total_score'], expected[r['contestant_id']], places=2)
+        totals = [r['total_score'] for r in results]
+        self.assertEqual(totals, sorted(totals, reverse=True))
+        print("✅ TEST PASSED: Standings engine matches reference calculation.")
+
+    def test_query_count_is_constant(self):
+        """Verify the query count does not grow with contestants (no N+1)."""
+        small_event, _ = self.seed_event(num_contestants=5)
+        large_event, _ = self.seed_event(num_contestants=40)
+
+        _, small_queries, small_ms = self.run_standing(small_event)
+        _, large_queries, large_ms = self.run_standing(large_event)
+
+        print(f"\n   5 contestants : {small_queries} queries, {small_ms:.1f} ms")
+        print(f"   40 contestants: {large_queries} queries, {large_ms:.1f} ms")
+
+        self.assertEqual(small_queries, large_queries)
+        # event, segments, contestants, judges, criteria, grouped averages
+        self.assertLessEqual(large_queries, 6)
+        print("✅ TEST PASSED: Standings query count is constant.")
+
+    def test_views_share_one_load(self):
+        """Verify standing, breakdown, prelim rankings and leaderboard agree and come from one load."""
+        event_id, expected = self.seed_event(num_contestants=6, num_segments=2)
+        self.query_count = 0
+        matrix = self.tabulation_service.load_matrix(event_id)
+        load_queries = self.query_count
+
+        standing = matrix.standing()
+        breakdown = matrix.overall_breakdown()
+        prelims = matrix.preliminary_rankings()
+        scores, mode, p_headers, f_headers, show_total = matrix.leaderboard()
+
+        # Rendering the four outputs must not touch the database
+        self.assertEqual(self.query_count, load_queries)
+
+        by_name = {r['name']: r['total_score'] for r in standing}
+        for gender in ['Male', 'Female']:
+            for r in breakdown[gender]:
+                self.assertAlmostEqual(r['total'], by_name[r['name']], places=2)
+            for entry in prelims[gender]:
+                self.assertAlmostEqual(entry['score'], expected[entry['contestant'].id], places=2)
+        for r in scores:
+            self.assertAlmostEqual(r['p_tot'], by_name[r['name']], places=2)
+
+        self.assertEqual(mode, "OFFICIAL RANKINGS")
+        self.assertEqual(p_headers, []) # Nothing revealed yet
+        self.assertFalse(show_total)
+        print("✅ TEST PASSED: Tabulation views share one bulk load.")
+
+    def test_cache_reused_until_score_write(self):
+        """Verify polls between writes read the cache, and a score write invalidates it."""
+        event_id, _ = self.seed_event(num_contestants=4, num_segments=1, num_criteria=1, num_judges=1)
+        first = self.pageant_service.calculate_standing(event_id)
+
+        self.query_count = 0
+        for _ in range(5):
+            self.pageant_service.get_overall_breakdown(event_id)
+            self.tabulation_service.get_matrix(event_id).leaderboard()
+        self.assertEqual(self.query_count, 0, "Cached polls should not hit the database")
+
+        # Push the last-placed contestant to the top
+        db = self.Session()
+        last = first[-1]['contestant_id']
+        score = db.query(Score).filter(Score.contestant_id == last).first()
+        judge_id, crit_id = score.judge_id, score.criteria_id
+        db.close()
+        success, _ = self.pageant_service.submit_score(judge_id, last, crit_id, 1000.0)
+        self.assertTrue(success)
+
+        updated = self.pageant_service.calculate_standing(event_id)
+        self.assertEqual(updated[0]['contestant_id'], last)
+        print("✅ TEST PASSED: Standings cache reused between writes, invalidated by a score.")
+
+    def test_judge_changes_refresh_cached_names(self):
+        """Verify renaming or deleting an assigned judge drops the cached standings that list them."""
+        event_id, _ = self.seed_event(num_contestants=2, num_segments=1, num_criteria=1, num_judges=2)
+        db = self.Session()
+        judges = db.query(User).filter(User.role == "Judge").order_by(User.id).all()
+        db.add_all([EventJudge(event_id=event_id, judge_id=j.id) for j in judges])
+        db.commit()
+        first, second = [(j.id, j.username) for j in judges]
+        db.close()
+        self.assertEqual(self.tabulation_service.get_matrix(event_id).judge_names, ["Judge 0", "Judge 1"])
+
+        admin = AdminService()
+        self.assertTrue(admin.update_user(None, first[0], "Judge Zero", first[1], "Judge")[0])
+        self.assertEqual(self.tabulation_service.get_matrix(event_id).judge_names, ["Judge 1", "Judge Zero"])
+
+        self.assertTrue(admin.delete_user(None, second[0])[0])
+        self.assertEqual(self.tabulation_service.get_matrix(event_id).judge_names, ["Judge Zero"])
+        print("✅ TEST PASSED: Judge renames and deletions refresh cached standings.")
+
+    def test_final_round_ranks_from_database(self):
+        """Verify eliminations use the scores in the database, not a standings matrix cached before them."""
+        event_id, _ = self.seed_event(num_contestants=4, num_segments=1, num_criteria=1, num_judges=1)
+        db = self.Session()
+        women = {c.name: c.id for c in db.query(Contestant).filter(Contestant.gender == "Female")}
+        db.query(Score).filter(Score.contestant_id == women["Candidate 0"]).update({Score.score_value: 100})
+        db.query(Score).filter(Score.contestant_id == women["Candidate 2"]).update({Score.score_value: 0})
+        db.commit()
+        ranked = self.tabulation_service.get_matrix(event_id).preliminary_rankings()  # Cached
+        self.assertEqual(ranked["Female"][0]["contestant"].name, "Candidate 0")
+
+        # Written behind the cache (e.g. a second app instance): Candidate 2 now leads the women
+        db.query(Score).filter(Score.contestant_id == women["Candidate 0"]).update({Score.score_value: 0})
+        db.query(Score).filter(Score.contestant_id == women["Candidate 2"]).update({Score.score_value: 100})
+        final = Segment(event_id=event_id, name="Final", order_index=9, percentage_weight=1.0, is_final=True)
+        db.add(final)
+        db.commit()
+        final_id = final.id
+        db.close()
+
+        success, qualifiers, eliminated = self.pageant_service.activate_final_round(event_id, final_id, 1)
+        self.assertTrue(success)
+        self.assertIn("Candidate 2 (Female)", qualifiers)
+        self.assertIn("Candidate 0 (Female)", eliminated)
+        print("✅ TEST PASSED: Final round eliminations rank from fresh scores.")
+
+    def test_bulk_card_is_one_transaction(self):
+        """Verify a whole scoring card saves with one commit and queues one audit row."""
+        event_id, _ = self.seed_event(num_contestants=2, num_segments=1, num_criteria=5, num_judges=1)
+        db = self.Session()
+        new_judge = User(username="bulk_judge", name="Bulk Judge", role="Judge")
+        db.add(new_judge)
+        db.commit()
+        judge_id = new_judge.id
+        contestant_id = db.query(Contestant.id).filter(Contestant.event_id == event_id).first()[0]
+        crit_ids = [c_id for (c_id,) in db.query(Criteria.id).all()]
+        audit_writer.flush()
+        logs_before = db.query(AuditLog).count()
+        db.close()
+
+        commits = []
+        event.listen(self.engine, "commit", lambda conn: commits.append(1))
+        card = {c_id: 85.0 for c_id in crit_ids}
+        self.query_count = 0
+        success, _ = self.pageant_service.submit_scores_bulk(judge_id, contestant_id, card)
+        first_queries = self.query_count
+        self.assertTrue(success)
+        self.assertEqual(len(commits), 1)
+
+        # Re-locking the same card updates in place
+        card = {c_id: 95.0 for c_id in crit_ids}
+        success, _ = self.pageant_service.submit_scores_bulk(judge_id, contestant_id, card)
+        self.assertTrue(success)
+        self.assertEqual(len(commits), 2)
+        # Lookups are batched: no per-criteria queries
+        self.assertLessEqual(first_queries, 6)
+
+        db = self.Session()
+        saved = db.query(Score).filter(Score.judge_id == judge_id).all()
+        self.assertEqual(sorted(s.criteria_id for s in saved), sorted(crit_ids))
+        self.assertTrue(all(s.score_value == 95.0 for s in saved))
+        # Audit rows are written by the audit writer, outside the scoring transaction
+        self.assertEqual(db.query(AuditLog).count(), logs_before)
+        self.assertEqual(audit_writer.flush(), 2)
+        self.assertEqual(db.query(AuditLog).count(), logs_before + 2)
+        details = [d for (d,) in db.query(AuditLog.details).order_by(AuditLog.id.desc()).limit(1)]
+        self.assertTrue(details[0].startswith("Scored '"), details)
+        db.close()
+        print("✅ TEST PASSED: Bulk card submission is one transaction.")
+
+    def test_structure_cached_until_config_change(self):
+        """Verify judge dashboard structure loads skip the database until a segment/criteria change."""
+        event_id, _ = self.seed_event(num_contestants=2, num_segments=3, num_criteria=2, num_judges=1)
+        self.query_count = 0
+        structure = self.pageant_service.get_event_structure(event_id)
+        self.assertEqual(self.query_count, 2) # segments + all criteria, not one per segment
+        self.assertEqual([len(s['criteria']) for s in structure], [2, 2, 2])
+
+        # Score writes do not touch the structure
+        db = self.Session()
+        score = db.query(Score).first()
+        judge_id, contestant_id, crit_id = score.judge_id, score.contestant_id, score.criteria_id
+        seg_id = structure[0]['segment'].id
+        db.close()
+        self.pageant_service.submit_score(judge_id, contestant_id, crit_id, 70.0)
+        self.query_count = 0
+        for _ in range(5):
+            self.pageant_service.get_event_structure(event_id)
+        self.assertEqual(self.query_count, 0, "Repeated dashboard entries should not hit the database")
+
+        # Admin config changes invalidate it
+        self.pageant_service.update_criteria(crit_id, "Renamed", 0.5)
+        self.pageant_service.add_criteria(seg_id, "Extra", 0.0)
+        structure = self.pageant_service.get_event_structure(event_id)
+        self.assertEqual(len(structure[0]['criteria']), 3)
+        self.assertIn("Renamed", [c.name for s in structure for c in s['criteria']])
+        print("✅ TEST PASSED: Event structure cached until a config change.")
+
+    def test_judge_segment_scores_in_one_query(self):
+        """Verify a judge's whole segment is prefetched in one query and matches the per-contestant lookup."""
+        event_id, _ = self.seed_event(num_contestants=12, num_segments=2, num_criteria=3, num_judges=2)
+        structure = self.pageant_service.get_event_structure(event_id)
+        seg_id = structure[0]['segment'].id
+        db = self.Session()
+        judge_id = db.query(User.id).filter(User.username == "judge12_0").scalar()
+        contestant_ids = [c_id for (c_id,) in db.query(Contestant.id).filter(Contestant.event_id == event_id).all()]
+        db.close()
+
+        self.query_count = 0
+        segment_scores = self.pageant_service.get_judge_scores_for_segment(judge_id, seg_id)
+        self.assertEqual(self.query_count, 1)
+
+        seg_crit_ids = {c.id for c in structure[0]['criteria']}
+        self.assertEqual(set(segment_scores), set(contestant_ids))
+        for c_id in contestant_ids:
+            expected = {k: v for k, v in self.pageant_service.get_judge_scores(judge_id, c_id).items() if k in seg_crit_ids}
+            self.assertEqual(segment_scores[c_id], expected)
+        print("✅ TEST PASSED: Judge segment scores prefetched in one query.")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from unittest.mock import patch
+import sys
+import os
+import tempfile
+
+# Add the parent directory to sys.path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text, inspect
+
+from tests.db_fixture import DatabaseTestCase
+import core.database
+from core.database import Base, create_app_engine, database_url
+from core.migrations import run_migrations
+from services.pageant_service import PageantService
+from services.quiz_service import QuizService
+from services.quiz_scoreboard import quiz_scoreboard
+from services.tabulation_service import standings_cache
+from models.all_models import User, Event, Segment, Criteria, Contestant, Score
+
+
+class TestStorageBackend(DatabaseTestCase):
+    """Runs the services on the embedded SQLite/WAL backend built by core/database.py."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        env = patch.dict(os.environ, {"db_backend": "sqlite", "db_sqlite_path": os.path.join(self.tmp.name, "venue.sqlite3")})
+        env.start()
+        self.addCleanup(env.stop)
+
+        super().setUp()
+        run_migrations(self.engine)
+        standings_cache.clear()
+
+    def make_engine(self):
+        return create_app_engine()
+
+    def test_pragmas_applied(self):
+        """Verify every pooled connection runs in WAL mode with the tuned pragmas."""
+        self.assertTrue(database_url().startswith("sqlite:///"))
+        with self.engine.connect() as conn:
+            self.assertEqual(conn.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            self.assertEqual(conn.execute(text("PRAGMA synchronous")).scalar(), 1) # NORMAL
+            self.assertEqual(conn.execute(text("PRAGMA cache_size")).scalar(), -64 * 1024)
+            self.assertEqual(conn.execute(text("PRAGMA foreign_keys")).scalar(), 1)
+        print("✅ TEST PASSED: SQLite backend applies WAL pragmas.")
+
+    def test_services_unchanged(self):
+        """Verify score upserts, standings aggregates and quiz answers work on the SQLite backend."""
+        db = self.Session()
+        judge = User(username="venue_judge", name="Judge", role="Judge")
+        pageant = Event(name="Pageant", event_type="Pageant")
+        quiz = Event(name="Quiz", event_type="QuizBee")
+        db.add_all([judge, pageant, quiz])
+        db.flush()
+        seg = Segment(event_id=pageant.id, name="Talent", order_index=1, percentage_weight=1.0)
+        rnd = Segment(event_id=quiz.id, name="Easy", order_index=1, points_per_question=2, total_questions=5)
+        db.add_all([seg, rnd])
+        db.flush()
+        crits = [Criteria(segment_id=seg.id, name=f"Crit {k}", weight=0.5, max_score=100) for k in range(2)]
+        lady = Contestant(event_id=pageant.id, candidate_number=1, name="Lady", gender="Female")
+        school = Contestant(event_id=quiz.id, candidate_number=1, name="School")
+        db.add_all(crits + [lady, school])
+        db.commit()
+        judge_id, pageant_id, quiz_id, round_id = judge.id, pageant.id, quiz.id, rnd.id
+        lady_id, school_id = lady.id, school.id
+        crit_ids = [c.id for c in crits]
+        db.close()
+        quiz_scoreboard.forget(quiz_id)
+
+        pageant_service = PageantService()
+        self.assertTrue(pageant_service.submit_scores_bulk(judge_id, lady_id, {c_id: 80.0 for c_id in crit_ids})[0])
+        self.assertTrue(pageant_service.submit_scores_bulk(judge_id, lady_id, {c_id: 90.0 for c_id in crit_ids})[0])
+        standing = pageant_service.calculate_standing(pageant_id)
+        self.assertAlmostEqual(standing[0]['total_score'], 90.0, places=2)
+
+        quiz_service = QuizService()
+        self.assertTrue(quiz_service.submit_answer(judge_id, school_id, round_id, 1, True)[0])
+        self.assertTrue(quiz_service.submit_answer(judge_id, school_id, round_id, 1, False)[0])
+        self.assertTrue(quiz_service.submit_answer(judge_id, school_id, round_id, 2, True)[0])
+
+        db = self.Session()
+        self.assertEqual(db.query(Score).filter(Score.contestant_id == lady_id).count(), 2)
+        self.assertEqual(db.query(Score).filter(Score.contestant_id == school_id).count(), 2)
+        db.close()
+        self.assertEqual(quiz_scoreboard.live_totals(quiz_id)[(school_id, round_id)], 2)
+        print("✅ TEST PASSED: Services run unchanged on the SQLite backend.")
+
+    def test_unknown_backend_rejected(self):
+        with self.assertRaises(ValueError):
+            create_app_engine("postgres")
+        print("✅ TEST PASSED: Unknown backends are rejected.")
+    def test_startup_builds_fresh_file(self):
+        """Verify the app's startup check gives a brand-new SQLite file the full schema, in WAL mode."""
+        fresh = os.path.join(self.tmp.name, "fresh.sqlite3")
+        with patch.dict(os.environ, {"db_sqlite_path": fresh}), \
+                patch.object(core.database, "_engine", None), patch.object(core.database, "_schema_ready", False):
+            self.assertTrue(core.database.ensure_database())
+            engine = core.database.get_engine()
+            self.addCleanup(engine.dispose)
+            with engine.connect() as conn:
+                self.assertEqual(conn.execute(text("PRAGMA journal_mode")).scalar(), "wal")
+            tables = set(inspect(engine).get_table_names())
+        self.assertTrue({t.name for t in Base.metadata.sorted_tables} <= tables)
+        print("✅ TEST PASSED: Startup creates the schema on a new SQLite file.")
+
+if __name__ == '__main__':
+    unittest.main()
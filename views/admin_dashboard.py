@@ -3,6 +3,7 @@ from services.admin_service import AdminService
 from services.event_service import EventService
 from components.dialogs import show_about_dialog, show_contact_dialog
 from views.audit_log_view import AuditLogView
+from views.performance_view import PerformanceView
 
 def AdminDashboardView(page: ft.Page, on_logout_callback):
     admin_service = AdminService()
@@ -324,6 +325,20 @@ def AdminDashboardView(page: ft.Page, on_logout_callback):
         main_content_area.controls = [content]
         page.update()
 
+    def load_performance_view():
+        # Admin only: per-service query counts and latency percentiles
+        content = ft.Container(
+            content=PerformanceView(page, on_back_click=lambda e: load_welcome_view()),
+            padding=0,
+            bgcolor="white",
+            border_radius=15,
+            shadow=ft.BoxShadow(blur_radius=10, color=ft.Colors.BLACK12),
+            margin=20,
+            expand=True,
+        )
+        main_content_area.controls = [content]
+        page.update()
+
     # --- HOME VIEW ---
     def load_welcome_view():
         # Stats Fetching
@@ -372,6 +387,14 @@ def AdminDashboardView(page: ft.Page, on_logout_callback):
         # Display simplified text if Read Only
         welcome_msg = f"Welcome back, Admin." if not is_read_only else f"Welcome, Auditor. System in Read-Only Mode."
 
+        nav_cards = [
+            menu_card("User Management", "View active judges and staff.", ft.Icons.MANAGE_ACCOUNTS, "#64AEFF", lambda e: load_users_view()),
+            menu_card("Event Management", "Monitor pageants and quizzes.", ft.Icons.EVENT_NOTE, "#FFB74D", lambda e: load_events_view()),
+            menu_card("Security Audit", "View system logs and activity trails.", ft.Icons.SECURITY, "#E57373", lambda e: load_audit_logs()),
+        ]
+        if user_role == "Admin":
+            nav_cards.append(menu_card("Performance", "Query counts and latency per service call.", ft.Icons.SPEED, "#81C784", lambda e: load_performance_view()))
+
         content = ft.Column([
             ft.Text("Dashboard Overview", size=28, weight="bold"),
             ft.Text(welcome_msg, color="grey"),
@@ -389,11 +412,7 @@ def AdminDashboardView(page: ft.Page, on_logout_callback):
             ft.Container(height=10),
             
             # 2. Navigation Cards
-            ft.Row([
-                menu_card("User Management", "View active judges and staff.", ft.Icons.MANAGE_ACCOUNTS, "#64AEFF", lambda e: load_users_view()),
-                menu_card("Event Management", "Monitor pageants and quizzes.", ft.Icons.EVENT_NOTE, "#FFB74D", lambda e: load_events_view()),
-                menu_card("Security Audit", "View system logs and activity trails.", ft.Icons.SECURITY, "#E57373", lambda e: load_audit_logs()),
-            ], wrap=True, spacing=30, alignment="start")
+            ft.Row(nav_cards, wrap=True, spacing=30, alignment="start")
         ], scroll="adaptive")
 
         main_content_area.controls = [ft.Container(content, padding=40)]
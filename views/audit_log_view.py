@@ -1,109 +1,185 @@
 import flet as ft
-import threading
 import time
-from services.admin_service import AdminService
+import datetime
+import threading
+from services.admin_service import AdminService, AUDIT_PAGE_SIZE
+from services.contestant_service import ContestantService
+from core.event_bus import AUDIT_TOPIC
+from components.live_updates import LiveView
+
+# Actions written by the services (filter choices)
+AUDIT_ACTIONS = ["LOGIN", "LOGOUT", "SCORE_SUBMIT", "SCORE_FINALIZED", "CREATE_USER", "UPDATE_USER", "DELETE_USER",
+                 "CREATE_EVENT", "DELETE_EVENT", "UPDATE_EVENT_STATUS", "ADD_ROUND", "UPDATE_ROUND", "DELETE_ROUND", "ADVANCE_ROUND"]
 
 def AuditLogView(page: ft.Page, on_back_click=None):
     admin_service = AdminService()
+    contestant_service = ContestantService()
     
-    # State for polling
-    is_active = True
-    
-    # UI Components - Initial Setup
-    data_table = ft.DataTable(
-        columns=[
-            ft.DataColumn(ft.Text("ID", color="white", weight="bold"), numeric=True),
-            ft.DataColumn(ft.Text("User (Role)", color="white", weight="bold")),
-            ft.DataColumn(ft.Text("Action", color="white", weight="bold")),
-            ft.DataColumn(ft.Text("Details", color="white", weight="bold")),
-            ft.DataColumn(ft.Text("Timestamp", color="white", weight="bold")),
-        ],
-        rows=[],
-        # Modern Styling
-        heading_row_color="#64AEFF", # System Blue
-        heading_row_height=50,
-        data_row_max_height=60,
-        column_spacing=20,
-        # Subtle grid lines
-        vertical_lines=ft.border.BorderSide(1, "#F0F0F0"),
-        horizontal_lines=ft.border.BorderSide(1, "#F0F0F0"),
-        border_radius=10,
+    # Column widths (Details takes the rest)
+    COLUMNS = [("ID", 70), ("User (Role)", 220), ("Action", 190), ("Details", None), ("Timestamp", 170)]
+
+    def cell(control, width):
+        return ft.Container(content=control, width=width, expand=width is None, padding=ft.padding.symmetric(horizontal=10))
+
+    header_bar = ft.Container(
+        content=ft.Row([cell(ft.Text(title, color="white", weight="bold"), width) for title, width in COLUMNS], spacing=0),
+        bgcolor="#64AEFF", # System Blue
+        height=50,
+        border_radius=ft.border_radius.only(top_left=10, top_right=10),
     )
+
+    # Virtualized list: Flutter only lays out visible rows; older pages are
+    # fetched by id (keyset) as the admin scrolls, new rows are prepended.
+    log_list = ft.ListView(expand=True, spacing=0, on_scroll_interval=100)
+    state = {'newest_id': None, 'oldest_id': None, 'has_older': True}
+    filters = {}   # Passed to get_security_logs (filtered in the database)
+    lock = threading.Lock()
     
     last_updated_text = ft.Text("Loading...", size=12, color="grey", italic=True)
 
+    def build_row(log):
+        ts_str = log.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Color code specific actions for text
+        action_color = ft.Colors.BLACK87
+        if "LOGIN" in log.action: action_color = ft.Colors.BLUE_700
+        elif "DELETE" in log.action: action_color = ft.Colors.RED_700
+        elif "SCORE" in log.action: action_color = ft.Colors.GREEN_700
+        elif "CREATE" in log.action: action_color = ft.Colors.PURPLE_700
+
+        # Handle potentially missing user (if deleted)
+        user_display = "Unknown"
+        if log.user:
+            user_display = f"{log.user.username} ({log.user.role})"
+        else:
+            user_display = f"User ID: {log.user_id} (Deleted)"
+
+        # Zebra Striping Logic (by id, so prepending keeps the stripes)
+        row_bg_color = "#F9FAFB" if log.id % 2 == 0 else "white"
+
+        cells = [
+            ft.Text(str(log.id), size=12),
+            ft.Text(user_display, weight="bold", size=12),
+            ft.Container(
+                content=ft.Text(log.action, color=action_color, weight="bold", size=11),
+                padding=ft.padding.symmetric(horizontal=8, vertical=4),
+                bgcolor=ft.Colors.with_opacity(0.1, action_color),
+                border_radius=5
+            ),
+            ft.Text(log.details, size=12, overflow=ft.TextOverflow.ELLIPSIS, max_lines=2),
+            ft.Text(ts_str, size=12, color="grey"),
+        ]
+        return ft.Container(
+            content=ft.Row([cell(c, width) for c, (_, width) in zip(cells, COLUMNS)], spacing=0),
+            bgcolor=row_bg_color,
+            height=60,
+            border=ft.border.only(bottom=ft.border.BorderSide(1, "#F0F0F0")),
+        )
+
     def fetch_logs():
-        """Fetches logs from DB and updates the table rows"""
+        """Loads the newest page once, then only the rows written since (tail mode)"""
         try:
-            # --- DYNAMIC WIDTH CALCULATION ---
-            # This ensures the table tries to fill the screen width minus padding
-            if page.width:
-                # 120 = approx padding (40*2) + margins
-                target_width = page.width - 120
-                # Ensure it doesn't get too small (min 800px)
-                data_table.width = max(target_width, 800)
-            
-            logs = admin_service.get_security_logs()
-            new_rows = []
-            
-            for i, log in enumerate(logs):
-                ts_str = log.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-                
-                # Color code specific actions for text
-                action_color = ft.Colors.BLACK87
-                if "LOGIN" in log.action: action_color = ft.Colors.BLUE_700
-                elif "DELETE" in log.action: action_color = ft.Colors.RED_700
-                elif "SCORE" in log.action: action_color = ft.Colors.GREEN_700
-                elif "CREATE" in log.action: action_color = ft.Colors.PURPLE_700
-
-                # Handle potentially missing user (if deleted)
-                user_display = "Unknown"
-                if log.user:
-                    user_display = f"{log.user.username} ({log.user.role})"
+            with lock:
+                if state['newest_id'] is None:
+                    logs = admin_service.get_security_logs(**filters)
+                    log_list.controls = [build_row(log) for log in logs]
+                    state['has_older'] = len(logs) == AUDIT_PAGE_SIZE
+                    if logs:
+                        state['newest_id'], state['oldest_id'] = logs[0].id, logs[-1].id
                 else:
-                    user_display = f"User ID: {log.user_id} (Deleted)"
-
-                # Zebra Striping Logic
-                row_bg_color = "#F9FAFB" if i % 2 == 0 else "white"
-
-                new_rows.append(
-                    ft.DataRow(
-                        color=row_bg_color,
-                        cells=[
-                            ft.DataCell(ft.Text(str(log.id), size=12)),
-                            ft.DataCell(ft.Text(user_display, weight="bold", size=12)),
-                            ft.DataCell(ft.Container(
-                                content=ft.Text(log.action, color=action_color, weight="bold", size=11),
-                                padding=ft.padding.symmetric(horizontal=8, vertical=4),
-                                bgcolor=ft.Colors.with_opacity(0.1, action_color),
-                                border_radius=5
-                            )),
-                            ft.DataCell(ft.Text(log.details, size=12, overflow=ft.TextOverflow.ELLIPSIS)),
-                            ft.DataCell(ft.Text(ts_str, size=12, color="grey")),
-                        ]
-                    )
-                )
-            
-            data_table.rows = new_rows
+                    while True:
+                        logs = admin_service.get_security_logs(after_id=state['newest_id'], **filters)
+                        if not logs: break
+                        log_list.controls[0:0] = [build_row(log) for log in logs]
+                        state['newest_id'] = logs[0].id
+                        if len(logs) < AUDIT_PAGE_SIZE: break
             now_str = time.strftime("%H:%M:%S")
             last_updated_text.value = f"Auto-updated at: {now_str}"
             page.update()
         except Exception as e:
             print(f"Error fetching logs: {e}")
 
-    def poll_logs():
-        """Background thread to refresh logs every 3 seconds"""
-        while is_active:
-            fetch_logs()
-            time.sleep(3)
+    def load_older(e):
+        if not state['has_older'] or e.pixels < e.max_scroll_extent - e.viewport_dimension:
+            return
+        with lock:
+            if not state['has_older'] or state['oldest_id'] is None:
+                return
+            logs = admin_service.get_security_logs(before_id=state['oldest_id'], **filters)
+            log_list.controls.extend(build_row(log) for log in logs)
+            state['has_older'] = len(logs) == AUDIT_PAGE_SIZE
+            if logs: state['oldest_id'] = logs[-1].id
+        log_list.update()
+
+    log_list.on_scroll = load_older
+
+    # Refresh only when new audit rows are committed
+    live = LiveView(page, fetch_logs)
+    live.watch(AUDIT_TOPIC)
+    live.trigger()
+
+    # --- FILTERS ---
+    ALL = "all"
+
+    def dropdown(label, options, width):
+        return ft.Dropdown(label=label, dense=True, width=width, bgcolor="white",
+                           options=[ft.dropdown.Option(key=ALL, text="All")] + options, value=ALL)
+
+    def chosen(control):
+        return None if control.value in (None, ALL) else control.value
+
+    action_filter = dropdown("Action", [ft.dropdown.Option(a) for a in AUDIT_ACTIONS], 200)
+    user_filter = dropdown("User", [ft.dropdown.Option(key=str(u.id), text=f"{u.username} ({u.role})") for u in admin_service.get_all_users()], 200)
+    event_filter = dropdown("Event", [ft.dropdown.Option(key=str(ev.id), text=ev.name) for ev in admin_service.get_all_events()], 200)
+    contestant_filter = dropdown("Contestant", [], 200)
+    contestant_filter.disabled = True
+    period_filter = ft.Dropdown(label="Period", dense=True, width=150, bgcolor="white", value="all", options=[
+        ft.dropdown.Option(key="all", text="All time"), ft.dropdown.Option(key="hour", text="Last hour"), ft.dropdown.Option(key="today", text="Today")
+    ])
+
+    def apply_filters(e=None):
+        filters.clear()
+        if chosen(action_filter): filters['action'] = chosen(action_filter)
+        if chosen(user_filter): filters['user_id'] = int(chosen(user_filter))
+        if chosen(event_filter): filters['event_id'] = int(chosen(event_filter))
+        if chosen(contestant_filter): filters['contestant_id'] = int(chosen(contestant_filter))
+        now = datetime.datetime.now()
+        if period_filter.value == "hour": filters['since'] = now - datetime.timedelta(hours=1)
+        elif period_filter.value == "today": filters['since'] = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        with lock:
+            state.update(newest_id=None, oldest_id=None, has_older=True)
+            log_list.controls = []
+        live.trigger()
+
+    def on_event_change(e):
+        # Contestant choices follow the selected event
+        contestant_filter.value = ALL
+        contestants = contestant_service.get_contestants(int(chosen(event_filter))) if chosen(event_filter) else []
+        contestant_filter.options = [ft.dropdown.Option(key=ALL, text="All")] + [
+            ft.dropdown.Option(key=str(c.id), text=f"#{c.candidate_number} {c.name}") for c in contestants]
+        contestant_filter.disabled = not contestants
+        apply_filters()
+
+    for control in (action_filter, user_filter, contestant_filter, period_filter):
+        control.on_change = apply_filters
+    event_filter.on_change = on_event_change
+
+    def clear_filters(e):
+        for control in (action_filter, user_filter, event_filter, contestant_filter):
+            control.value = ALL
+        period_filter.value = "all"
+        contestant_filter.disabled = True
+        apply_filters()
 
-    # Start Polling
-    threading.Thread(target=poll_logs, daemon=True).start()
+    filter_row = ft.Row([
+        ft.Icon(ft.Icons.FILTER_LIST, color="grey"),
+        action_filter, user_filter, event_filter, contestant_filter, period_filter,
+        ft.TextButton("Clear", icon=ft.Icons.CLEAR, on_click=clear_filters),
+    ], wrap=True, spacing=10)
 
     # Cleanup when leaving
     def stop_polling(e):
-        nonlocal is_active
-        is_active = False
+        live.stop()
         if on_back_click:
             on_back_click(e)
 
@@ -127,24 +203,12 @@ def AuditLogView(page: ft.Page, on_back_click=None):
             controls=[
                 header_row,
                 ft.Divider(height=20, color="transparent"),
+                filter_row,
+                ft.Divider(height=10, color="transparent"),
                 
                 # The "Card" Container for the Table
                 ft.Container(
-                    content=ft.Column(
-                        controls=[
-                            # Wrap DataTable in Row for Horizontal Scroll
-                            ft.Row(
-                                controls=[data_table], 
-                                scroll=ft.ScrollMode.ADAPTIVE, 
-                                vertical_alignment=ft.CrossAxisAlignment.START,
-                                # Ensure the Row fills width if table is smaller
-                                alignment=ft.MainAxisAlignment.START 
-                            )
-                        ], 
-                        # Enable Vertical Scroll for the Column
-                        scroll=ft.ScrollMode.ADAPTIVE, 
-                        expand=True
-                    ),
+                    content=ft.Column(controls=[header_bar, log_list], spacing=0, expand=True),
                     
                     bgcolor="white",
                     padding=0,
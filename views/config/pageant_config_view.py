@@ -1,13 +1,13 @@
 import flet as ft
-import shutil
 import os
-import time
+import shutil
 from services.pageant_service import PageantService
 from services.event_service import EventService
 from services.contestant_service import ContestantService
 from services.admin_service import AdminService
-from services.export_service import ExportService
+from services.export_jobs import export_jobs
 from core.database import SessionLocal
+from core.images import process_upload, image_url
 from models.all_models import Segment, Criteria, Event
 from components.dialogs import show_about_dialog, show_contact_dialog
 import datetime
@@ -19,7 +19,6 @@ def PageantConfigView(page: ft.Page, event_id: int):
     event_service = EventService()
     contestant_service = ContestantService()
     admin_service = AdminService()
-    export_service = ExportService()
 
     # --- FETCH EVENT DETAILS FOR HEADER ---
     db = SessionLocal()
@@ -530,12 +529,10 @@ def PageantConfigView(page: ft.Page, event_id: int):
         nonlocal uploaded_file_path
         if e.files:
             try:
-                os.makedirs("assets/uploads", exist_ok=True)
                 file_obj = e.files[0]
-                safe_name = f"img_{int(time.time())}_{file_obj.name}"
-                shutil.copy(file_obj.path, os.path.join("assets/uploads", safe_name))
-                uploaded_file_path = f"uploads/{safe_name}"
-                img_preview.src = uploaded_file_path
+                # Resized copies for every display size (metadata stripped), named by content hash
+                uploaded_file_path = process_upload(file_obj.path)
+                img_preview.src = image_url(uploaded_file_path, "thumb")
                 img_preview.visible = True
                 img_preview.update()
             except Exception as ex: page.open(ft.SnackBar(ft.Text(f"Error: {ex}"), bgcolor="red"))
@@ -558,7 +555,7 @@ def PageantConfigView(page: ft.Page, event_id: int):
     contestant_dialog = ft.AlertDialog(title=ft.Text("Contestant"), content=ft.Column([ft.Row([c_number, c_gender]), c_name, ft.Row([upload_btn, img_preview])], height=250, width=300), actions=[ft.TextButton("Save", on_click=save_contestant)])
     
     def open_add_c_dialog(e): nonlocal editing_contestant_id, uploaded_file_path; editing_contestant_id=None; uploaded_file_path=None; c_number.value=""; c_name.value=""; img_preview.visible=False; page.open(contestant_dialog)
-    def open_edit_c_dialog(e): nonlocal editing_contestant_id, uploaded_file_path; d=e.control.data; editing_contestant_id=d.id; uploaded_file_path=d.image_path; c_number.value=str(d.candidate_number); c_name.value=d.name; c_gender.value=d.gender; img_preview.src=d.image_path if d.image_path else ""; img_preview.visible=bool(d.image_path); page.open(contestant_dialog)
+    def open_edit_c_dialog(e): nonlocal editing_contestant_id, uploaded_file_path; d=e.control.data; editing_contestant_id=d.id; uploaded_file_path=d.image_path; c_number.value=str(d.candidate_number); c_name.value=d.name; c_gender.value=d.gender; img_preview.src=image_url(d.image_path, "thumb") if d.image_path else ""; img_preview.visible=bool(d.image_path); page.open(contestant_dialog)
     def delete_contestant(e): contestant_service.delete_contestant(e.control.data); refresh_contestant_tab()
 
     def refresh_contestant_tab():
@@ -582,7 +579,7 @@ def PageantConfigView(page: ft.Page, event_id: int):
             list_items = []
             for c in items:
                 avatar = ft.CircleAvatar(
-                    foreground_image_src=c.image_path if c.image_path else "",
+                    foreground_image_src=image_url(c.image_path, "avatar") if c.image_path else "",
                     content=ft.Text(c.name[0]) if not c.image_path else None,
                     bgcolor=color,
                     radius=20
@@ -703,67 +700,44 @@ def PageantConfigView(page: ft.Page, event_id: int):
     # 1. FILE PICKER CALLBACK
     def on_export_result(e: ft.FilePickerResultEvent):
         # We need to know which format was requested (stored in pending_export_type)
-        if e.path:
-            save_path = e.path
-            
-            # Fetch data needed for export
-            db = SessionLocal()
-            ev = db.query(Event).get(event_id)
-            event_name = ev.name if ev else "Event"
-            db.close()
-            
-            # DETERMINE DATA & MODE
-            if selected_export_scope == "overall":
-                data = pageant_service.get_overall_breakdown(event_id)
-                mode = "overall"
-                doc_title = "OFFICIAL OVERALL STANDINGS"
-            else:
-                # It's a segment ID
-                try:
-                    seg_id = int(selected_export_scope)
-                    data = pageant_service.get_segment_tabulation(event_id, seg_id)
-                    mode = "segment"
-                    
-                    # Fetch Segment Name for Title
-                    db = SessionLocal()
-                    seg = db.query(Segment).get(seg_id)
-                    seg_name = seg.name.upper() if seg else "SEGMENT"
-                    db.close()
-                    
-                    doc_title = f"OFFICIAL RESULTS: {seg_name}"
-                except ValueError:
-                    page.open(ft.SnackBar(ft.Text("Invalid selection"), bgcolor="red"))
-                    return
-
-            success = False
-            
+        if not e.path:
+            return
+        save_path = e.path
+        if selected_export_scope == "raw" and pending_export_type != "xlsx":
+            page.open(ft.SnackBar(ft.Text("Raw scores can only be exported to Excel."), bgcolor="red"))
+            return
+
+        # The file is built on a worker thread (services/export_jobs.py); this dialog
+        # shows its progress while the admin keeps working. Unchanged data is served from cache.
+        progress_bar = ft.ProgressBar(width=300, value=0)
+        progress_text = ft.Text("Queued...", size=12, color="grey")
+        progress_dlg = ft.AlertDialog(
+            modal=False,
+            title=ft.Text("Exporting Results"),
+            content=ft.Column([progress_bar, progress_text], tight=True),
+            actions=[ft.TextButton("Hide", on_click=lambda e: page.close(progress_dlg))]
+        )
+
+        def on_progress(fraction, message):
+            progress_bar.value = fraction
+            progress_text.value = message
+            if progress_bar.page:
+                progress_bar.update(); progress_text.update()
+
+        def on_done(future):
+            page.close(progress_dlg)
             try:
-                if pending_export_type == "xlsx":
-                    success = export_service.generate_excel(
-                        filepath=save_path,
-                        event_name=event_name,
-                        title=doc_title,
-                        data_matrix=data,
-                        mode=mode
-                    )
-                elif pending_export_type == "pdf":
-                    success = export_service.generate_pdf(
-                        filepath=save_path,
-                        event_name=event_name,
-                        title=doc_title,
-                        data_matrix=data,
-                        mode=mode
-                    )
-                
-                if success:
-                    page.open(ft.SnackBar(ft.Text(f"Saved to: {save_path}"), bgcolor="green"))
-                    # Try to open the file (Desktop only feature, but harmless on mobile)
-                    try: os.startfile(save_path)
-                    except: pass
-                else:
-                    page.open(ft.SnackBar(ft.Text("Export failed."), bgcolor="red"))
+                shutil.copyfile(future.result(), save_path)
+                page.open(ft.SnackBar(ft.Text(f"Saved to: {save_path}"), bgcolor="green"))
+                # Try to open the file (Desktop only feature, but harmless on mobile)
+                try: os.startfile(save_path)
+                except: pass
             except Exception as ex:
-                page.open(ft.SnackBar(ft.Text(f"Error: {ex}"), bgcolor="red"))
+                page.open(ft.SnackBar(ft.Text(f"Export failed: {ex}"), bgcolor="red"))
+            page.update()
+
+        page.open(progress_dlg)
+        export_jobs.submit(event_id, selected_export_scope, pending_export_type, on_progress=on_progress).add_done_callback(on_done)
 
     # 2. INIT PICKER
     export_picker = ft.FilePicker(on_result=on_export_result)
@@ -817,6 +791,7 @@ def PageantConfigView(page: ft.Page, event_id: int):
         opts = [ft.dropdown.Option("overall", "Overall Summary (Segments as Columns)")]
         for s in segments:
             opts.append(ft.dropdown.Option(str(s.id), f"{s.name} (Judges as Columns)"))
+        opts.append(ft.dropdown.Option("raw", "All Raw Scores (Excel only, one row per score)"))
             
         export_scope_dd.options = opts
         export_scope_dd.value = "overall"
@@ -1,14 +1,17 @@
 import flet as ft
-import threading
 import time
 from services.quiz_service import QuizService
 from services.contestant_service import ContestantService
 from services.admin_service import AdminService
 from services.event_service import EventService
+from services.quiz_scoreboard import quiz_scoreboard
+from services.tabulation_service import notify_event_changed
+from core.event_bus import event_topic
 from core.database import SessionLocal
 from models.all_models import Segment, Contestant, User, Score, Event
 from sqlalchemy import func
 from components.dialogs import show_about_dialog, show_contact_dialog
+from components.live_updates import LiveView
 import itertools 
 
 def QuizConfigView(page: ft.Page, event_id: int):
@@ -31,7 +34,6 @@ def QuizConfigView(page: ft.Page, event_id: int):
 
     editing_round_id = None 
     editing_contestant_id = None 
-    is_polling = False
     
     # Global component references
     eval_btn_ref = ft.Ref[ft.ElevatedButton]()
@@ -453,6 +455,7 @@ def QuizConfigView(page: ft.Page, event_id: int):
                     ft.Text(f"Round: {active_seg.name if active_seg else 'None'}", color="grey", size=12)
                 ], spacing=2), 
                 # REMOVED CHIP HERE
+                ft.IconButton(icon=ft.Icons.REFRESH, tooltip="Recount scores from the database", on_click=lambda e: recount_scores(), visible=not is_read_only),
             ], alignment="spaceBetween"),
             warning_msg, 
             table_card, 
@@ -471,6 +474,10 @@ def QuizConfigView(page: ft.Page, event_id: int):
         db.close(); page.update()
 
     # ... (Rest of logic remains the same)
+
+    def recount_scores():
+        success, msg = quiz_service.recount_scores(event_id)
+        page.open(ft.SnackBar(ft.Text(msg), bgcolor="green" if success else "red")); refresh_tabulation_tab()
     
     def toggle_round_from_control(seg_id):
         active_seg = event_service.get_active_segment(event_id)
@@ -480,7 +487,7 @@ def QuizConfigView(page: ft.Page, event_id: int):
 
     def add_clincher_question(seg_id):
         db = SessionLocal(); seg = db.query(Segment).get(seg_id)
-        if seg: seg.total_questions += 1; db.commit(); page.open(ft.SnackBar(ft.Text("Question Added!"), bgcolor="green")); refresh_tabulation_tab()
+        if seg: seg.total_questions += 1; db.commit(); notify_event_changed(event_id); page.open(ft.SnackBar(ft.Text("Question Added!"), bgcolor="green")); refresh_tabulation_tab()
         db.close()
 
     def evaluate_round(is_ready):
@@ -612,6 +619,8 @@ def QuizConfigView(page: ft.Page, event_id: int):
             for p_id in tied_ids:
                 db.add(Score(contestant_id=p_id, segment_id=clincher_id, judge_id=current_admin_id, question_number=1, score_value=0, is_correct=False)) 
             db.commit()
+            for p_id in tied_ids:
+                quiz_scoreboard.record_answer(event_id, p_id, clincher_id, 1, 0)
             
             event_service.set_active_segment(event_id, clincher_id)
             page.open(ft.SnackBar(ft.Text(f"Clincher Created: {new_name}"), bgcolor="orange"))
@@ -624,13 +633,8 @@ def QuizConfigView(page: ft.Page, event_id: int):
         if success: page.open(ft.SnackBar(ft.Text(msg), bgcolor="green")); refresh_tabulation_tab()
         else: page.open(ft.SnackBar(ft.Text(msg), bgcolor="red"))
 
-    # --- AUTO REFRESH ---
-    def poll_updates():
-        while is_polling:
-            if page: 
-                try: refresh_tabulation_tab()
-                except: break
-            time.sleep(3)
+    # --- AUTO REFRESH (Pushed on every answer/round change of this event) ---
+    live = LiveView(page, refresh_tabulation_tab)
 
     main_tabs = ft.Tabs(
         tabs=[
@@ -645,11 +649,9 @@ def QuizConfigView(page: ft.Page, event_id: int):
         unselected_label_color="grey"
     )
     def load_tab(idx):
-        nonlocal is_polling
-        is_polling = (idx == 2)
-        if is_polling: 
-            if not any(t.daemon and t.is_alive() for t in threading.enumerate() if t.name == "QuizPoll"):
-                 threading.Thread(target=poll_updates, daemon=True, name="QuizPoll").start()
+        live.unwatch_all()
+        if idx == 2: 
+            live.watch(event_topic(event_id))
             refresh_tabulation_tab()
         elif idx==0: refresh_config_tab()
         elif idx==1: refresh_c_tab()
@@ -6,6 +6,9 @@ import time, threading
 from datetime import datetime
 # IMPORT SHARED DIALOGS
 from components.dialogs import show_about_dialog, show_contact_dialog
+from components.live_updates import LiveView
+from core.event_bus import event_topic, STRUCTURE
+from core.images import image_url
 
 def JudgeView(page: ft.Page, on_logout_callback):
     # Services
@@ -17,10 +20,11 @@ def JudgeView(page: ft.Page, on_logout_callback):
     judge_name = page.session.get("user_name")
     current_event = None; selected_segment = None; cards_registry = {}
     
-    # We store the generated UI cards here so they persist when switching tabs
-    cached_cards_ui = {'Male': [], 'Female': []} 
+    # Scoring cards are built in batches of this size as the judge scrolls
+    CARD_BATCH = 8
+    CARD_WIDTH = 450; CARD_SPACING = 20
 
-    is_polling = False; last_check_text = ft.Text("Initializing...", size=12, color="grey")
+    last_check_text = ft.Text("Initializing...", size=12, color="grey")
     main_container = ft.Container(expand=True, padding=10,
                                                   gradient=ft.LinearGradient(
                     begin=ft.alignment.top_left,
@@ -29,27 +33,26 @@ def JudgeView(page: ft.Page, on_logout_callback):
                 ))
 
     # ---------------------------------------------------------
-    # POLLING
+    # LIVE UPDATES (Pushed when the event's structure changes)
     # ---------------------------------------------------------
-    def start_polling():
-        nonlocal is_polling; 
-        if is_polling: return 
-        is_polling = True; threading.Thread(target=poll_active_segment, daemon=True).start()
-    def stop_polling(): nonlocal is_polling; is_polling = False
-    def poll_active_segment():
-        while is_polling and current_event:
-            try:
-                active_seg_db = pageant_service.get_active_segment(current_event.id)
-                try: new_seg_id = active_seg_db.id if active_seg_db else None
-                except: new_seg_id = None
-                current_seg_id = selected_segment['segment'].id if selected_segment else None
-                if last_check_text.page:
-                    now = datetime.now().strftime("%H:%M:%S"); last_check_text.value = f"Last checked: {now}"; last_check_text.update()
-                if new_seg_id != current_seg_id:
-                    if page.dialog and page.dialog.open: page.close(page.dialog)
-                    enter_scoring_dashboard(current_event)
-            except: pass
-            time.sleep(2)
+    def start_listening():
+        live.unwatch_all()
+        if current_event: live.watch(event_topic(current_event.id), kinds={STRUCTURE})
+    def stop_listening(): live.unwatch_all()
+    def check_active_segment():
+        if not current_event: return
+        try:
+            active_seg_db = pageant_service.get_active_segment(current_event.id)
+            try: new_seg_id = active_seg_db.id if active_seg_db else None
+            except: new_seg_id = None
+            current_seg_id = selected_segment['segment'].id if selected_segment else None
+            if last_check_text.page:
+                now = datetime.now().strftime("%H:%M:%S"); last_check_text.value = f"Last update: {now}"; last_check_text.update()
+            if new_seg_id != current_seg_id:
+                if page.dialog and page.dialog.open: page.close(page.dialog)
+                enter_scoring_dashboard(current_event)
+        except: pass
+    live = LiveView(page, check_active_segment)
 
     # ---------------------------------------------------------
     # IMAGE POPUP LOGIC (NEW)
@@ -77,7 +80,7 @@ def JudgeView(page: ft.Page, on_logout_callback):
     # HEADER & SUBMIT
     # ---------------------------------------------------------
     def show_waiting_room(title, msg):
-        start_polling() 
+        start_listening() 
         # Disable the submit button when in waiting room
         submit_all_btn.disabled = True
         if submit_all_btn.page: submit_all_btn.update()
@@ -88,10 +91,10 @@ def JudgeView(page: ft.Page, on_logout_callback):
     def submit_final_scores(e):
         missing = []; unlocked = []
         # Check ALL items in registry (which now includes both genders at all times)
+        # Reads the card states, so cards that were never scrolled into view are checked too
         for c_id, card_data in cards_registry.items():
-            for ref in card_data['inputs'].values():
-                if not ref['field'].value: missing.append(f"{card_data['info']['name']}"); break 
-            if not card_data['get_locked_status'](): unlocked.append(f"{card_data['info']['name']}")
+            if any(not value for value in card_data['values'].values()): missing.append(f"{card_data['info']['name']}")
+            if not card_data['locked']: unlocked.append(f"{card_data['info']['name']}")
         
         errs = []
         if missing: errs.append(ft.Text("Missing scores:", color="red", weight="bold")); errs.extend([ft.Text(f"• {m}") for m in missing[:3]])
@@ -133,7 +136,7 @@ def JudgeView(page: ft.Page, on_logout_callback):
                 ft.TextButton("Contact", style=ft.ButtonStyle(color=ft.Colors.WHITE), on_click=lambda e: show_contact_dialog(page)),
                 ft.VerticalDivider(width=10, color="white24"),
                 submit_all_btn,
-                ft.IconButton(icon=ft.Icons.LOGOUT, icon_color="white", on_click=on_logout_callback)
+                ft.IconButton(icon=ft.Icons.LOGOUT, icon_color="white", on_click=lambda e: (live.stop(), on_logout_callback(e)))
             ])
         ], alignment="spaceBetween"),
         padding=15, bgcolor=ft.Colors.BLUE_800
@@ -143,7 +146,7 @@ def JudgeView(page: ft.Page, on_logout_callback):
     # MAIN LOGIC (Event Load, Dashboard)
     # ---------------------------------------------------------
     def load_event_selector():
-        stop_polling()
+        stop_listening()
         submit_all_btn.disabled = True; submit_all_btn.update() if submit_all_btn.page else None
         events = event_service.get_judge_events(judge_id)
         if not events: main_container.content = ft.Column([ft.Icon(ft.Icons.EVENT_BUSY, size=60, color="grey"), ft.Text("No active events found.", size=20, color="grey"), ft.ElevatedButton("Refresh", on_click=lambda e: load_event_selector())], alignment="center", horizontal_alignment="center"); page.update(); return
@@ -166,7 +169,7 @@ def JudgeView(page: ft.Page, on_logout_callback):
         if target_struct: 
             selected_segment = target_struct
             render_dashboard(target_struct)
-            start_polling()
+            start_listening()
             submit_all_btn.disabled = False
             submit_all_btn.update()
         else: 
@@ -189,9 +192,12 @@ def JudgeView(page: ft.Page, on_logout_callback):
         content_area = ft.Container(expand=True)
 
         # Helper to create card (MOVED UP to prevent UnboundLocalError)
-        def create_scoring_card(contestant, existing_scores, structure):
+        # Builds the UI for one contestant from its entry in cards_registry. Typed values
+        # and the lock live in the entry, so a card can be dropped and rebuilt at any time.
+        def create_scoring_card(contestant_id, structure):
+            entry = cards_registry[contestant_id]; contestant = entry['contestant']
             border_col = ft.Colors.BLUE_200 if contestant.gender == "Male" else ft.Colors.PINK_200
-            inputs_column = ft.Column(spacing=5); local_inputs = {}; is_locked = False
+            inputs_column = ft.Column(spacing=5); local_inputs = {}
             
             def revert_btn_state(btn):
                 # FIX: Check if button is still on page before reverting
@@ -200,20 +206,27 @@ def JudgeView(page: ft.Page, on_logout_callback):
                     btn.content = ft.Text("Lock & Save", color="white")
                     btn.update()
 
+            def show_locked(btn):
+                btn.bgcolor = ft.Colors.ORANGE; btn.content = ft.Row([ft.Icon(ft.Icons.LOCK, color="white", size=16), ft.Text("Unlock", color="white")], alignment="center")
+
             def toggle_lock(e):
-                nonlocal is_locked; btn = e.control
-                if not is_locked:
-                    btn.content = ft.ProgressRing(width=16, height=16, stroke_width=2, color="white"); btn.disabled = True; page.update(); valid = True
+                btn = e.control
+                if not entry['locked']:
+                    btn.content = ft.ProgressRing(width=16, height=16, stroke_width=2, color="white"); btn.disabled = True; page.update(); valid = True; card_scores = {}
                     for crit_id, ref in local_inputs.items():
                         val_str = ref['field'].value; 
                         if not val_str: valid=False; ref['field'].border_color="red"; continue
                         try: val = float(val_str); 
                         except: valid=False; ref['field'].border_color="red"; continue
                         if val < 0 or val > ref['max']: valid=False; ref['field'].border_color="red"
-                        else: ref['field'].border_color="green"; pageant_service.submit_score(judge_id, contestant.id, crit_id, val)
+                        else: ref['field'].border_color="green"; card_scores[crit_id] = val
+                    # Whole card in one transaction
+                    if card_scores:
+                        saved, _ = pageant_service.submit_scores_bulk(judge_id, contestant.id, card_scores)
+                        if not saved: valid = False
                     btn.disabled = False
                     if valid: 
-                        is_locked = True; btn.bgcolor = ft.Colors.ORANGE; btn.content = ft.Row([ft.Icon(ft.Icons.LOCK, color="white", size=16), ft.Text("Unlock", color="white")], alignment="center")
+                        entry['locked'] = True; show_locked(btn)
                         # FIX: Loop properly and check if page exists for fields
                         for ref in local_inputs.values():
                             ref['field'].read_only = True
@@ -223,7 +236,7 @@ def JudgeView(page: ft.Page, on_logout_callback):
                         # FIX: Use safe revert function
                         threading.Thread(target=lambda: (time.sleep(2), revert_btn_state(btn))).start()
                 else: 
-                    is_locked = False; btn.bgcolor = ft.Colors.BLUE; btn.content = ft.Text("Lock & Save", color="white")
+                    entry['locked'] = False; btn.bgcolor = ft.Colors.BLUE; btn.content = ft.Text("Lock & Save", color="white")
                     # FIX: Loop properly and check if page exists
                     for ref in local_inputs.values():
                         ref['field'].read_only = False
@@ -231,9 +244,10 @@ def JudgeView(page: ft.Page, on_logout_callback):
                 
                 if btn.page: btn.update()
 
-            def on_input_change(e):
-                if not is_locked: 
-                    btn = cards_registry[contestant.id]['btn']
+            def on_input_change(e, crit_id):
+                entry['values'][crit_id] = e.control.value
+                if not entry['locked']: 
+                    btn = save_btn
                     if btn.bgcolor != ft.Colors.BLUE: 
                         btn.bgcolor = ft.Colors.BLUE
                         btn.content = ft.Text("Lock & Save", color="white")
@@ -241,19 +255,17 @@ def JudgeView(page: ft.Page, on_logout_callback):
                         if btn.page: btn.update()
 
             for crit in structure['criteria']:
-                val = existing_scores.get(crit.id, ""); tf = ft.TextField(value=str(val) if val!="" else "", width=70, height=30, text_size=14, content_padding=5, text_align="center", on_change=on_input_change)
+                tf = ft.TextField(value=entry['values'].get(crit.id, ""), width=70, height=30, text_size=14, content_padding=5, text_align="center", read_only=entry['locked'], on_change=lambda e, crit_id=crit.id: on_input_change(e, crit_id))
                 local_inputs[crit.id] = {"field": tf, "max": crit.max_score}
                 inputs_column.controls.append(ft.Row([ft.Text(crit.name, size=14, weight="bold", expand=True, max_lines=1, overflow=ft.TextOverflow.ELLIPSIS), ft.Text(f"/{int(crit.max_score)} ({int(crit.weight*100)}%)", size=11, color="grey"), tf], alignment="spaceBetween"))
 
             save_btn = ft.ElevatedButton(content=ft.Text("Lock & Save", color="white", size=14), bgcolor=ft.Colors.BLUE, width=float("inf"), height=40, on_click=toggle_lock)
+            if entry['locked']: show_locked(save_btn)
             
-            # REGISTER THE CARD LOGIC IMMEDIATELY
-            cards_registry[contestant.id] = {'btn': save_btn, 'inputs': local_inputs, 'info': {'name': contestant.name, 'gender': contestant.gender}, 'get_locked_status': lambda: is_locked}
-            
-            img_content = ft.Image(src=contestant.image_path, fit=ft.ImageFit.COVER, error_content=ft.Icon(ft.Icons.BROKEN_IMAGE, size=40)) if contestant.image_path else ft.Column([ft.Icon(ft.Icons.IMAGE_NOT_SUPPORTED, size=50, color="grey"), ft.Text("No Img", color="grey", size=12)], alignment="center", spacing=2)
+            img_content = ft.Image(src=image_url(contestant.image_path, "card"), fit=ft.ImageFit.COVER, error_content=ft.Icon(ft.Icons.BROKEN_IMAGE, size=40)) if contestant.image_path else ft.Column([ft.Icon(ft.Icons.IMAGE_NOT_SUPPORTED, size=50, color="grey"), ft.Text("No Img", color="grey", size=12)], alignment="center", spacing=2)
 
             return ft.Container(
-                width=450, 
+                width=CARD_WIDTH, 
                 bgcolor="white", 
                 border=ft.border.all(1, border_col), 
                 border_radius=10, 
@@ -270,7 +282,7 @@ def JudgeView(page: ft.Page, on_logout_callback):
                         content=img_content,
                         ink=True, # Ripple Effect
                         tooltip="Click to enlarge" if contestant.image_path else None,
-                        on_click=lambda e: show_enlarged_image(contestant.image_path) if contestant.image_path else None
+                        on_click=lambda e: show_enlarged_image(image_url(contestant.image_path, "preview")) if contestant.image_path else None
                     ), 
                     ft.Container(expand=True, content=ft.Column([
                         ft.Row([ft.Container(content=ft.Text(f"#{contestant.candidate_number}", weight="bold", color="white", size=16), bgcolor="black", padding=5, border_radius=4), ft.Text(contestant.name, weight="bold", size=16, expand=True, max_lines=2, overflow=ft.TextOverflow.ELLIPSIS)], alignment="start", vertical_alignment="start"), 
@@ -282,41 +294,79 @@ def JudgeView(page: ft.Page, on_logout_callback):
                 ], alignment="start", vertical_alignment="start")
             )
 
-        # Generate ALL cards ONCE at the start
+        # Register EVERY contestant's card state up front (cheap: plain data, no controls).
         # This ensures 'cards_registry' is populated with everyone, so values persist across tabs
-        # and validation checks everyone.
+        # and validation checks everyone. The card UIs are built lazily by card_list().
         cards_registry.clear()
-        cached_cards_ui['Male'] = []
-        cached_cards_ui['Female'] = []
+        card_ids = {'Male': [], 'Female': []}
         
         candidates = contestant_service.get_contestants(current_event.id, active_only=True)
+        # Every saved score of this judge in the segment, fetched once for all cards
+        segment_scores = pageant_service.get_judge_scores_for_segment(judge_id, structure_item['segment'].id)
         
         for c in candidates:
-            # Create the card and store it in cache
-            card = create_scoring_card(c, pageant_service.get_judge_scores(judge_id, c.id), structure_item)
-            if c.gender == "Male":
-                cached_cards_ui['Male'].append(card)
-            elif c.gender == "Female":
-                cached_cards_ui['Female'].append(card)
+            existing_scores = segment_scores.get(c.id, {})
+            cards_registry[c.id] = {
+                'contestant': c,
+                'info': {'name': c.name, 'gender': c.gender},
+                'values': {crit.id: str(existing_scores[crit.id]) if crit.id in existing_scores else "" for crit in structure_item['criteria']},
+                'locked': False,
+            }
+            if c.gender in card_ids:
+                card_ids[c.gender].append(c.id)
+
+        # Height of one card: the photo, or name + criteria rows + button if taller, plus padding
+        card_height = 20 + max(180, 104 + 35 * len(structure_item['criteria']))
+
+        def card_list(contestant_ids, header=None, grid=False):
+            # Virtualized list (or grid): Flutter only lays out visible cards, and cards are
+            # built CARD_BATCH at a time as the judge scrolls near the end. The first load
+            # fills the screen, since a list that does not overflow never fires on_scroll.
+            if grid:
+                # As many columns as full cards fit the width, like a wrapping row of cards
+                width = (page.width or 1200) - 20
+                columns = max(1, int((width + CARD_SPACING) // (CARD_WIDTH + CARD_SPACING)))
+                tile_width = (width - CARD_SPACING * (columns - 1)) / columns
+                view = ft.GridView(expand=True, max_extent=int(tile_width) + 1, child_aspect_ratio=tile_width / card_height,
+                                   spacing=CARD_SPACING, run_spacing=CARD_SPACING, padding=ft.padding.only(bottom=20), on_scroll_interval=100)
+            else:
+                columns = 1
+                view = ft.ListView(expand=True, spacing=15, padding=ft.padding.only(bottom=20), on_scroll_interval=100)
+                if header: view.controls.append(ft.Row([header], alignment="center"))
+            loaded = {'count': 0}
+
+            def load_more(count):
+                batch = contestant_ids[loaded['count']:loaded['count'] + count]
+                loaded['count'] += len(batch)
+                if grid:
+                    view.controls.extend(ft.Container(content=create_scoring_card(c_id, structure_item), alignment=ft.alignment.top_center) for c_id in batch)
+                else:
+                    view.controls.extend(ft.Row([create_scoring_card(c_id, structure_item)], alignment="center") for c_id in batch)
+
+            def on_scroll(e):
+                if loaded['count'] < len(contestant_ids) and e.pixels >= e.max_scroll_extent - e.viewport_dimension:
+                    load_more(CARD_BATCH); view.update()
+
+            view.on_scroll = on_scroll
+            if page.height:
+                visible_rows = int(page.height // (card_height + CARD_SPACING)) + 2
+                load_more(max(CARD_BATCH, visible_rows * columns))
+            else:
+                load_more(len(contestant_ids))  # Screen size unknown: build them all
+            return view
 
         def switch_view(tab_index):
-            # This function just shuffles the PRE-CREATED cards into the view
+            # Builds fresh lists from the registered card states
             if tab_index == 0: 
-                col_male = ft.Column(
-                    controls=[ft.Container(content=ft.Text("Male Candidates", weight="bold", color="blue"), bgcolor=ft.Colors.BLUE_50, padding=10, border_radius=5, alignment=ft.alignment.center, width=380)] + cached_cards_ui['Male'], 
-                    expand=True, scroll="hidden", spacing=15, horizontal_alignment=ft.CrossAxisAlignment.CENTER
-                )
-                col_female = ft.Column(
-                    controls=[ft.Container(content=ft.Text("Female Candidates", weight="bold", color="pink"), bgcolor=ft.Colors.PINK_50, padding=10, border_radius=5, alignment=ft.alignment.center, width=380)] + cached_cards_ui['Female'], 
-                    expand=True, scroll="hidden", spacing=15, horizontal_alignment=ft.CrossAxisAlignment.CENTER
-                )
+                col_male = card_list(card_ids['Male'], ft.Container(content=ft.Text("Male Candidates", weight="bold", color="blue"), bgcolor=ft.Colors.BLUE_50, padding=10, border_radius=5, alignment=ft.alignment.center, width=380))
+                col_female = card_list(card_ids['Female'], ft.Container(content=ft.Text("Female Candidates", weight="bold", color="pink"), bgcolor=ft.Colors.PINK_50, padding=10, border_radius=5, alignment=ft.alignment.center, width=380))
                 content_area.content = ft.Row(controls=[col_male, ft.VerticalDivider(width=1, color="grey"), col_female], expand=True)
             else: 
-                target_cards = cached_cards_ui['Female'] if tab_index == 1 else cached_cards_ui['Male']
-                if not target_cards: 
+                target_ids = card_ids['Female'] if tab_index == 1 else card_ids['Male']
+                if not target_ids: 
                     content_area.content = ft.Column([ft.Icon(ft.Icons.SEARCH_OFF, size=50, color="grey"), ft.Text("No candidates found.", color="grey")], alignment="center", horizontal_alignment="center", expand=True)
                 else: 
-                    content_area.content = ft.Column([ft.Row(controls=target_cards, wrap=True, alignment="center", spacing=20)], scroll="adaptive", expand=True)
+                    content_area.content = card_list(target_ids, grid=True)
             page.update()
         
         switch_view(0)
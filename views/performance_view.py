@@ -0,0 +1,133 @@
+import flet as ft
+import time
+from core.instrumentation import service_stats
+from core.database import pool_status
+
+def PerformanceView(page: ft.Page, on_back_click=None):
+    """Admin-only table of per-service-method query counts and latency percentiles, plus connection pool health."""
+
+    data_table = ft.DataTable(
+        columns=[
+            ft.DataColumn(ft.Text("Service Method", color="white", weight="bold")),
+            ft.DataColumn(ft.Text("Calls", color="white", weight="bold"), numeric=True),
+            ft.DataColumn(ft.Text("p50 ms", color="white", weight="bold"), numeric=True),
+            ft.DataColumn(ft.Text("p95 ms", color="white", weight="bold"), numeric=True),
+            ft.DataColumn(ft.Text("p99 ms", color="white", weight="bold"), numeric=True),
+            ft.DataColumn(ft.Text("Avg Queries", color="white", weight="bold"), numeric=True),
+            ft.DataColumn(ft.Text("Max Queries", color="white", weight="bold"), numeric=True),
+            ft.DataColumn(ft.Text("Avg Rows", color="white", weight="bold"), numeric=True),
+            ft.DataColumn(ft.Text("Errors", color="white", weight="bold"), numeric=True),
+        ],
+        rows=[],
+        heading_row_color="#64AEFF",
+        heading_row_height=50,
+        column_spacing=20,
+        vertical_lines=ft.border.BorderSide(1, "#F0F0F0"),
+        horizontal_lines=ft.border.BorderSide(1, "#F0F0F0"),
+        border_radius=10,
+    )
+
+    last_updated_text = ft.Text("Loading...", size=12, color="grey", italic=True)
+    pool_row = ft.Row(wrap=True, spacing=15)
+
+    def pool_card(label, value, alert=False):
+        return ft.Container(
+            content=ft.Column([
+                ft.Text(label, size=12, color="grey"),
+                ft.Text(str(value), size=20, weight="bold", color=ft.Colors.RED_700 if alert else "#1A1A1A"),
+            ], spacing=2),
+            padding=15, width=150, bgcolor="white", border_radius=10,
+            border=ft.border.all(1, "#E0E0E0")
+        )
+
+    def build_pool_cards():
+        pool = pool_status()
+        if "status" in pool:
+            pool_row.controls = [ft.Text(pool["status"], size=12, color="grey")]
+            return
+        pool_row.controls = [
+            pool_card("Checked Out", f"{pool['checked_out']} / {pool['size'] + pool['max_overflow']}",
+                      alert=pool['checked_out'] >= pool['size'] + pool['max_overflow']),
+            pool_card("Idle", pool['idle']),
+            pool_card("Overflow In Use", f"{pool['overflow']} / {pool['max_overflow']}"),
+            pool_card("Waits", pool['waits'], alert=pool['waits'] > 0),
+            pool_card("Avg Wait ms", pool['avg_wait_ms']),
+            pool_card("Max Wait ms", pool['max_wait_ms']),
+            pool_card("Timeouts", pool['timeouts'], alert=pool['timeouts'] > 0),
+        ]
+
+    def build_rows():
+        new_rows = []
+        for i, r in enumerate(service_stats.snapshot()):
+            # Highlight likely N+1 offenders
+            query_color = ft.Colors.RED_700 if r['max_queries'] > 10 else ft.Colors.BLACK87
+            new_rows.append(ft.DataRow(
+                color="#F9FAFB" if i % 2 == 0 else "white",
+                cells=[
+                    ft.DataCell(ft.Text(r['method'], weight="bold", size=12)),
+                    ft.DataCell(ft.Text(str(r['calls']), size=12)),
+                    ft.DataCell(ft.Text(str(r['p50_ms']), size=12)),
+                    ft.DataCell(ft.Text(str(r['p95_ms']), size=12)),
+                    ft.DataCell(ft.Text(str(r['p99_ms']), size=12)),
+                    ft.DataCell(ft.Text(str(r['avg_queries']), size=12, color=query_color)),
+                    ft.DataCell(ft.Text(str(r['max_queries']), size=12, color=query_color)),
+                    ft.DataCell(ft.Text(str(r['avg_rows']), size=12)),
+                    ft.DataCell(ft.Text(str(r['errors']), size=12, color=ft.Colors.RED_700 if r['errors'] else "grey")),
+                ]
+            ))
+        data_table.rows = new_rows
+        last_updated_text.value = f"Snapshot at: {time.strftime('%H:%M:%S')} (since app start or last reset)"
+
+    def load_stats(e=None):
+        build_rows()
+        build_pool_cards()
+        page.update()
+
+    def reset_stats(e):
+        service_stats.reset()
+        load_stats()
+
+    header_row = ft.Row(
+        controls=[
+            ft.IconButton(icon=ft.Icons.ARROW_BACK, icon_size=30, on_click=on_back_click),
+            ft.Column([
+                ft.Text("Service Performance", size=24, weight="bold", color="#1A1A1A"),
+                last_updated_text
+            ], spacing=2, expand=True),
+            ft.OutlinedButton("Refresh", icon=ft.Icons.REFRESH, on_click=load_stats),
+            ft.OutlinedButton("Reset", icon=ft.Icons.RESTART_ALT, on_click=reset_stats),
+        ],
+        vertical_alignment=ft.CrossAxisAlignment.CENTER
+    )
+
+    build_rows()
+    build_pool_cards()
+
+    return ft.Container(
+        padding=40,
+        expand=True,
+        content=ft.Column(
+            controls=[
+                header_row,
+                ft.Divider(height=20, color="transparent"),
+                ft.Text("Connection Pool", size=16, weight="bold", color="#1A1A1A"),
+                pool_row,
+                ft.Divider(height=20, color="transparent"),
+                ft.Container(
+                    content=ft.Column(
+                        controls=[ft.Row(controls=[data_table], scroll=ft.ScrollMode.ADAPTIVE)],
+                        scroll=ft.ScrollMode.ADAPTIVE,
+                        expand=True
+                    ),
+                    bgcolor="white",
+                    border_radius=10,
+                    shadow=ft.BoxShadow(blur_radius=10, color=ft.Colors.BLACK12),
+                    border=ft.border.all(1, "#E0E0E0"),
+                    expand=True,
+                    clip_behavior=ft.ClipBehavior.HARD_EDGE
+                )
+            ],
+            expand=True,
+            spacing=0
+        ),
+    )
@@ -1,12 +1,12 @@
 import flet as ft
-import threading
-import time
 from services.quiz_service import QuizService
 from services.event_service import EventService
 from services.contestant_service import ContestantService
 from core.database import SessionLocal
 from models.all_models import Contestant, Segment, Score, Event
 from components.dialogs import show_about_dialog, show_contact_dialog
+from components.live_updates import LiveView
+from core.event_bus import EVENTS_TOPIC, STRUCTURE
 
 def TabulatorView(page: ft.Page, on_logout_callback):
     # Services
@@ -25,7 +25,6 @@ def TabulatorView(page: ft.Page, on_logout_callback):
     # State tracking for Auto-Refresh
     last_round_id = None
     last_question_count = 0
-    is_polling = True
     
     # Track available events to prevent UI flicker
     cached_available_event_ids = set()
@@ -55,7 +54,7 @@ def TabulatorView(page: ft.Page, on_logout_callback):
         # FIX: Reset the cache so the menu knows it needs to re-render
         cached_available_event_ids = set() 
         
-        # Clearing the container will trigger the "Select Event" view on next poll
+        # Clearing the container makes the next refresh show the "Select Event" view
         # We use a Column with center alignment to prevent the "tall loading" issue
         main_container.content = ft.Column(
             controls=[
@@ -66,6 +65,7 @@ def TabulatorView(page: ft.Page, on_logout_callback):
             horizontal_alignment=ft.CrossAxisAlignment.CENTER
         )
         page.update()
+        live.trigger()
 
     # ---------------------------------------------------------
     # 2. HEADER
@@ -94,12 +94,11 @@ def TabulatorView(page: ft.Page, on_logout_callback):
     )
 
     def stop_and_logout(e):
-        nonlocal is_polling
-        is_polling = False
+        live.stop()
         on_logout_callback(e)
 
     # ---------------------------------------------------------
-    # 3. DATA LOADING & POLLING
+    # 3. DATA LOADING & LIVE UPDATES
     # ---------------------------------------------------------
     def load_dashboard():
         nonlocal current_event, active_round, assigned_contestant, last_round_id, last_question_count, cached_available_event_ids
@@ -180,14 +179,8 @@ def TabulatorView(page: ft.Page, on_logout_callback):
             last_round_id = active_round.id
             last_question_count = active_round.total_questions
 
-    def poll_updates():
-        while is_polling:
-            if page:
-                try:
-                    load_dashboard()
-                except Exception as e: 
-                    print(f"Polling error: {e}")
-            time.sleep(2)
+    # Events, rounds and assignments only change on structure writes; score pushes are ignored
+    live = LiveView(page, load_dashboard)
 
     # ---------------------------------------------------------
     # 4. UI RENDERERS
@@ -206,7 +199,7 @@ def TabulatorView(page: ft.Page, on_logout_callback):
                 horizontal_alignment=ft.CrossAxisAlignment.CENTER
             )
             page.update()
-            # The next poll tick will pick up 'current_event' and load the round
+            live.trigger()
 
         if not events:
             main_container.content = ft.Column([
@@ -313,7 +306,8 @@ def TabulatorView(page: ft.Page, on_logout_callback):
         else: page.open(ft.SnackBar(ft.Text("All scores saved successfully!"), bgcolor="green"))
         e.control.text = "Save & Submit Answers"; e.control.disabled = False; page.update()
 
-    # Initial Load & Start Polling
-    threading.Thread(target=poll_updates, daemon=True).start()
+    # Initial Load & Start Listening
+    live.watch(EVENTS_TOPIC, kinds={STRUCTURE})
+    live.trigger()
 
     return ft.Column([header, main_container], expand=True)
\ No newline at end of file
@@ -1,12 +1,11 @@
 import flet as ft
-import threading
-import time
 # IMPORT BOTH SERVICES
 from services.quiz_service import QuizService
 from services.pageant_service import PageantService
+from services.leaderboard_hub import leaderboard_hub
+from components.live_updates import LiveView
 from core.database import SessionLocal
-from models.all_models import Event, Segment, Score, Contestant, Criteria
-from sqlalchemy import func
+from models.all_models import Event
 
 # ---------------------------------------------------------
 # VIEW 1: EVENT GALLERY (List of All Events)
@@ -111,7 +110,6 @@ def EventLeaderboardView(page: ft.Page, event_id: int):
     pageant_service = PageantService()
 
     # State
-    is_active = True
     event_type = "Pageant" 
     
     db = SessionLocal()
@@ -131,174 +129,18 @@ def EventLeaderboardView(page: ft.Page, event_id: int):
         horizontal_alignment=ft.CrossAxisAlignment.CENTER
     )
 
-    def get_data():
-        db = SessionLocal()
-        event = db.query(Event).get(event_id)
-        if event:
-            title_text.value = event.name
-        
-        scores = []
-        mode_label = "LIVE RESULTS"
-        
-        # Headers containers
-        p_headers = [] # Prelim headers (Revealed)
-        f_headers = [] # Final headers (Revealed)
-        
-        # Flags
-        show_prelim_total = False
-
-        # -------------------------------------------------------------
-        # SHARED SEGMENT PROCESSING (For both Quiz & Pageant)
-        # -------------------------------------------------------------
-        # 1. Fetch Segments
-        all_segments = db.query(Segment).filter(Segment.event_id == event_id).order_by(Segment.order_index).all()
-        
-        prelim_segs = []
-        final_segs = []
-        seg_map = {s.id: s for s in all_segments}
-        
-        for seg in all_segments:
-            is_final = seg.is_final
-            if not is_final and seg.related_segment_id:
-                parent = seg_map.get(seg.related_segment_id)
-                if parent and parent.is_final: is_final = True
-            
-            if is_final: final_segs.append(seg)
-            else: prelim_segs.append(seg)
-        
-        # Determine Headers based on Visibility
-        if event_type == "QuizBee":
-            # AUTO-SHOW ALL FOR QUIZ BEE
-            revealed_prelims = prelim_segs
-            revealed_finals = final_segs
-        else:
-            # Respect Admin Toggle for Pageants
-            revealed_prelims = [s for s in prelim_segs if s.is_revealed]
-            revealed_finals = [s for s in final_segs if s.is_revealed]
-        
-        p_headers = [s.name for s in revealed_prelims]
-        f_headers = [s.name for s in revealed_finals]
-        
-        # Logic: Show Prelim Total ONLY if ALL prelim segments are revealed
-        # For Quiz Bee, this is effectively always True if there are prelims
-        if prelim_segs:
-            show_prelim_total = (len(revealed_prelims) == len(prelim_segs))
-        else:
-            show_prelim_total = False
-
-        # Ranking Mode: If ANY final round is shown, rank by Final Score.
-        rank_by_final = (len(revealed_finals) > 0)
-
-        # =================================================================
-        # QUIZ BEE LOGIC
-        # =================================================================
-        if event_type == "QuizBee":
-            contestants = db.query(Contestant).filter(Contestant.event_id == event_id).all()
-            for c in contestants:
-                prelim_total = 0; final_total = 0
-                p_breakdown = []; f_breakdown = []
-                
-                # Sum Prelims (Calculate ALL, but only store Revealed for breakdown)
-                for seg in prelim_segs:
-                    val = db.query(func.sum(Score.score_value)).filter(Score.contestant_id==c.id, Score.segment_id==seg.id).scalar() or 0
-                    prelim_total += val
-                    # For Quiz Bee, we decided all are revealed, so always append
-                    p_breakdown.append(int(val))
-                
-                # Sum Finals
-                for seg in final_segs:
-                    val = db.query(func.sum(Score.score_value)).filter(Score.contestant_id==c.id, Score.segment_id==seg.id).scalar() or 0
-                    final_total += val
-                    f_breakdown.append(int(val))
-                
-                dname = c.name + (" (Eliminated)" if c.status == "Eliminated" else "")
-                scores.append({
-                    "name": dname,
-                    "p_bd": p_breakdown, 
-                    "f_bd": f_breakdown,
-                    "p_tot": int(prelim_total), 
-                    "f_tot": int(final_total),
-                    "status": c.status
-                })
-            
-            # Sort with Tie-Breaker
-            if rank_by_final: 
-                # Sort by Final, then Prelim (Tie-breaker)
-                scores.sort(key=lambda x: (x['f_tot'], x['p_tot']), reverse=True)
-            else: 
-                scores.sort(key=lambda x: x['p_tot'], reverse=True)
-
-        # =================================================================
-        # PAGEANT LOGIC
-        # =================================================================
-        else:
-            mode_label = "OFFICIAL RANKINGS"
-            
-            # Calculate Scores
-            contestants = db.query(Contestant).filter(Contestant.event_id == event_id).all()
-            
-            for c in contestants:
-                prelim_row_scores = []
-                final_row_scores = []
-                
-                prelim_weighted_total = 0.0
-                final_weighted_total = 0.0
-                
-                # --- CALCULATE PRELIMS ---
-                for seg in prelim_segs:
-                    # Calculate segment score (Raw)
-                    criterias = db.query(Criteria).filter(Criteria.segment_id == seg.id).all()
-                    seg_raw_score = 0.0
-                    for crit in criterias:
-                        avg_val = db.query(func.avg(Score.score_value)).filter(Score.contestant_id == c.id, Score.criteria_id == crit.id).scalar() or 0.0
-                        seg_raw_score += (avg_val * crit.weight)
-                    
-                    # Accumulate Weighted Total (Score * Percentage Weight)
-                    # e.g. Score 90 * 0.40 = 36.0
-                    prelim_weighted_total += (seg_raw_score * seg.percentage_weight)
-                    
-                    if seg.is_revealed:
-                        prelim_row_scores.append(round(seg_raw_score, 2))
-
-                # --- CALCULATE FINALS ---
-                for seg in final_segs:
-                    criterias = db.query(Criteria).filter(Criteria.segment_id == seg.id).all()
-                    seg_raw_score = 0.0
-                    for crit in criterias:
-                        avg_val = db.query(func.avg(Score.score_value)).filter(Score.contestant_id == c.id, Score.criteria_id == crit.id).scalar() or 0.0
-                        seg_raw_score += (avg_val * crit.weight)
-                    
-                    final_weighted_total += seg_raw_score
-                    
-                    if seg.is_revealed:
-                        final_row_scores.append(round(seg_raw_score, 2))
-
-                # --- FIX: CORRECT PERCENTAGE CALCULATION ---
-                # Removed the extra division/multiplication. The weighted total is already the 0-100 representation.
-                prelim_percent = round(prelim_weighted_total, 2)
-                final_percent = round(final_weighted_total, 2) 
-
-                scores.append({
-                    "name": c.name,
-                    "gender": c.gender,
-                    "segment_scores": prelim_row_scores,
-                    "final_scores": final_row_scores,
-                    "p_tot": prelim_percent,
-                    "f_tot": final_percent
-                })
-            
-            # Sort with Tie-Breaker
-            if rank_by_final: 
-                # Sort by Final Score first, break ties with Prelim Score
-                # The logic: If Final scores are equal (0.0), whoever had higher Prelim wins.
-                scores.sort(key=lambda x: (x['f_tot'], x['p_tot']), reverse=True)
-            else: 
-                scores.sort(key=lambda x: x['p_tot'], reverse=True)
+    # Latest (event_name, leaderboard) pushed by the shared per-event feed
+    latest = None
 
-        db.close()
-        return scores, mode_label, p_headers, f_headers, show_prelim_total
+    def get_data():
+        # Computed once per change for all viewers of this event (see services/leaderboard_hub.py)
+        event_name, leaderboard = latest
+        if event_name:
+            title_text.value = event_name
+        return leaderboard
 
     def refresh_leaderboard():
+        if latest is None: return
         try:
             results, mode, p_headers, f_headers, show_p_total = get_data()
             status_text.value = f"{mode} • Live Updates"
@@ -391,9 +233,7 @@ def EventLeaderboardView(page: ft.Page, event_id: int):
                 def build_gender_table(gender, color_code):
                     subset = [r for r in results if r.get('gender') == gender]
                     if not subset: return None
-                    
-                    # Already sorted in get_data(), but re-indexing ranks here for display
-                    for idx, s in enumerate(subset): s['rank'] = idx + 1
+                    # Already sorted and ranked per gender by the tabulation service (shared by all viewers, so not modified here)
 
                     # --- COLUMNS ---
                     cols = [
@@ -439,15 +279,17 @@ def EventLeaderboardView(page: ft.Page, event_id: int):
         except Exception as e:
             print(f"ERROR in Leaderboard: {e}") 
 
-    def poll_updates():
-        while is_active:
-            refresh_leaderboard()
-            time.sleep(3)
+    # Re-render only when this event's leaderboard changes
+    def on_leaderboard(result):
+        nonlocal latest
+        latest = result
+        live.trigger()
 
-    threading.Thread(target=poll_updates, daemon=True).start()
+    live = LiveView(page, refresh_leaderboard)
+    live.track(leaderboard_hub.subscribe(event_id, on_leaderboard))
 
     def go_back(e):
-        nonlocal is_active; is_active = False 
+        live.stop()
         page.go("/leaderboard")
 
     # Header for the specific event view